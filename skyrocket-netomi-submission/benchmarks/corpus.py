@@ -0,0 +1,183 @@
+import os
+import json
+import random
+import argparse
+from typing import Dict, List, Tuple
+import pandas as pd
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+WRITE_CHUNK = 50_000
+FLAGS = ['B', 'BL', 'BQZ', 'BLQ', 'BQ', 'BCL', 'BIL', 'BLZ']
+
+INTENTS = {
+    ('ORDER', 'track_order'): ("Order Status and Changes", [
+        "where is my order #{order}",
+        "can you help me track order #{order}? it was due {day}",
+        "i need to check the status of my order #{order}, tracking {tracking}",
+    ]),
+    ('ORDER', 'cancel_order'): ("Order Cancellation", [
+        "question about cancelling order #{order}",
+        "please cancel order #{order}, i don't need it anymore",
+        "how do i cancel the purchase i made on {day}",
+    ]),
+    ('ORDER', 'change_order'): ("Order Status and Changes", [
+        "i want to add some items to order #{order}",
+        "can i change the size on order #{order}",
+    ]),
+    ('REFUND', 'get_refund'): ("Refund Assistance", [
+        "i want a refund of ${amount} for order #{order}",
+        "how can i get my money back for order #{order}",
+    ]),
+    ('REFUND', 'track_refund'): ("Refund Assistance", [
+        "where is my refund of ${amount}? it's been a week",
+        "check the status of the refund for order #{order}",
+    ]),
+    ('SHIPPING', 'change_shipping_address'): ("Shipping Address Update", [
+        "i need to change my shipping address for order #{order}",
+        "update the delivery address on my account {email}",
+    ]),
+    ('DELIVERY', 'delivery_period'): ("Delivery Timeline", [
+        "how long does delivery take to {city}",
+        "when will order #{order} arrive",
+    ]),
+    ('DELIVERY', 'delivery_options'): ("Delivery Options", [
+        "what delivery options do you have for {city}",
+        "do you offer express shipping",
+    ]),
+    ('INVOICE', 'get_invoice'): ("Invoice Retrieval", [
+        "i need the invoice for order #{order}",
+        "send the bill for ${amount} to {email}",
+    ]),
+    ('ACCOUNT', 'switch_account'): ("Account Switching", [
+        "how do i switch to my other account {email}",
+        "help me change to the business account",
+    ]),
+    ('PAYMENT', 'payment_issue'): ("Purchase Assistance", [
+        "i was charged ${amount} twice for order #{order}",
+        "my card keeps getting declined at checkout",
+    ]),
+}
+
+RESPONSES = [
+    "I've understood that you need help with order #{order}, and I'm here to assist. "
+    "I've checked your account and an update has been sent to {email}. Is there anything else I can help with?",
+    "Thank you for reaching out about this. I completely understand how important it is. "
+    "Please sign in to your account, open 'Orders', and select order #{order} to see the latest details.",
+    "I'm sorry for the inconvenience. I've escalated your request regarding ${amount} to our billing team, "
+    "and you'll hear back within 24 hours.",
+    "Great question! Delivery to {city} usually takes 3-5 business days. You can follow your parcel "
+    "with tracking number {tracking}.",
+]
+
+CITIES = ['London', 'Austin', 'Toronto', 'Berlin', 'Sydney', 'Mumbai', 'Lagos', 'Lima']
+DAYS = ['yesterday', 'last monday', 'on friday', 'two days ago', 'this morning']
+
+def parse_size(size: str) -> int:
+    return SIZES.get(size.lower()) or int(size)
+
+def _typo(text: str, rng: random.Random) -> str:
+    if len(text) < 6 or rng.random() > 0.15:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+def _fill(template: str, rng: random.Random) -> str:
+    return template.format(
+        order=rng.randint(10_000, 99_999_999),
+        amount=f"{rng.randint(5, 900)}.{rng.randint(0, 99):02d}",
+        email=f"user{rng.randint(1, 10**6)}@example.com",
+        tracking="1Z" + "".join(rng.choice("0123456789ABCDEFGHJKLMNPRSTVWXYZ") for _ in range(16)),
+        city=rng.choice(CITIES),
+        day=rng.choice(DAYS),
+    )
+
+def generate_rows(start: int, count: int, seed: int) -> List[Tuple]:
+    rng = random.Random(seed * 1_000_003 + start)
+    intents = list(INTENTS.items())
+    rows = []
+    for _ in range(count):
+        (category, sub_category), (topic, templates) = rng.choice(intents)
+        rows.append((
+            _typo(_fill(rng.choice(templates), rng), rng),
+            _fill(rng.choice(RESPONSES), rng),
+            category,
+            sub_category,
+            rng.choice(FLAGS)
+        ))
+    return rows
+
+def topics_config() -> Dict:
+    topics = {}
+    for (category, _), (topic, templates) in INTENTS.items():
+        entry = topics.setdefault(topic, {
+            'topic_name': topic,
+            'description': f"{category.title()} questions about {topic.lower()}",
+            'representative_queries': []
+        })
+        entry['representative_queries'].extend(t.replace('#{order}', '#12345').format(
+            amount='49.99', email='user@example.com', tracking='1Z999AA10123456784', city='London', day='yesterday'
+        ) for t in templates)
+    return {'total_queries': 0, 'n_topics': len(topics), 'topics': list(topics.values())}
+
+def write_corpus(output_dir: str, rows: int, seed: int = 7, start_date: str = '2026-01-01') -> Dict[str, str]:
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {
+        'queries': os.path.join(output_dir, 'queries.csv'),
+        'responses': os.path.join(output_dir, 'genai_responses.csv'),
+        'pipeline_input': os.path.join(output_dir, 'pipeline_input.csv'),
+        'topics_config': os.path.join(output_dir, 'topics_config.json'),
+        'manifest': os.path.join(output_dir, 'corpus.json'),
+    }
+    base = pd.Timestamp(start_date)
+    seconds_per_row = max(86_400 * 30 // max(rows, 1), 1)
+
+    for start in range(0, rows, WRITE_CHUNK):
+        chunk = generate_rows(start, min(WRITE_CHUNK, rows - start), seed)
+        queries, responses, categories, sub_categories, flags = zip(*chunk)
+        header, mode = start == 0, 'w' if start == 0 else 'a'
+
+        pd.DataFrame({'Queries': queries}).to_csv(paths['queries'], index=False, header=header, mode=mode)
+        pd.DataFrame({
+            'flags': flags, 'Query': queries, 'category': categories,
+            'Sub Category': sub_categories, 'response': responses
+        }).to_csv(paths['responses'], index=False, header=header, mode=mode)
+        pd.DataFrame({
+            'query_id': range(start, start + len(chunk)),
+            'query_text': queries,
+            'response_text': responses,
+            'timestamp': [base + pd.Timedelta(seconds=(start + i) * seconds_per_row) for i in range(len(chunk))]
+        }).to_csv(paths['pipeline_input'], index=False, header=header, mode=mode)
+
+    with open(paths['topics_config'], 'w') as f:
+        json.dump(topics_config(), f, indent=2)
+    with open(paths['manifest'], 'w') as f:
+        json.dump({'rows': rows, 'seed': seed, 'start_date': start_date, 'files': paths}, f, indent=2)
+
+    return paths
+
+def load_corpus(output_dir: str, rows: int, seed: int = 7) -> Dict[str, str]:
+    manifest_path = os.path.join(output_dir, 'corpus.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if manifest['rows'] == rows and manifest['seed'] == seed and all(map(os.path.exists, manifest['files'].values())):
+            return manifest['files']
+    print(f"Generating {rows:,}-row corpus in {output_dir}...")
+    return write_corpus(output_dir, rows, seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic corpora shaped like queries.csv and genai_responses.csv")
+    parser.add_argument('--size', default='10k', help=f"Row count or one of {', '.join(SIZES)}")
+    parser.add_argument('--output-dir', default=None)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rows = parse_size(args.size)
+    output_dir = args.output_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpora', args.size.lower())
+    paths = write_corpus(output_dir, rows, args.seed)
+    print(f"Wrote {rows:,} rows:")
+    for kind, path in paths.items():
+        print(f"   {kind}: {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ['torch', 'sentence_transformers', 'umap', 'hdbscan', 'groq', 'reportlab']
+
+# Cumulative import time budgets in milliseconds, measured with `python -X importtime`.
+DEFAULT_BUDGETS = {
+    'skyrocket.core.registry': 100,
+    'skyrocket.core.topic_classifier': 600,
+    'skyrocket.core.entity_extractor': 600,
+    'skyrocket.core.llm_judge': 600,
+    'skyrocket.core.topic_discovery': 600,
+    'skyrocket.core.live_analyzer': 700,
+    'skyrocket.pipelines.daily_etl_prefect': 2500,
+    'app': 1500,
+}
+
+def child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    paths = [str(ROOT / 'src'), str(ROOT / 'webapp' / 'backend')]
+    if env.get('PYTHONPATH'):
+        paths.append(env['PYTHONPATH'])
+    env['PYTHONPATH'] = os.pathsep.join(paths)
+    return env
+
+def parse_importtime(stderr: str, module: str) -> float:
+    cumulative = None
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1])
+    if cumulative is None:
+        raise RuntimeError(f"No importtime entry for {module}")
+    return cumulative / 1000.0
+
+def measure(module: str, forbidden: List[str] = HEAVY_MODULES) -> Dict:
+    code = (
+        f"import sys, json; import {module}; "
+        f"print(json.dumps([m for m in {forbidden!r} if m in sys.modules]))"
+    )
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, env=child_env(), cwd=str(ROOT)
+    )
+    if proc.returncode != 0:
+        return {'module': module, 'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed'}
+
+    return {
+        'module': module,
+        'import_ms': round(parse_importtime(proc.stderr, module), 1),
+        'heavy_loaded': json.loads(proc.stdout.strip().splitlines()[-1])
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check for entry points")
+    parser.add_argument('--modules', nargs='*', default=None, help="Modules to measure (default: all budgeted)")
+    parser.add_argument('--budgets', default=None, help="JSON file mapping module to budget in ms")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per module; the fastest is kept")
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    if args.budgets:
+        with open(args.budgets, 'r') as f:
+            budgets.update(json.load(f))
+
+    report = {'python': sys.version.split()[0], 'results': []}
+    failures = []
+
+    for module in args.modules or list(budgets):
+        runs = [measure(module) for _ in range(max(args.repeat, 1))]
+        errors = [run for run in runs if 'error' in run]
+        if errors:
+            result = errors[0]
+            failures.append(f"{module}: import failed ({result['error']})")
+        else:
+            result = min(runs, key=lambda run: run['import_ms'])
+            result['budget_ms'] = budgets.get(module)
+            if result['budget_ms'] is not None and result['import_ms'] > result['budget_ms']:
+                failures.append(f"{module}: {result['import_ms']} ms exceeds budget {result['budget_ms']} ms")
+            if result['heavy_loaded']:
+                failures.append(f"{module}: eagerly imports {', '.join(result['heavy_loaded'])}")
+
+        report['results'].append(result)
+        print(f"{module:45s} {result.get('import_ms', '-'):>8} ms  (budget {budgets.get(module, '-')} ms)"
+              f"{'  heavy: ' + ', '.join(result['heavy_loaded']) if result.get('heavy_loaded') else ''}")
+
+    report['failures'] = failures
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if failures:
+        print("\nImport-time regressions:")
+        for failure in failures:
+            print(f"   - {failure}")
+        sys.exit(1)
+
+    print("\nAll import-time budgets met")
+
+if __name__ == "__main__":
+    main()
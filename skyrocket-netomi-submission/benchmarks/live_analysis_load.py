@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import tempfile
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'webapp' / 'backend'))
+
+from skyrocket.llm.stand_in import start_server
+
+TOPICS_CONFIG = {
+    'topics': [
+        {'topic_name': name, 'description': f"Questions about {name.lower()}", 'representative_queries': examples}
+        for name, examples in [
+            ('Order Tracking', ["Where is my order?", "Track my package", "My delivery is late"]),
+            ('Refunds', ["I want a refund", "How do I return this?", "Refund not received"]),
+            ('Account Access', ["I can't log in", "Reset my password", "Account locked"]),
+            ('Billing', ["I was charged twice", "Update my card", "Why is my bill higher?"]),
+            ('Product Questions', ["Is this in stock?", "Does it come in blue?", "What size should I get?"]),
+        ]
+    ]
+}
+
+QUERY_TEMPLATES = [
+    "Where is my order #{n}? It was supposed to arrive yesterday.",
+    "I was charged ${amount} twice for order #{n}, please refund me.",
+    "I can't log into my account, my email is user{n}@example.com",
+    "Does the jacket from order #{n} come in a larger size?",
+    "Please cancel order #{n} and refund the ${amount}.",
+]
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+def build_payloads(count: int, mode: str, seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(count):
+        query = rng.choice(QUERY_TEMPLATES).format(n=10000 + i, amount=f"{rng.randint(10, 500)}.99")
+        payload = {'query': query}
+        if mode == 'pair':
+            payload['response'] = "Thanks for reaching out! I've looked into this and an update has been sent to your email."
+        payloads.append(payload)
+    return payloads
+
+async def run_load(client, path: str, payloads: List[Dict], concurrency: int) -> Dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(payload: Dict):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(path, json=payload)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(payload) for payload in payloads))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'requests': len(payloads),
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(payloads) / elapsed, 2),
+        'latency_p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'latency_p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        'latency_p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+        'latency_max_ms': round(max(latencies) * 1000, 1)
+    }
+
+async def benchmark(app_module, server, args, max_batch_size: int) -> Dict:
+    import httpx
+    from skyrocket.core.live_analyzer import LiveAnalyzer
+
+    app_module.live_analyzer = LiveAnalyzer(
+        TOPICS_CONFIG,
+        use_embeddings=args.embeddings,
+        max_batch_size=max_batch_size,
+        max_wait_ms=args.max_wait_ms
+    )
+
+    path = f"/api/analyze/{args.mode}"
+    payloads = build_payloads(args.requests, args.mode, args.seed)
+    transport = httpx.ASGITransport(app=app_module.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+        await run_load(client, path, payloads[:min(len(payloads), args.concurrency)], args.concurrency)
+
+        requests_before = server.requests
+        result = await run_load(client, path, payloads, args.concurrency)
+        llm_requests = server.requests - requests_before
+
+    result.update({
+        'max_batch_size': max_batch_size,
+        'max_wait_ms': args.max_wait_ms,
+        'llm_requests': llm_requests,
+        'llm_requests_per_call': round(llm_requests / len(payloads), 3),
+        'batchers': app_module.live_analyzer.stats()
+    })
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Load benchmark for /api/analyze/query and /api/analyze/pair")
+    parser.add_argument('--mode', choices=['query', 'pair'], default='pair')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--max-batch', type=int, default=16)
+    parser.add_argument('--max-wait-ms', type=float, default=10.0)
+    parser.add_argument('--llm-latency-ms', type=float, default=80.0)
+    parser.add_argument('--llm-jitter-ms', type=float, default=20.0)
+    parser.add_argument('--embeddings', action='store_true', help="Classify topics with the embedding model")
+    parser.add_argument('--compare-unbatched', action='store_true', help="Also run with max batch size 1")
+    parser.add_argument('--p95-target-ms', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    server = start_server(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms)
+    os.environ['GROQ_API_KEY'] = 'stand-in'
+    os.environ['GROQ_BASE_URL'] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ.setdefault('SKYROCKET_LLM_RPM', '0')
+    os.environ.setdefault('SKYROCKET_LLM_TPM', '0')
+    limits_dir = tempfile.mkdtemp(prefix='skyrocket-limits-')
+    os.environ.setdefault('SKYROCKET_RATE_LIMIT_DB', os.path.join(limits_dir, 'llm_rate_limit.db'))
+
+    try:
+        import app as app_module
+
+        report = {
+            'mode': args.mode,
+            'concurrency': args.concurrency,
+            'llm_latency_ms': args.llm_latency_ms,
+            'runs': [asyncio.run(benchmark(app_module, server, args, args.max_batch))]
+        }
+        if args.compare_unbatched:
+            report['runs'].append(asyncio.run(benchmark(app_module, server, args, 1)))
+    finally:
+        server.shutdown()
+        shutil.rmtree(limits_dir, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    p95 = report['runs'][0]['latency_p95_ms']
+    if args.p95_target_ms is not None and p95 > args.p95_target_ms:
+        print(f"p95 latency {p95} ms exceeds target {args.p95_target_ms} ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import tempfile
+import argparse
+import importlib.util
+import contextlib
+import contextvars
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+from skyrocket.llm.stand_in import start_server
+from corpus import parse_size, load_corpus
+
+STAGES = ['classify', 'extract', 'evaluate', 'discover', 'flow-batch', 'flow-streaming']
+DEFAULT_BASELINE = str(Path(__file__).resolve().parent / 'baseline.json')
+HIGHER_IS_BETTER = ['rows_per_sec']
+LOWER_IS_BETTER = ['latency_p99_ms', 'peak_rss_mb', 'llm_calls_per_row']
+DISCOVERY_MODULES = ['sentence_transformers', 'umap', 'hdbscan']
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+def summarize(name: str, rows: int, seconds: float, recorder, server, requests_before: int) -> Dict:
+    latencies = [latency for stage in recorder.stages.values() for latency in stage.latencies]
+    llm_calls = server.requests - requests_before
+    return {
+        'benchmark': name,
+        'rows': rows,
+        'seconds': round(seconds, 3),
+        'rows_per_sec': round(rows / seconds, 2) if seconds > 0 else None,
+        'latency_p50_ms': round(percentile(latencies, 0.50) * 1000, 1) if latencies else None,
+        'latency_p99_ms': round(percentile(latencies, 0.99) * 1000, 1) if latencies else None,
+        'peak_rss_mb': round(max((s.peak_rss_bytes for s in recorder.stages.values()), default=0) / (1024 * 1024), 1),
+        'llm_calls': llm_calls,
+        'llm_calls_per_row': round(llm_calls / rows, 3) if rows else None,
+        'llm_errors': sum(stage.llm_errors for stage in recorder.stages.values()),
+        'llm_fallbacks': sum(stage.llm_fallbacks for stage in recorder.stages.values()),
+        'stages': [stage.to_dict() for stage in recorder.stages.values()]
+    }
+
+def run_chunked(fn: Callable, df, chunk_size: int, workers: int):
+    chunks = [df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='benchmark') as executor:
+        futures = [executor.submit(contextvars.copy_context().run, fn, chunk) for chunk in chunks]
+        return [future.result() for future in futures]
+
+def stage_runner(stage: str, paths: Dict[str, str], args) -> Callable[[], int]:
+    import pandas as pd
+    from skyrocket.pipelines import daily_etl_prefect as pipeline
+
+    df = pd.read_csv(paths['pipeline_input'])
+
+    if stage == 'classify':
+        classifier = pipeline.load_classifier(paths['topics_config'])
+        return lambda: sum(map(len, run_chunked(lambda c: pipeline.classify_frame(c, classifier), df, args.chunk_size, args.workers)))
+
+    if stage == 'extract':
+        extractor = pipeline.entity_extractor.EntityExtractor()
+        return lambda: sum(map(len, run_chunked(lambda c: pipeline.extract_frame(c, extractor), df, args.chunk_size, args.workers)))
+
+    if stage == 'evaluate':
+        judge = pipeline.llm_judge.LLMJudge()
+        return lambda: sum(map(len, run_chunked(lambda c: pipeline.evaluate_frame(c, judge), df, args.chunk_size, args.workers)))
+
+    if stage == 'discover':
+        from skyrocket.core.topic_discovery import TopicDiscoverer
+        queries = df['query_text'].head(args.discover_sample).tolist()
+
+        def discover() -> int:
+            from skyrocket.utils import perf
+            with perf.stage('discover', rows_in=len(queries)):
+                TopicDiscoverer().discover_topics(queries)
+            return len(queries)
+        return discover
+
+    if stage.startswith('flow-'):
+        mode = stage.split('-', 1)[1]
+
+        def flow() -> int:
+            work_dir = tempfile.mkdtemp(prefix='skyrocket-bench-')
+            try:
+                with open(paths['topics_config'], 'r') as f:
+                    topics = json.load(f)
+                topics['benchmark_run'] = uuid.uuid4().hex
+                topics_path = os.path.join(work_dir, 'topics.json')
+                with open(topics_path, 'w') as f:
+                    json.dump(topics, f)
+
+                metrics = pipeline.daily_customer_query_pipeline(
+                    data_source=paths['pipeline_input'],
+                    topics_config=topics_path,
+                    output_dir=os.path.join(work_dir, 'processed'),
+                    state_db=os.path.join(work_dir, 'state.db'),
+                    enrichment_db=os.path.join(work_dir, 'enrichment.db'),
+                    catalog_db=os.path.join(work_dir, 'catalog.db'),
+                    full_refresh=True,
+                    chunk_size=args.chunk_size,
+                    mode=mode
+                )
+                return metrics['total_queries']
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        return flow
+
+    raise ValueError(f"Unknown stage: {stage}")
+
+def run_benchmark(stage: str, paths: Dict[str, str], server, args) -> Dict:
+    from skyrocket.utils import perf
+
+    if stage == 'discover':
+        missing = [m for m in DISCOVERY_MODULES if importlib.util.find_spec(m) is None]
+        if missing:
+            return {'benchmark': stage, 'skipped': f"missing {', '.join(missing)}"}
+
+    run = stage_runner(stage, paths, args)
+
+    def measure() -> Dict:
+        requests_before = server.requests
+        if not stage.startswith('flow-'):
+            perf.start_run(f"benchmark:{stage}")
+        started = time.perf_counter()
+        with contextlib.ExitStack() as stack:
+            if not args.verbose:
+                devnull = stack.enter_context(open(os.devnull, 'w'))
+                stack.enter_context(contextlib.redirect_stdout(devnull))
+                stack.enter_context(contextlib.redirect_stderr(devnull))
+            rows = run()
+        seconds = time.perf_counter() - started
+        return summarize(stage, rows, seconds, perf.get_recorder(), server, requests_before)
+
+    return contextvars.Context().run(measure)
+
+def run_config(args, rows: int) -> Dict:
+    return {
+        'rows': rows,
+        'llm_latency_ms': args.llm_latency_ms,
+        'llm_jitter_ms': args.llm_jitter_ms,
+        'llm_error_rate': args.llm_error_rate,
+        'workers': args.workers,
+        'chunk_size': args.chunk_size
+    }
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    for result in results:
+        expected = baseline.get(result['benchmark'])
+        if not expected or 'skipped' in result:
+            continue
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            current, reference = result.get(metric), expected.get(metric)
+            if current is None or not reference:
+                continue
+            if metric in HIGHER_IS_BETTER and current < reference * (1 - tolerance):
+                regressions.append(f"{result['benchmark']}: {metric} {current} < baseline {reference}")
+            elif metric in LOWER_IS_BETTER and current > reference * (1 + tolerance):
+                regressions.append(f"{result['benchmark']}: {metric} {current} > baseline {reference}")
+    return regressions
+
+def main():
+    os.environ.setdefault('PREFECT_LOGGING_LEVEL', 'WARNING')
+    os.environ.setdefault('SKYROCKET_LLM_RPM', '0')
+    os.environ.setdefault('SKYROCKET_LLM_TPM', '0')
+    limits_dir = tempfile.mkdtemp(prefix='skyrocket-limits-')
+    os.environ.setdefault('SKYROCKET_RATE_LIMIT_DB', os.path.join(limits_dir, 'llm_rate_limit.db'))
+    from skyrocket.pipelines.daily_etl_prefect import MAX_WORKERS, STAGE_CHUNK_SIZE
+
+    parser = argparse.ArgumentParser(description="Throughput benchmark for the core stages and the Prefect flow")
+    parser.add_argument('--size', default='10k', help="Corpus rows: 10k, 100k, 1m or a number")
+    parser.add_argument('--stages', nargs='*', default=STAGES, choices=STAGES)
+    parser.add_argument('--corpus-dir', default=None, help="Reuse or write the corpus here (default: a temp dir)")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    parser.add_argument('--chunk-size', type=int, default=STAGE_CHUNK_SIZE)
+    parser.add_argument('--discover-sample', type=int, default=5000)
+    parser.add_argument('--llm-latency-ms', type=float, default=5.0)
+    parser.add_argument('--llm-jitter-ms', type=float, default=2.0)
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the baseline for its config")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative change before flagging")
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--verbose', action='store_true', help="Show pipeline output")
+    args = parser.parse_args()
+
+    rows = parse_size(args.size)
+    corpus_dir = args.corpus_dir or tempfile.mkdtemp(prefix='skyrocket-corpus-')
+    paths = load_corpus(corpus_dir, rows, args.seed)
+
+    server = start_server(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms, error_rate=args.llm_error_rate)
+    os.environ['GROQ_API_KEY'] = 'stand-in'
+    os.environ['GROQ_BASE_URL'] = f"http://127.0.0.1:{server.server_address[1]}"
+
+    config = run_config(args, rows)
+    report = {'python': sys.version.split()[0], 'config': config, 'results': []}
+    try:
+        for stage in args.stages:
+            print(f"Running {stage}...")
+            result = run_benchmark(stage, paths, server, args)
+            report['results'].append(result)
+            if 'skipped' in result:
+                print(f"   skipped ({result['skipped']})")
+            else:
+                print(f"   {result['rows_per_sec']} rows/s, p50 {result['latency_p50_ms']} ms, "
+                      f"p99 {result['latency_p99_ms']} ms, peak {result['peak_rss_mb']} MB, "
+                      f"{result['llm_calls_per_row']} LLM calls/row")
+    finally:
+        server.shutdown()
+        shutil.rmtree(limits_dir, ignore_errors=True)
+        if not args.corpus_dir:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baselines = json.load(f)
+    key = str(rows)
+    baseline = baselines.get(key)
+
+    if baseline and baseline['config'] != config:
+        print(f"\nBaseline for {rows:,} rows was recorded with {baseline['config']}, skipping comparison")
+        report['regressions'] = []
+    elif baseline:
+        report['regressions'] = compare(report['results'], baseline['results'], args.tolerance)
+
+    if args.save_baseline:
+        baselines[key] = {
+            'config': config,
+            'results': {
+                r['benchmark']: {metric: r[metric] for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER}
+                for r in report['results'] if 'skipped' not in r
+            }
+        }
+        with open(args.baseline, 'w') as f:
+            json.dump(baselines, f, indent=2)
+        print(f"\nSaved baseline for {rows:,} rows to {args.baseline}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if report.get('regressions'):
+        print("\nPerformance regressions:")
+        for regression in report['regressions']:
+            print(f"   - {regression}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,50 @@
 import os
+import re
 import json
 from typing import List, Dict
 from dataclasses import dataclass
 from collections import defaultdict
-from groq import Groq
-from dotenv import load_dotenv
+import pandas as pd
+from skyrocket.core.registry import get_llm_client
+from skyrocket.llm.backends import model_for
+from skyrocket.llm.circuit_breaker import LLM_SOURCE, CircuitOpenError, get_breaker
+from skyrocket.utils.lazy import load_env
+from skyrocket.utils.perf import timed_completion, record_fallback
+from skyrocket.data.storage import read_columns, read_table, table_exists, find_column
+from skyrocket.data.enrichment_store import EnrichmentStore, content_hashes
 
-load_dotenv()
+load_env()
+
+MODEL_NAME = model_for('extractor')
+PROMPT_VERSION = "entities-v1"
+
+ENTITY_TYPES = [
+    "ORDER_ID", "TRACKING_NUMBER", "PRODUCT_NAME", "ACCOUNT_ID",
+    "EMAIL", "PHONE", "AMOUNT", "DATE", "LOCATION"
+]
+
+FALLBACK_SOURCE = "rules"
+MONTHS = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+ENTITY_RULES = {
+    "TRACKING_NUMBER": re.compile(r"\b(1Z[0-9A-Z]{16})\b"),
+    "ORDER_ID": re.compile(r"(#\d{3,})|\border\s*(?:number|no\.?|id)?\s*[:#]?\s*([A-Z0-9][A-Z0-9-]{4,})\b", re.IGNORECASE),
+    "ACCOUNT_ID": re.compile(r"\baccount\s*(?:number|no\.?|id)?\s*[:#]?\s*([A-Z0-9][A-Z0-9-]{4,})\b", re.IGNORECASE),
+    "EMAIL": re.compile(r"\b([\w.+-]+@[\w-]+(?:\.[\w-]+)+)\b"),
+    "PHONE": re.compile(r"(?<![\w#])(\+?\d{1,3}[\s.-]?)?(\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4})\b"),
+    "AMOUNT": re.compile(r"([$€£]\s?\d[\d,]*(?:\.\d{2})?|\b\d[\d,]*(?:\.\d{2})?\s?(?:dollars|usd|euros?|eur|pounds|gbp)\b)", re.IGNORECASE),
+    "DATE": re.compile(rf"\b(\d{{4}}-\d{{2}}-\d{{2}}|\d{{1,2}}/\d{{1,2}}/\d{{2,4}}|{MONTHS} \d{{1,2}}(?:st|nd|rd|th)?(?:,? \d{{4}})?)\b"),
+}
+
+def combine_query_response(query: str, response: str = None) -> str:
+    if response is None:
+        return str(query)
+    return "Query: " + str(query) + " \nResponse: " + str(response)
+
+def assign_entities(df: pd.DataFrame, tagged: List) -> pd.DataFrame:
+    return df.assign(
+        entities=[values for values, _ in tagged],
+        entities_source=[source for _, source in tagged]
+    )
 
 @dataclass
 class Entity:
@@ -15,13 +53,11 @@ class Entity:
     context: str
 
 class EntityExtractor:
+    VERSION = f"{MODEL_NAME}:{PROMPT_VERSION}"
     
-    def __init__(self, groq_api_key: str = None):
-        self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
-        if not self.groq_api_key:
-            raise ValueError("GROQ_API_KEY not found. Please set it in .env or pass it as an argument.")
-            
-        self.groq_client = Groq(api_key=self.groq_api_key)
+    def __init__(self, api_key: str = None):
+        self.llm_client = get_llm_client(api_key)
+        self.breaker = get_breaker('extractor')
     
     
     def _get_prompt_path(self) -> str:
@@ -97,10 +133,21 @@ Output:
 
 Now extract entities from the query above and return ONLY the JSON array."""
 
-    def extract_entities(self, text: str, verbose: bool = False) -> Dict[str, List[Entity]]:
+    def extract_entities(self, text: str, verbose: bool = False, with_source: bool = False):
         if not text or not text.strip():
-            return {}
-            
+            return ({}, LLM_SOURCE) if with_source else {}
+        
+        try:
+            entities, source = self.breaker.call(self._extract_with_llm, text, verbose), LLM_SOURCE
+        except CircuitOpenError:
+            entities, source = self._extract_with_rules(text), FALLBACK_SOURCE
+        except Exception as e:
+            print(f"Error in LLM extraction: {str(e)}")
+            entities, source = self._extract_with_rules(text), FALLBACK_SOURCE
+        
+        return (entities, source) if with_source else entities
+    
+    def _extract_with_llm(self, text: str, verbose: bool = False) -> Dict[str, List[Entity]]:
         try:
             prompt_template = self._load_prompt_template()
             
@@ -116,70 +163,147 @@ Now extract entities from the query above and return ONLY the JSON array."""
             print("Falling back to simple prompt...")
             prompt = f"""Extract entities from this text and return a JSON array with 'type', 'value', and 'confidence' for each entity. Text: "{text}"""
         
+        completion = timed_completion(
+            self.llm_client,
+            module="extractor",
+            model=MODEL_NAME,
+            messages=[
+                {"role": "system", "content": "You are a precise entity extraction system for customer service data."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1,
+            response_format={"type": "json_object"},
+            max_tokens=500
+        )
+        
+        response_text = completion.choices[0].message.content.strip()
+        
         try:
-            completion = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
+            response_data = json.loads(response_text)
+            if isinstance(response_data, dict) and 'entities' in response_data:
+                entity_list = response_data['entities']
+            elif isinstance(response_data, list):
+                entity_list = response_data
+            else:
+                entity_list = []
+                
+        except json.JSONDecodeError:
+            if "```json" in response_text:
+                response_text = response_text.split("```json")[1].split("```")[0].strip()
+            elif "```" in response_text:
+                response_text = response_text.split("```")[1].split("```")[0].strip()
+            elif not response_text.startswith('['):
+                start = response_text.find('[')
+                end = response_text.rfind(']') + 1
+                if start >= 0 and end > start:
+                    response_text = response_text[start:end]
+            
+            try:
+                entity_list = json.loads(response_text)
+            except json.JSONDecodeError:
+                raise ValueError(f"Failed to parse LLM response as JSON: {response_text[:200]}...")
+        
+        return self._group_entities(entity_list, text)
+    
+    def _extract_with_rules(self, text: str) -> Dict[str, List[Entity]]:
+        record_fallback('extractor', FALLBACK_SOURCE)
+        entities_by_type = defaultdict(list)
+        
+        for entity_type, pattern in ENTITY_RULES.items():
+            for match in pattern.finditer(text):
+                value = "".join(group for group in match.groups() if group).strip() or match.group(0).strip()
+                if value not in (e.value for e in entities_by_type[entity_type]):
+                    entities_by_type[entity_type].append(Entity(type=entity_type, value=value, context=text))
+        
+        return {entity_type: entities for entity_type, entities in entities_by_type.items() if entities}
+    
+    def _group_entities(self, entity_list, text: str) -> Dict[str, List[Entity]]:
+        entities_by_type = defaultdict(list)
+        
+        for item in entity_list if isinstance(entity_list, list) else []:
+            if not isinstance(item, dict):
+                continue
+                
+            entity_type = str(item.get('type', '')).strip().upper()
+            entity_value = str(item.get('value', '')).strip()
+            confidence = str(item.get('confidence', 'medium')).lower()
+            
+            if entity_type and entity_value and confidence in ('high', 'medium'):
+                entity = Entity(
+                    type=entity_type,
+                    value=entity_value,
+                    context=text
+                )
+                entities_by_type[entity_type].append(entity)
+        
+        return dict(entities_by_type)
+    
+    def extract_entities_batch(self, texts: List[str], with_source: bool = False) -> List:
+        if len(texts) <= 1:
+            return [self.extract_entities(text, with_source=with_source) for text in texts]
+        
+        numbered = "\n".join(f"[{i}] \"{text}\"" for i, text in enumerate(texts, 1))
+        prompt = f"""Extract structured entities from each of the {len(texts)} customer service texts below.
+
+ENTITY TYPES: {", ".join(ENTITY_TYPES)}
+
+TEXTS:
+{numbered}
+
+Return ONLY a JSON object of the form:
+{{"results": [{{"index": <text number>, "entities": [{{"type": "<entity_type>", "value": "<extracted_value>", "confidence": "high | medium | low"}}]}}]}}
+
+Include one result per text, using an empty entities array when nothing is found."""
+        
+        def extract_with_llm() -> Dict[int, List]:
+            completion = timed_completion(
+                self.llm_client,
+                module="extractor",
+                model=MODEL_NAME,
                 messages=[
                     {"role": "system", "content": "You are a precise entity extraction system for customer service data."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.1,
                 response_format={"type": "json_object"},
-                max_tokens=500
+                max_tokens=150 * len(texts) + 100
             )
             
-            response_text = completion.choices[0].message.content.strip()
-            
-            try:
-                response_data = json.loads(response_text)
-                if isinstance(response_data, dict) and 'entities' in response_data:
-                    entity_list = response_data['entities']
-                elif isinstance(response_data, list):
-                    entity_list = response_data
-                else:
-                    entity_list = []
-                    
-            except json.JSONDecodeError:
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0].strip()
-                elif "```" in response_text:
-                    response_text = response_text.split("```")[1].split("```")[0].strip()
-                elif not response_text.startswith('['):
-                    start = response_text.find('[')
-                    end = response_text.rfind(']') + 1
-                    if start >= 0 and end > start:
-                        response_text = response_text[start:end]
-                
-                try:
-                    entity_list = json.loads(response_text)
-                except json.JSONDecodeError:
-                    print(f"Failed to parse Groq response as JSON: {response_text[:200]}...")
-                    return {}
-            
-            entities_by_type = defaultdict(list)
-            
-            for item in entity_list if isinstance(entity_list, list) else []:
-                if not isinstance(item, dict):
-                    continue
-                    
-                entity_type = item.get('type', '').strip().upper()
-                entity_value = str(item.get('value', '')).strip()
-                confidence = item.get('confidence', 'medium').lower()
-                
-                if entity_type and entity_value and confidence in ('high', 'medium'):
-                    entity = Entity(
-                        type=entity_type,
-                        value=entity_value,
-                        context=text
-                    )
-                    entities_by_type[entity_type].append(entity)
-            
-            return dict(entities_by_type)
-            
+            results = json.loads(completion.choices[0].message.content).get('results', [])
+            by_index = {
+                int(result['index']): result.get('entities', [])
+                for result in results if isinstance(result, dict) and 'index' in result
+            }
+            if not set(range(1, len(texts) + 1)) <= set(by_index):
+                raise ValueError(f"expected {len(texts)} results, got {len(by_index)}")
+            return by_index
+        
+        try:
+            by_index = self.breaker.call(extract_with_llm)
+        except CircuitOpenError:
+            entities = [self._extract_with_rules(text) for text in texts]
+            return [(e, FALLBACK_SOURCE) for e in entities] if with_source else entities
         except Exception as e:
-            print(f"Error in Groq extraction: {str(e)}")
-            return {}
+            print(f"Batched extraction failed ({e}), extracting texts one by one")
+            return [self.extract_entities(text, with_source=with_source) for text in texts]
+        
+        entities = [self._group_entities(by_index[i], text) for i, text in enumerate(texts, 1)]
+        return [(e, LLM_SOURCE) for e in entities] if with_source else entities
+    
+    @staticmethod
+    def _values(entities: Dict[str, List[Entity]]) -> Dict[str, List[str]]:
+        return {entity_type: [e.value for e in entity_list] for entity_type, entity_list in entities.items()}
     
+    def extract_values(self, text: str, verbose: bool = False, with_source: bool = False):
+        if with_source:
+            entities, source = self.extract_entities(text, verbose=verbose, with_source=True)
+            return self._values(entities), source
+        return self._values(self.extract_entities(text, verbose=verbose))
+    
+    def extract_values_batch(self, texts: List[str], with_source: bool = False) -> List:
+        if with_source:
+            return [(self._values(e), source) for e, source in self.extract_entities_batch(texts, with_source=True)]
+        return [self._values(entities) for entities in self.extract_entities_batch(texts)]
     
     def extract_from_dataset(self, texts: List[str], sample_size: int = None) -> Dict:
         if sample_size and sample_size > 0:
@@ -231,48 +355,59 @@ Now extract entities from the query above and return ONLY the JSON array."""
         
         return results
 
-def main(max_batches: int = 5):
-    import pandas as pd
+def main(max_batches: int = 5, data_dir: str = None, enrichment_db: str = None,
+         responses_df: pd.DataFrame = None):
     import datetime
     
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-    data_dir = os.path.join(base_dir, 'data')
+    if data_dir is None:
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        data_dir = os.path.join(base_dir, 'data')
     
     os.makedirs(data_dir, exist_ok=True)
     
-    responses_path = os.path.join(data_dir, "genai_responses.csv")
-    if not os.path.exists(responses_path):
-        print(f"Error: genai_responses.csv not found at {responses_path}")
+    if responses_df is None and not table_exists(data_dir, "genai_responses"):
+        print(f"Error: genai_responses table not found in {data_dir}")
         print("Please ensure the file exists in the data directory.")
         return
     
     try:
         print("\nLoading and preparing data...")
         
-        df = pd.read_csv(responses_path)
+        columns = list(responses_df.columns) if responses_df is not None else read_columns(data_dir, "genai_responses")
         
-        print(f"\nAvailable columns in genai_responses.csv: {', '.join(df.columns.tolist())}")
+        print(f"\nAvailable columns in genai_responses: {', '.join(columns)}")
         
-        query_col = next((col for col in df.columns if 'query' in col.lower()), None)
-        response_col = next((col for col in df.columns if 'response' in col.lower()), None)
+        query_col = find_column(columns, 'query')
+        response_col = find_column(columns, 'response')
+        category_col = next((col for col in columns if col.lower() == 'category'), None)
         
         if not query_col or not response_col:
-            print("\nError: Could not find required columns in genai_responses.csv")
+            print("\nError: Could not find required columns in genai_responses")
             print("Looking for columns containing 'query' and 'response' (case-insensitive)")
             print("\nAvailable columns:")
-            for col in df.columns:
+            for col in columns:
                 print(f"- {col}")
             return
             
         print(f"Using columns: '{query_col}' as query, '{response_col}' as response")
         
+        selected = [query_col, response_col] + ([category_col] if category_col else [])
+        if responses_df is not None:
+            df = responses_df[selected].copy()
+        else:
+            df = read_table(data_dir, "genai_responses", columns=selected)
+        
         print("\nCombining query and response text for better context...")
         df['combined_text'] = "Query: " + df[query_col].astype(str) + " \nResponse: " + df[response_col].astype(str)
+        df['content_hash'] = content_hashes(df, query_col, response_col)
         
         all_texts = df['combined_text'].dropna().tolist()
+        all_hashes = df.loc[df['combined_text'].notna(), 'content_hash'].tolist()
+        all_categories = (df.loc[df['combined_text'].notna(), category_col].fillna('Unknown').astype(str).tolist()
+                          if category_col else ['All'] * len(all_texts))
         
         if not all_texts:
-            print("Error: No valid query-response pairs found in genai_responses.csv")
+            print("Error: No valid query-response pairs found in genai_responses")
             return
             
         print(f"\nFound {len(all_texts)} query-response pairs for entity extraction")
@@ -280,12 +415,14 @@ def main(max_batches: int = 5):
         print("\nInitializing Groq-based entity extractor...")
         try:
             extractor = EntityExtractor()
-            print("Groq client initialized successfully")
+            print("LLM client initialized successfully")
         except Exception as e:
-            print(f"Failed to initialize Groq client: {str(e)}")
-            print("Please ensure you have set the GROQ_API_KEY environment variable")
+            print(f"Failed to initialize LLM client: {str(e)}")
+            print("Please set GROQ_API_KEY, or choose another backend with SKYROCKET_LLM_BACKEND")
             return
         
+        store = EnrichmentStore(enrichment_db or os.path.join(data_dir, "enrichment.db"))
+        
         batch_size = 10
         results = {
             "total_texts": len(all_texts),
@@ -293,6 +430,7 @@ def main(max_batches: int = 5):
             "total_entities": 0,
             "entity_counts": {},
             "examples": {},
+            "entity_counts_by_category": {},
             "extractions": []
         }
         
@@ -314,22 +452,29 @@ def main(max_batches: int = 5):
             print(f"\nProcessing batch {current_batch}/{total_batches} "
                   f"(items {i+1}-{min(i + batch_size, len(all_texts))})...")
             
-            for j, text in enumerate(batch):
-                is_first = (i == 0 and j == 0)
-                
-                batch_results = extractor.extract_entities(text, verbose=is_first)
-                
-                for entity_type, entities in batch_results.items():
+            batch_df = pd.DataFrame({'text': batch, 'content_hash': all_hashes[i:i + batch_size]})
+            batch_df = store.enrich(
+                batch_df, 'entities', EntityExtractor.VERSION,
+                lambda missing: assign_entities(missing, [
+                    extractor.extract_values(text, verbose=(i == 0 and j == 0), with_source=True)
+                    for j, text in enumerate(missing['text'])
+                ])
+            )
+            
+            for batch_results, category in zip(batch_df['entities'], all_categories[i:i + batch_size]):
+                category_counts = results["entity_counts_by_category"].setdefault(category, {})
+                for entity_type, values in (batch_results or {}).items():
+                    category_counts[entity_type] = category_counts.get(entity_type, 0) + len(values)
                     if entity_type not in results["entity_counts"]:
                         results["entity_counts"][entity_type] = 0
                         results["examples"][entity_type] = set()
                     
-                    results["entity_counts"][entity_type] += len(entities)
-                    results["examples"][entity_type].update(e.value for e in entities)
-                    results["total_entities"] += len(entities)
+                    results["entity_counts"][entity_type] += len(values)
+                    results["examples"][entity_type].update(values)
+                    results["total_entities"] += len(values)
                     
                     if len(results["extractions"]) < 100:
-                        results["extractions"].extend([{"type": e.type, "value": e.value} for e in entities])
+                        results["extractions"].extend([{"type": entity_type, "value": v} for v in values])
             
             print(f"   Processed {min(i + len(batch), len(all_texts))}/{len(all_texts)} "
                   f"({(min(i + len(batch), len(all_texts)) / len(all_texts) * 100):.1f}%)")
@@ -365,6 +510,7 @@ def main(max_batches: int = 5):
                 print(f"   • {entity_type}: {count:,} (e.g., {examples})")
         
         print(f"\nResults saved to: {output_path}")
+        return output_path
         
     except Exception as e:
         print(f"\nAn error occurred: {str(e)}")
@@ -0,0 +1,114 @@
+import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List, Optional
+import numpy as np
+from skyrocket.utils.lazy import load_env
+from skyrocket.core.registry import get_embedding_model
+from skyrocket.core.topic_classifier import TopicClassifier, build_topic_centroids
+from skyrocket.core.entity_extractor import EntityExtractor, combine_query_response
+from skyrocket.core.llm_judge import LLMJudge
+from skyrocket.utils.microbatch import MicroBatcher
+
+load_env()
+
+LIVE_MAX_WAIT_MS = float(os.getenv("SKYROCKET_LIVE_MAX_WAIT_MS", "10"))
+LIVE_MAX_BATCH = int(os.getenv("SKYROCKET_LIVE_MAX_BATCH", "16"))
+LIVE_WORKERS = int(os.getenv("SKYROCKET_LIVE_WORKERS", "8"))
+
+class LiveAnalyzer:
+    def __init__(self, topics_config: Optional[Dict] = None, use_embeddings: bool = True,
+                 max_batch_size: int = LIVE_MAX_BATCH, max_wait_ms: float = LIVE_MAX_WAIT_MS):
+        self.executor = ThreadPoolExecutor(max_workers=LIVE_WORKERS, thread_name_prefix='live-analysis')
+        self.topics = (topics_config or {}).get('topics') or []
+        self.classifier = TopicClassifier(topics_config) if self.topics else None
+        self.extractor = EntityExtractor()
+        self.judge = LLMJudge()
+
+        self.embedding_model = None
+        self.topic_centroids = None
+        if use_embeddings and self.topics:
+            try:
+                self.embedding_model = get_embedding_model()
+                self.topic_centroids = build_topic_centroids(self.topics, self.embedding_model)
+            except Exception as e:
+                print(f"Embedding model unavailable ({e}), topics will be classified by the LLM")
+                self.embedding_model = None
+
+        def batcher(fn, name):
+            return MicroBatcher(fn, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+                                executor=self.executor, name=name)
+
+        self.batchers = {
+            'entities': batcher(lambda texts: self.extractor.extract_values_batch(texts, with_source=True), 'entities'),
+            'judge': batcher(self.judge.evaluate_responses, 'judge'),
+        }
+        if self.embedding_model is not None:
+            self.batchers['encode'] = batcher(self._encode, 'encode')
+        elif self.classifier is not None:
+            self.batchers['topic'] = batcher(self.classifier.classify_queries, 'topic')
+
+    def _encode(self, texts: List[str]) -> List[np.ndarray]:
+        return list(self.embedding_model.encode(texts, normalize_embeddings=True, show_progress_bar=False))
+
+    async def classify(self, query: str) -> Optional[Dict]:
+        if 'encode' in self.batchers:
+            embedding = await self.batchers['encode'].submit(query)
+            similarities = self.topic_centroids @ embedding
+            best = int(np.argmax(similarities))
+            return {
+                'topic_name': self.topics[best]['topic_name'],
+                'confidence': round(float(similarities[best]), 4),
+                'method': 'embedding'
+            }
+        if 'topic' in self.batchers:
+            result = await self.batchers['topic'].submit(query)
+            return {**result, 'method': 'llm'}
+        return None
+
+    async def analyze_query(self, query: str) -> Dict:
+        started = time.perf_counter()
+        topic, (entities, entities_source) = await asyncio.gather(
+            self.classify(query),
+            self.batchers['entities'].submit(query)
+        )
+        return {
+            'query': query,
+            'topic': topic,
+            'entities': entities,
+            'entities_source': entities_source,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    async def analyze_pair(self, query: str, response: str) -> Dict:
+        started = time.perf_counter()
+        topic, (entities, entities_source), evaluation = await asyncio.gather(
+            self.classify(query),
+            self.batchers['entities'].submit(combine_query_response(query, response)),
+            self.batchers['judge'].submit((query, response))
+        )
+        evaluation = asdict(evaluation)
+        evaluation.pop('query')
+        evaluation.pop('response')
+        return {
+            'query': query,
+            'response': response,
+            'topic': topic,
+            'entities': entities,
+            'entities_source': entities_source,
+            'evaluation': evaluation,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            name: {
+                'batches': b.stats.batches,
+                'items': b.stats.items,
+                'mean_batch': round(b.stats.mean_batch, 2),
+                'max_batch': b.stats.max_batch
+            }
+            for name, b in self.batchers.items()
+        }
@@ -1,13 +1,31 @@
 import os
+import re
 import json
+import numpy as np
 import pandas as pd
-from typing import Dict, List
-from dataclasses import dataclass, asdict
-from groq import Groq
-from dotenv import load_dotenv
+from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from skyrocket.core.registry import get_llm_client
+from skyrocket.llm.backends import model_for
+from skyrocket.llm.circuit_breaker import LLM_SOURCE, CircuitOpenError, get_breaker
+from skyrocket.utils.lazy import load_env
+from skyrocket.utils.perf import timed_completion, record_fallback
 from tqdm import tqdm
+from skyrocket.data.storage import read_columns, read_table, table_exists, find_column
+from skyrocket.data.enrichment_store import EnrichmentStore, content_hashes
 
-load_dotenv()
+load_env()
+
+MODEL_NAME = model_for('judge')
+PROMPT_VERSION = "judge-v1"
+
+FALLBACK_SOURCE = "heuristic"
+WORD_PATTERN = re.compile(r"[a-z0-9]{3,}")
+STOP_WORDS = {'the', 'and', 'for', 'you', 'your', 'with', 'have', 'that', 'this', 'from', 'are', 'was', 'can',
+              'will', 'please', 'would', 'could', 'what', 'when', 'how', 'why', 'not', 'but', 'about', 'our'}
+EMPATHY_CUES = ('sorry', 'apologi', 'understand', 'thank', 'appreciate', 'happy to help', 'glad to', 'frustrat')
+ESCALATION_CUES = ('manager', 'supervisor', 'human', 'real person', 'lawyer', 'legal', 'complaint', 'unacceptable',
+                   'furious', 'escalat', 'transfer you', 'specialist')
 
 @dataclass
 class ResponseEvaluation:
@@ -21,11 +39,109 @@ class ResponseEvaluation:
     bias: bool
     reasoning: str
     overall_quality: float
+    source: str = LLM_SOURCE
+
+SCORE_COLUMNS = ('accuracy', 'empathy', 'completeness', 'overall_quality')
+FLAG_COLUMNS = ('hallucination', 'escalation_needed', 'bias')
+
+@dataclass
+class JudgeMetrics:
+    count: int = 0
+    score_counts: Dict[str, int] = field(default_factory=lambda: {c: 0 for c in SCORE_COLUMNS})
+    score_means: Dict[str, float] = field(default_factory=lambda: {c: 0.0 for c in SCORE_COLUMNS})
+    score_m2: Dict[str, float] = field(default_factory=lambda: {c: 0.0 for c in SCORE_COLUMNS})
+    flag_counts: Dict[str, int] = field(default_factory=lambda: {c: 0 for c in FLAG_COLUMNS})
+    quality_distribution: Dict[str, int] = field(default_factory=lambda: {'excellent': 0, 'good': 0, 'poor': 0})
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray]) -> 'JudgeMetrics':
+        metrics = cls()
+        metrics.update(columns)
+        return metrics
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'JudgeMetrics':
+        return cls.from_columns({c: df[c].to_numpy() for c in SCORE_COLUMNS + FLAG_COLUMNS if c in df.columns})
+
+    def update(self, columns: Dict[str, np.ndarray]):
+        n = len(next(iter(columns.values()))) if columns else 0
+        if n == 0:
+            return self
+        
+        self.count += n
+        for col in SCORE_COLUMNS:
+            if col in columns:
+                values = np.asarray(columns[col], dtype=np.float64)
+                values = values[np.isfinite(values)]
+                if len(values):
+                    self._combine(col, len(values), float(values.mean()), float(((values - values.mean()) ** 2).sum()))
+        
+        for col in FLAG_COLUMNS:
+            if col in columns:
+                self.flag_counts[col] += int(np.count_nonzero(np.asarray(columns[col], dtype=bool)))
+        
+        if 'overall_quality' in columns:
+            quality = np.asarray(columns['overall_quality'], dtype=np.float64)
+            quality = quality[np.isfinite(quality)]
+            excellent = int(np.count_nonzero(quality >= 4.0))
+            poor = int(np.count_nonzero(quality < 3.0))
+            self.quality_distribution['excellent'] += excellent
+            self.quality_distribution['poor'] += poor
+            self.quality_distribution['good'] += len(quality) - excellent - poor
+        
+        return self
+
+    def _combine(self, col: str, count: int, mean: float, m2: float):
+        total = self.score_counts[col] + count
+        delta = mean - self.score_means[col]
+        self.score_m2[col] += m2 + delta ** 2 * self.score_counts[col] * count / total
+        self.score_means[col] += delta * count / total
+        self.score_counts[col] = total
+
+    def merge(self, other: 'JudgeMetrics') -> 'JudgeMetrics':
+        merged = JudgeMetrics(count=self.count + other.count)
+        for col in SCORE_COLUMNS:
+            for part in (self, other):
+                if part.score_counts[col]:
+                    merged._combine(col, part.score_counts[col], part.score_means[col], part.score_m2[col])
+        for col in FLAG_COLUMNS:
+            merged.flag_counts[col] = self.flag_counts[col] + other.flag_counts[col]
+        for bucket in merged.quality_distribution:
+            merged.quality_distribution[bucket] = self.quality_distribution[bucket] + other.quality_distribution[bucket]
+        return merged
+
+    def mean(self, col: str) -> float:
+        return self.score_means[col] if self.score_counts[col] else 0.0
+
+    def std(self, col: str) -> float:
+        if self.score_counts[col] < 2:
+            return float('nan')
+        return float(np.sqrt(self.score_m2[col] / (self.score_counts[col] - 1)))
+
+    def rate(self, flag: str) -> float:
+        return self.flag_counts[flag] / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'total_evaluated': self.count,
+            'avg_accuracy': self.mean('accuracy'),
+            'avg_empathy': self.mean('empathy'),
+            'avg_completeness': self.mean('completeness'),
+            'avg_overall_quality': self.mean('overall_quality'),
+            'hallucination_rate': self.rate('hallucination') * 100,
+            'escalation_rate': self.rate('escalation_needed') * 100,
+            'containment_rate': (1 - self.rate('escalation_needed')) * 100,
+            'bias_rate': self.rate('bias') * 100,
+            'quality_distribution': dict(self.quality_distribution)
+        }
 
 class LLMJudge:
-    def __init__(self, groq_api_key: str = None):
-        self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
-        self.groq_client = Groq(api_key=self.groq_api_key)
+    VERSION = f"{MODEL_NAME}:{PROMPT_VERSION}"
+    
+    def __init__(self, api_key: str = None):
+        self.llm_client = get_llm_client(api_key)
+        self.breaker = get_breaker('judge')
+        self.last_metrics = None
         
         self.evaluation_prompt_template = self._load_evaluation_prompt()
     
@@ -89,14 +205,115 @@ class LLMJudge:
 Provide only the JSON, nothing else."""
     
     def evaluate_response(self, query: str, response: str) -> ResponseEvaluation:
+        try:
+            return self.breaker.call(self._evaluate_with_llm, query, response)
+        except CircuitOpenError as e:
+            return self._evaluate_heuristically(query, response, str(e))
+        except Exception as e:
+            print(f"Warning: Error evaluating response: {e}")
+            return self._evaluate_heuristically(query, response, f"Error during evaluation: {str(e)}")
+    
+    def _evaluate_with_llm(self, query: str, response: str) -> ResponseEvaluation:
         prompt = self.evaluation_prompt_template.format(
             query=query,
             response=response
         )
         
-        try:
-            completion = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
+        completion = timed_completion(
+            self.llm_client,
+            module="judge",
+            model=MODEL_NAME,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert customer service quality evaluator. You provide objective, consistent assessments based on clear criteria."
+                },
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.2,
+            max_tokens=500
+        )
+        
+        response_text = completion.choices[0].message.content.strip()
+        
+        if "```json" in response_text:
+            response_text = response_text.split("```json")[1].split("```")[0].strip()
+        elif "```" in response_text:
+            response_text = response_text.split("```")[1].split("```")[0].strip()
+        
+        eval_data = json.loads(response_text)
+        
+        return self._to_evaluation(query, response, eval_data)
+    
+    def _evaluate_heuristically(self, query: str, response: str, reason: str) -> ResponseEvaluation:
+        record_fallback('judge', FALLBACK_SOURCE)
+        query_lower, response_lower = str(query).lower(), str(response).lower()
+        query_words = set(WORD_PATTERN.findall(query_lower)) - STOP_WORDS
+        response_words = WORD_PATTERN.findall(response_lower)
+        overlap = len(query_words & set(response_words)) / len(query_words) if query_words else 0.5
+        
+        accuracy = 2 + round(2 * overlap)
+        empathy = min(2 + sum(cue in response_lower for cue in EMPATHY_CUES), 5)
+        completeness = min(1 + (len(response_words) >= 8) + (len(response_words) >= 25) + (overlap >= 0.5), 5)
+        
+        return ResponseEvaluation(
+            query=query,
+            response=response,
+            accuracy=accuracy,
+            empathy=empathy,
+            completeness=completeness,
+            hallucination=False,
+            escalation_needed=any(cue in query_lower or cue in response_lower for cue in ESCALATION_CUES),
+            bias=False,
+            reasoning=f"Heuristic evaluation ({reason})",
+            overall_quality=(accuracy + empathy + completeness) / 3.0,
+            source=FALLBACK_SOURCE
+        )
+    
+    def _to_evaluation(self, query: str, response: str, eval_data: Dict) -> ResponseEvaluation:
+        overall_quality = (
+            eval_data.get('accuracy', 3) +
+            eval_data.get('empathy', 3) +
+            eval_data.get('completeness', 3)
+        ) / 3.0
+        
+        return ResponseEvaluation(
+            query=query,
+            response=response,
+            accuracy=eval_data.get('accuracy', 3),
+            empathy=eval_data.get('empathy', 3),
+            completeness=eval_data.get('completeness', 3),
+            hallucination=eval_data.get('hallucination', False),
+            escalation_needed=eval_data.get('escalation_needed', False),
+            bias=eval_data.get('bias', False),
+            reasoning=eval_data.get('reasoning', ''),
+            overall_quality=overall_quality
+        )
+    
+    def evaluate_responses(self, pairs: List[Tuple[str, str]]) -> List[ResponseEvaluation]:
+        if len(pairs) <= 1:
+            return [self.evaluate_response(query, response) for query, response in pairs]
+        
+        numbered = "\n\n".join(
+            f"[{i}]\nCustomer Query: {query}\nGenerated Response: {response}"
+            for i, (query, response) in enumerate(pairs, 1)
+        )
+        criteria = self.evaluation_prompt_template.split("**Evaluation Criteria:**")[1].split("**Respond in JSON format:**")[0]
+        prompt = f"""You are an expert evaluator of customer service responses. Evaluate each of the {len(pairs)} query-response pairs below.
+
+{numbered}
+
+**Evaluation Criteria:**
+{criteria.strip()}
+
+**Respond with ONLY a JSON object of the form:**
+{{"evaluations": [{{"index": <pair number>, "accuracy": <1-5>, "empathy": <1-5>, "completeness": <1-5>, "hallucination": <true/false>, "escalation_needed": <true/false>, "bias": <true/false>, "reasoning": "<brief explanation>"}}]}}"""
+        
+        def evaluate_with_llm() -> Dict[int, Dict]:
+            completion = timed_completion(
+                self.llm_client,
+                module="judge",
+                model=MODEL_NAME,
                 messages=[
                     {
                         "role": "system",
@@ -105,163 +322,168 @@ Provide only the JSON, nothing else."""
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.2,
-                max_tokens=500
-            )
-            
-            response_text = completion.choices[0].message.content.strip()
-            
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            eval_data = json.loads(response_text)
-            
-            overall_quality = (
-                eval_data.get('accuracy', 3) +
-                eval_data.get('empathy', 3) +
-                eval_data.get('completeness', 3)
-            ) / 3.0
-            
-            return ResponseEvaluation(
-                query=query,
-                response=response,
-                accuracy=eval_data.get('accuracy', 3),
-                empathy=eval_data.get('empathy', 3),
-                completeness=eval_data.get('completeness', 3),
-                hallucination=eval_data.get('hallucination', False),
-                escalation_needed=eval_data.get('escalation_needed', False),
-                bias=eval_data.get('bias', False),
-                reasoning=eval_data.get('reasoning', ''),
-                overall_quality=overall_quality
+                response_format={"type": "json_object"},
+                max_tokens=200 * len(pairs) + 100
             )
             
+            evaluations = json.loads(completion.choices[0].message.content).get('evaluations', [])
+            by_index = {
+                int(item['index']): item
+                for item in evaluations if isinstance(item, dict) and 'index' in item
+            }
+            if not set(range(1, len(pairs) + 1)) <= set(by_index):
+                raise ValueError(f"expected {len(pairs)} evaluations, got {len(by_index)}")
+            return by_index
+        
+        try:
+            by_index = self.breaker.call(evaluate_with_llm)
+        except CircuitOpenError as e:
+            return [self._evaluate_heuristically(query, response, str(e)) for query, response in pairs]
         except Exception as e:
-            print(f"Warning: Error evaluating response: {e}")
-            return ResponseEvaluation(
-                query=query,
-                response=response,
-                accuracy=3,
-                empathy=3,
-                completeness=3,
-                hallucination=False,
-                escalation_needed=False,
-                bias=False,
-                reasoning=f"Error during evaluation: {str(e)}",
-                overall_quality=3.0
-            )
+            print(f"Warning: batched evaluation failed ({e}), evaluating pairs one by one")
+            return [self.evaluate_response(query, response) for query, response in pairs]
+        
+        return [self._to_evaluation(query, response, by_index[i]) for i, (query, response) in enumerate(pairs, 1)]
     
     def evaluate_dataset(self, df: pd.DataFrame, 
                         query_col: str = 'Query',
                         response_col: str = 'response',
-                        sample_size: int = None) -> pd.DataFrame:
+                        sample_size: int = None,
+                        store: EnrichmentStore = None) -> pd.DataFrame:
         if sample_size:
             df = df.head(sample_size)
         
         print(f"Evaluating {len(df)} responses with Groq LLM-as-a-Judge...")
-        print(f"Model: llama-3.1-8b-instant")
+        print(f"Model: {MODEL_NAME}")
         print(f"Estimated time: ~{len(df) * 0.5:.0f} seconds")
         
-        evaluations = []
+        if store is not None:
+            added_hash = 'content_hash' not in df.columns
+            keyed_df = df.assign(content_hash=content_hashes(df, query_col, response_col)) if added_hash else df
+            result_df = store.enrich(
+                keyed_df, 'judge', self.VERSION,
+                lambda missing: self._evaluate_frame(missing, query_col, response_col)
+            )
+            if added_hash:
+                result_df = result_df.drop(columns='content_hash')
+        else:
+            result_df = self._evaluate_frame(df, query_col, response_col)
         
-        for idx, row in tqdm(df.iterrows(), total=len(df), desc="Evaluating"):
-            query = str(row[query_col])
-            response = str(row[response_col])
-            
-            eval_result = self.evaluate_response(query, response)
-            evaluations.append(eval_result)
+        self.last_metrics = JudgeMetrics.from_frame(result_df)
+        self._print_summary(self.last_metrics)
         
-        eval_df = pd.DataFrame([asdict(e) for e in evaluations])
+        fallbacks = int((result_df['judge_source'] != LLM_SOURCE).sum())
+        if fallbacks:
+            print(f"\nNote: {fallbacks}/{len(result_df)} evaluations used heuristic scores (judge_source='{FALLBACK_SOURCE}')")
         
-        result_df = df.copy()
-        result_df['accuracy'] = eval_df['accuracy']
-        result_df['empathy'] = eval_df['empathy']
-        result_df['completeness'] = eval_df['completeness']
-        result_df['hallucination'] = eval_df['hallucination']
-        result_df['escalation_needed'] = eval_df['escalation_needed']
-        result_df['bias'] = eval_df['bias']
-        result_df['overall_quality'] = eval_df['overall_quality']
-        result_df['judge_reasoning'] = eval_df['reasoning']
+        return result_df
+    
+    def _evaluate_frame(self, df: pd.DataFrame, query_col: str, response_col: str) -> pd.DataFrame:
+        n = len(df)
+        queries = df[query_col].astype(str).to_numpy()
+        responses = df[response_col].astype(str).to_numpy()
         
-        self._print_summary(result_df)
+        columns = {
+            'accuracy': np.empty(n, dtype=np.int64),
+            'empathy': np.empty(n, dtype=np.int64),
+            'completeness': np.empty(n, dtype=np.int64),
+            'hallucination': np.empty(n, dtype=bool),
+            'escalation_needed': np.empty(n, dtype=bool),
+            'bias': np.empty(n, dtype=bool),
+            'overall_quality': np.empty(n, dtype=np.float64),
+            'judge_reasoning': np.empty(n, dtype=object),
+            'judge_source': np.empty(n, dtype=object)
+        }
         
-        return result_df
+        for i, (query, response) in enumerate(tqdm(zip(queries, responses), total=n, desc="Evaluating")):
+            eval_result = self.evaluate_response(query, response)
+            
+            columns['accuracy'][i] = eval_result.accuracy
+            columns['empathy'][i] = eval_result.empathy
+            columns['completeness'][i] = eval_result.completeness
+            columns['hallucination'][i] = eval_result.hallucination
+            columns['escalation_needed'][i] = eval_result.escalation_needed
+            columns['bias'][i] = eval_result.bias
+            columns['overall_quality'][i] = eval_result.overall_quality
+            columns['judge_reasoning'][i] = eval_result.reasoning
+            columns['judge_source'][i] = eval_result.source
+        
+        return df.assign(**columns)
     
-    def _print_summary(self, df: pd.DataFrame):
+    def _print_summary(self, metrics: JudgeMetrics):
+        summary = metrics.to_dict()
+        total = max(metrics.count, 1)
         
         print(f"\n{'='*80}")
         print("LLM-AS-A-JUDGE EVALUATION SUMMARY")
         print('='*80)
         
         print(f"\nQuality Scores (1-5 scale):")
-        print(f"  Accuracy:     {df['accuracy'].mean():.2f} ± {df['accuracy'].std():.2f}")
-        print(f"  Empathy:      {df['empathy'].mean():.2f} ± {df['empathy'].std():.2f}")
-        print(f"  Completeness: {df['completeness'].mean():.2f} ± {df['completeness'].std():.2f}")
-        print(f"  Overall:      {df['overall_quality'].mean():.2f} ± {df['overall_quality'].std():.2f}")
+        print(f"  Accuracy:     {metrics.mean('accuracy'):.2f} ± {metrics.std('accuracy'):.2f}")
+        print(f"  Empathy:      {metrics.mean('empathy'):.2f} ± {metrics.std('empathy'):.2f}")
+        print(f"  Completeness: {metrics.mean('completeness'):.2f} ± {metrics.std('completeness'):.2f}")
+        print(f"  Overall:      {metrics.mean('overall_quality'):.2f} ± {metrics.std('overall_quality'):.2f}")
         
         print(f"\nIssue Flags:")
-        hallucination_rate = df['hallucination'].sum() / len(df) * 100
-        escalation_rate = df['escalation_needed'].sum() / len(df) * 100
-        bias_rate = df['bias'].sum() / len(df) * 100
-        
-        print(f"   Hallucination Rate:  {hallucination_rate:.1f}% ({df['hallucination'].sum()} cases)")
-        print(f"   Escalation Needed:   {escalation_rate:.1f}% ({df['escalation_needed'].sum()} cases)")
-        print(f"   Bias Detected:       {bias_rate:.1f}% ({df['bias'].sum()} cases)")
+        print(f"   Hallucination Rate:  {summary['hallucination_rate']:.1f}% ({metrics.flag_counts['hallucination']} cases)")
+        print(f"   Escalation Needed:   {summary['escalation_rate']:.1f}% ({metrics.flag_counts['escalation_needed']} cases)")
+        print(f"   Bias Detected:       {summary['bias_rate']:.1f}% ({metrics.flag_counts['bias']} cases)")
         
         print(f"\nContainment Metrics:")
-        containment_rate = (1 - escalation_rate / 100) * 100
-        print(f"  Containment Rate: {containment_rate:.1f}%")
-        print(f"  Successfully resolved without human: {len(df) - df['escalation_needed'].sum()}/{len(df)}")
+        print(f"  Containment Rate: {summary['containment_rate']:.1f}%")
+        print(f"  Successfully resolved without human: {metrics.count - metrics.flag_counts['escalation_needed']}/{metrics.count}")
         
         print(f"\nQuality Distribution:")
-        quality_excellent = (df['overall_quality'] >= 4.0).sum()
-        quality_good = ((df['overall_quality'] >= 3.0) & (df['overall_quality'] < 4.0)).sum()
-        quality_poor = (df['overall_quality'] < 3.0).sum()
-        
-        print(f"  Excellent (4.0+): {quality_excellent} ({quality_excellent/len(df)*100:.1f}%)")
-        print(f"  Good (3.0-4.0):   {quality_good} ({quality_good/len(df)*100:.1f}%)")
-        print(f"  Poor (<3.0):      {quality_poor} ({quality_poor/len(df)*100:.1f}%)")
+        distribution = summary['quality_distribution']
+        print(f"  Excellent (4.0+): {distribution['excellent']} ({distribution['excellent']/total*100:.1f}%)")
+        print(f"  Good (3.0-4.0):   {distribution['good']} ({distribution['good']/total*100:.1f}%)")
+        print(f"  Poor (<3.0):      {distribution['poor']} ({distribution['poor']/total*100:.1f}%)")
 
-def main():
+def main(data_dir: str = None, enrichment_db: str = None, responses_df: pd.DataFrame = None):
     import datetime
     
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-    data_dir = os.path.join(base_dir, 'data')
+    if data_dir is None:
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        data_dir = os.path.join(base_dir, 'data')
     
     os.makedirs(data_dir, exist_ok=True)
     
-    responses_path = os.path.join(data_dir, "genai_responses.csv")
-    if not os.path.exists(responses_path):
-        print(f"Error: genai_responses.csv not found at {responses_path}")
+    if responses_df is None and not table_exists(data_dir, "genai_responses"):
+        print(f"Error: genai_responses table not found in {data_dir}")
         print("Please ensure the file exists in the data directory.")
         return
     
     try:
         print("\nLoading GenAI responses data...")
-        df = pd.read_csv(responses_path)
+        columns = list(responses_df.columns) if responses_df is not None else read_columns(data_dir, "genai_responses")
         
-        print(f"\nAvailable columns: {', '.join(df.columns.tolist())}")
+        print(f"\nAvailable columns: {', '.join(columns)}")
         
-        query_col = next((col for col in df.columns if 'query' in col.lower()), None)
-        response_col = next((col for col in df.columns if 'response' in col.lower()), None)
+        query_col = find_column(columns, 'query')
+        response_col = find_column(columns, 'response')
         
         if not query_col or not response_col:
-            print("\nError: Could not find required columns in genai_responses.csv")
+            print("\nError: Could not find required columns in genai_responses")
             print("Looking for columns containing 'query' and 'response' (case-insensitive)")
             print("\nAvailable columns:")
-            for col in df.columns:
+            for col in columns:
                 print(f"- {col}")
             return
         
         print(f"Using columns: '{query_col}' as query, '{response_col}' as response")
         
+        if responses_df is not None:
+            df = responses_df[[query_col, response_col]].copy()
+        else:
+            df = read_table(data_dir, "genai_responses", columns=[query_col, response_col])
+        
         print("\nInitializing LLM Judge with Groq...")
         try:
             judge = LLMJudge()
-            print("Groq client initialized successfully")
+            print("LLM client initialized successfully")
         except Exception as e:
-            print(f"Failed to initialize Groq client: {str(e)}")
-            print("Please ensure you have set the GROQ_API_KEY environment variable")
+            print(f"Failed to initialize LLM client: {str(e)}")
+            print("Please set GROQ_API_KEY, or choose another backend with SKYROCKET_LLM_BACKEND")
             return
         
         print(f"\nStarting LLM Judge evaluation...")
@@ -269,25 +491,13 @@ def main():
             df,
             query_col=query_col,
             response_col=response_col,
-            sample_size=100
+            sample_size=100,
+            store=EnrichmentStore(enrichment_db or os.path.join(data_dir, "enrichment.db"))
         )
         
         results = {
             'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'total_evaluated': len(eval_df),
-            'avg_accuracy': float(eval_df['accuracy'].mean()),
-            'avg_empathy': float(eval_df['empathy'].mean()),
-            'avg_completeness': float(eval_df['completeness'].mean()),
-            'avg_overall_quality': float(eval_df['overall_quality'].mean()),
-            'hallucination_rate': float(eval_df['hallucination'].mean() * 100),
-            'escalation_rate': float(eval_df['escalation_needed'].mean() * 100),
-            'containment_rate': float((1 - eval_df['escalation_needed'].mean()) * 100),
-            'bias_rate': float(eval_df['bias'].mean() * 100),
-            'quality_distribution': {
-                'excellent': int((eval_df['overall_quality'] >= 4.0).sum()),
-                'good': int(((eval_df['overall_quality'] >= 3.0) & (eval_df['overall_quality'] < 4.0)).sum()),
-                'poor': int((eval_df['overall_quality'] < 3.0).sum())
-            },
+            **judge.last_metrics.to_dict(),
             'samples': eval_df.head(20).to_dict('records')
         }
         
@@ -305,6 +515,7 @@ def main():
         print('='*80)
         print(f"Results saved to: {output_path}")
         print(f"Full evaluations saved to: {csv_output_path}")
+        return output_path
         
     except Exception as e:
         print(f"\nAn error occurred: {str(e)}")
@@ -0,0 +1,56 @@
+import os
+import threading
+from typing import Dict
+from skyrocket.utils.lazy import lazy_import, load_env
+
+load_env()
+
+backends = lazy_import('skyrocket.llm.backends')
+sentence_transformers = lazy_import('sentence_transformers')
+
+EMBEDDING_MODEL_NAME = os.getenv("SKYROCKET_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+_lock = threading.Lock()
+_embedding_models = {}
+_llm_clients = {}
+
+def get_embedding_model(model_name: str = EMBEDDING_MODEL_NAME):
+    with _lock:
+        if model_name not in _embedding_models:
+            print(f"Loading embedding model {model_name}...")
+            _embedding_models[model_name] = sentence_transformers.SentenceTransformer(model_name)
+        return _embedding_models[model_name]
+
+def get_llm_client(api_key: str = None, backend: str = None) -> 'backends.LLMBackend':
+    key = (backend or backends.LLM_BACKEND, api_key)
+    with _lock:
+        if key not in _llm_clients:
+            _llm_clients[key] = backends.create_backend(backend, api_key=api_key)
+        return _llm_clients[key]
+
+def warm_up(embedding_model: bool = True) -> Dict[str, bool]:
+    status = {}
+
+    try:
+        get_llm_client()
+        status['llm_client'] = True
+    except Exception as e:
+        print(f"Could not create LLM client: {e}")
+        status['llm_client'] = False
+
+    if embedding_model:
+        try:
+            get_embedding_model()
+            status['embedding_model'] = True
+        except Exception as e:
+            print(f"Could not load embedding model {EMBEDDING_MODEL_NAME}: {e}")
+            status['embedding_model'] = False
+
+    return status
+
+def loaded() -> Dict[str, list]:
+    with _lock:
+        return {
+            'embedding_models': list(_embedding_models),
+            'llm_clients': [backend for backend, _ in _llm_clients]
+        }
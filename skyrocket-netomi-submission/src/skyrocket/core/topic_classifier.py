@@ -1,24 +1,53 @@
 import os
 import json
+import hashlib
+import numpy as np
 import pandas as pd
 from typing import List, Dict
-from groq import Groq
-from dotenv import load_dotenv
+from skyrocket.core.registry import get_llm_client, get_embedding_model
+from skyrocket.llm.backends import model_for
+from skyrocket.llm.circuit_breaker import LLM_SOURCE, CircuitOpenError, get_breaker
+from skyrocket.utils.lazy import load_env
+from skyrocket.utils.perf import timed_completion, record_fallback
 from collections import defaultdict
 import random
 
-load_dotenv()
+load_env()
+
+MODEL_NAME = model_for('classifier')
+PROMPT_VERSION = "few-shot-v1"
+CENTROID_EXAMPLES = 10
+CENTROID_MIN_SIMILARITY = 0.3
+FALLBACK_SOURCE = "embedding_centroid"
+
+def build_topic_centroids(topics: List[Dict], embedding_model) -> np.ndarray:
+    centroids = []
+    for topic in topics:
+        examples = topic.get('representative_queries', [])[:CENTROID_EXAMPLES] or [topic['topic_name']]
+        embeddings = embedding_model.encode(examples, normalize_embeddings=True, show_progress_bar=False)
+        centroid = np.asarray(embeddings).mean(axis=0)
+        centroids.append(centroid / (np.linalg.norm(centroid) or 1.0))
+    return np.vstack(centroids)
 
 class TopicClassifier:
-    def __init__(self, topics_config: Dict, groq_api_key: str = None):
+    def __init__(self, topics_config: Dict, api_key: str = None):
         self.topics = topics_config['topics']
-        self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
-        self.groq_client = Groq(api_key=self.groq_api_key)
+        self.llm_client = get_llm_client(api_key)
+        self.breaker = get_breaker('classifier')
+        self._embedding_model = None
+        self._topic_centroids = None
+        self._embedding_unavailable = False
         
         self.few_shot_prompt = self._build_few_shot_prompt()
     
-    def _build_few_shot_prompt(self) -> str:
-        
+    @property
+    def version(self) -> str:
+        topics_digest = hashlib.sha256(
+            "|".join(t['topic_name'] for t in self.topics).encode('utf-8')
+        ).hexdigest()[:12]
+        return f"{MODEL_NAME}:{PROMPT_VERSION}:{topics_digest}"
+    
+    def _build_topic_context(self) -> List[str]:
         prompt_parts = [
             "You are a customer service query classifier. Classify queries into one of these topics:\n"
         ]
@@ -38,6 +67,11 @@ class TopicClassifier:
                 prompt_parts.append(f"Query: \"{example}\"")
                 prompt_parts.append(f"Topic: {topic_name}\n")
         
+        return prompt_parts
+    
+    def _build_few_shot_prompt(self) -> str:
+        prompt_parts = self._build_topic_context()
+        
         prompt_parts.append(
             "\n**Task**: Classify the following query into ONE of the topics above.\n"
         )
@@ -48,42 +82,129 @@ class TopicClassifier:
         return "\n".join(prompt_parts)
     
     def classify_query(self, query: str) -> Dict[str, str]:
+        try:
+            return self.breaker.call(self._classify_with_llm, query)
+        except CircuitOpenError:
+            pass
+        except Exception as e:
+            print(f"Error classifying query: {e}")
+        
+        return self._classify_locally(query)
+    
+    def _classify_with_llm(self, query: str) -> Dict[str, str]:
         classification_prompt = self.few_shot_prompt + f"\nQuery: \"{query}\"\nTopic:"
         
+        completion = timed_completion(
+            self.llm_client,
+            module="classifier",
+            model=MODEL_NAME,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a precise topic classifier. Respond only with the topic name."
+                },
+                {"role": "user", "content": classification_prompt}
+            ],
+            temperature=0.1,
+            max_tokens=50
+        )
+        
+        predicted_topic = completion.choices[0].message.content.strip()
+        
+        predicted_topic = predicted_topic.replace("**", "").strip()
+        
+        valid_topics = [t['topic_name'] for t in self.topics]
+        
+        if predicted_topic not in valid_topics:
+            predicted_topic = self._fuzzy_match(predicted_topic, valid_topics)
+        
+        return {
+            "topic_name": predicted_topic,
+            "confidence": "high",
+            "source": LLM_SOURCE
+        }
+    
+    def _classify_locally(self, query: str) -> Dict[str, str]:
+        record_fallback('classifier', FALLBACK_SOURCE)
+        unknown = {"topic_name": "Unknown", "confidence": "low", "source": FALLBACK_SOURCE}
+        if self._embedding_unavailable:
+            return unknown
+        
+        if self._topic_centroids is None:
+            try:
+                self._embedding_model = get_embedding_model()
+                self._topic_centroids = build_topic_centroids(self.topics, self._embedding_model)
+            except Exception as e:
+                print(f"Embedding fallback unavailable, classifying as Unknown from now on ({e})")
+                self._embedding_unavailable = True
+                return unknown
+        
         try:
-            completion = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
+            embedding = self._embedding_model.encode([query], normalize_embeddings=True, show_progress_bar=False)[0]
+        except Exception as e:
+            print(f"Embedding fallback failed for query ({e})")
+            return unknown
+        
+        similarities = self._topic_centroids @ embedding
+        best = int(np.argmax(similarities))
+        return {
+            "topic_name": self.topics[best]['topic_name'],
+            "confidence": "medium" if similarities[best] >= CENTROID_MIN_SIMILARITY else "low",
+            "source": FALLBACK_SOURCE
+        }
+    
+    def classify_queries(self, queries: List[str]) -> List[Dict[str, str]]:
+        if len(queries) <= 1:
+            return [self.classify_query(query) for query in queries]
+        
+        numbered = "\n".join(f"[{i}] \"{query}\"" for i, query in enumerate(queries, 1))
+        prompt_parts = self._build_topic_context()
+        prompt_parts.append(f"\n**Task**: Classify each of the {len(queries)} queries below into ONE of the topics above.\n")
+        prompt_parts.append(numbered)
+        prompt_parts.append(
+            f'\nRespond with ONLY a JSON object of the form {{"topics": ["<topic name>", ...]}} '
+            f"containing exactly {len(queries)} topic names, in the same order as the queries."
+        )
+        
+        def classify_with_llm() -> List:
+            completion = timed_completion(
+                self.llm_client,
+                module="classifier",
+                model=MODEL_NAME,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a precise topic classifier. Respond only with the topic name."
+                        "content": "You are a precise topic classifier. Respond only with JSON."
                     },
-                    {"role": "user", "content": classification_prompt}
+                    {"role": "user", "content": "\n".join(prompt_parts)}
                 ],
                 temperature=0.1,
-                max_tokens=50
+                response_format={"type": "json_object"},
+                max_tokens=20 * len(queries) + 50
             )
             
-            predicted_topic = completion.choices[0].message.content.strip()
-            
-            predicted_topic = predicted_topic.replace("**", "").strip()
-            
-            valid_topics = [t['topic_name'] for t in self.topics]
-            
+            predicted_topics = json.loads(completion.choices[0].message.content).get('topics', [])
+            if len(predicted_topics) != len(queries):
+                raise ValueError(f"expected {len(queries)} topics, got {len(predicted_topics)}")
+            return predicted_topics
+        
+        try:
+            predicted_topics = self.breaker.call(classify_with_llm)
+        except CircuitOpenError:
+            return [self._classify_locally(query) for query in queries]
+        except Exception as e:
+            print(f"Batched classification failed ({e}), classifying queries one by one")
+            return [self.classify_query(query) for query in queries]
+        
+        valid_topics = [t['topic_name'] for t in self.topics]
+        results = []
+        for predicted_topic in predicted_topics:
+            predicted_topic = str(predicted_topic).replace("**", "").strip()
             if predicted_topic not in valid_topics:
                 predicted_topic = self._fuzzy_match(predicted_topic, valid_topics)
-            
-            return {
-                "topic_name": predicted_topic,
-                "confidence": "high"
-            }
-            
-        except Exception as e:
-            print(f"Error classifying query: {e}")
-            return {
-                "topic_name": "Unknown",
-                "confidence": "low"
-            }
+            results.append({"topic_name": predicted_topic, "confidence": "high", "source": LLM_SOURCE})
+        
+        return results
     
     def _fuzzy_match(self, prediction: str, valid_topics: List[str]) -> str:
         prediction_lower = prediction.lower()
@@ -1,22 +1,24 @@
 import os
 import numpy as np
 import pandas as pd
-from sentence_transformers import SentenceTransformer
-from umap import UMAP
-from hdbscan import HDBSCAN
-from groq import Groq
+from skyrocket.core.registry import get_embedding_model, get_llm_client
 from typing import List, Dict, Tuple
 import json
 from collections import defaultdict, Counter
-from dotenv import load_dotenv
+from skyrocket.llm.backends import model_for
+from skyrocket.utils.lazy import lazy_import, load_env
+from skyrocket.utils.perf import timed_completion
+from skyrocket.data.storage import read_table, table_exists
 
-load_dotenv()
+load_env()
+
+umap = lazy_import('umap')
+hdbscan = lazy_import('hdbscan')
 
 class TopicDiscoverer:
-    def __init__(self, groq_api_key: str = None):
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
-        self.groq_client = Groq(api_key=self.groq_api_key)
+    def __init__(self, api_key: str = None):
+        self.embedding_model = get_embedding_model()
+        self.llm_client = get_llm_client(api_key)
         
     def generate_embeddings(self, queries: List[str]) -> np.ndarray:
         print(f"Generating embeddings for {len(queries)} queries...")
@@ -26,7 +28,7 @@ class TopicDiscoverer:
     
     def reduce_dimensions(self, embeddings: np.ndarray) -> np.ndarray:
         print(f"Reducing dimensions with UMAP...")
-        umap_model = UMAP(
+        umap_model = umap.UMAP(
             n_components=5,
             n_neighbors=15,
             min_dist=0.0,
@@ -39,7 +41,7 @@ class TopicDiscoverer:
     
     def cluster_queries(self, reduced_embeddings: np.ndarray) -> np.ndarray:
         print(f"Clustering with HDBSCAN...")
-        clusterer = HDBSCAN(
+        clusterer = hdbscan.HDBSCAN(
             min_cluster_size=50,
             min_samples=10,
             metric='euclidean',
@@ -115,6 +117,47 @@ IMPORTANT: Your response must be valid JSON with exactly these two fields. Examp
   "topic_name": "Account Management",
   "description": "Customers need help with account-related issues"
 }
+```""".replace("{queries}", queries_text)
+        
+        last_error = "Unknown error"
+        for attempt in range(max_retries + 1):
+            try:
+                completion = timed_completion(
+                    self.llm_client,
+                    module="labeler",
+                    attempt=attempt,
+                    model=model_for('labeler'),
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are an expert at analyzing customer service data. Respond only with valid JSON."
+                        },
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.3,
+                    max_tokens=200
+                )
+                
+                response_text = completion.choices[0].message.content.strip()
+                label_data = self._extract_json_from_response(response_text)
+                
+                if label_data and label_data.get("topic_name") and label_data.get("description"):
+                    return {
+                        "topic_name": str(label_data["topic_name"]).strip(),
+                        "description": str(label_data["description"]).strip(),
+                        "cluster_id": cluster_id
+                    }
+                
+                last_error = f"Invalid response format: {response_text[:100]}"
+                
+            except Exception as e:
+                last_error = str(e)
+            
+            print(f"   Attempt {attempt + 1} failed for cluster {cluster_id}: {last_error}")
+        
+        return self._create_error_response(cluster_id, last_error)
+    
+    def _create_error_response(self, cluster_id: int, error_msg: str) -> Dict[str, str]:
         return {
             "topic_name": f"Topic {cluster_id}",
             "description": f"Error during labeling: {error_msg}",
@@ -162,8 +205,6 @@ IMPORTANT: Your response must be valid JSON with exactly these two fields. Examp
                 cluster_id
             )
             topic_labels[cluster_id] = label_info
-            import time
-            time.sleep(2)  
         
         
         results = {
@@ -201,20 +242,21 @@ IMPORTANT: Your response must be valid JSON with exactly these two fields. Examp
         
         return results
 
-def main():
+def main(data_dir: str = None, queries: List[str] = None):
 
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-    data_dir = os.path.join(base_dir, 'data')
+    if data_dir is None:
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        data_dir = os.path.join(base_dir, 'data')
     
     
-    queries_path = os.path.join(data_dir, "queries.csv")
-    if not os.path.exists(queries_path):
-        print(f" queries.csv not found at {queries_path}")
-        print("Please run prepare_data.py first.")
-        return
+    if queries is None:
+        if not table_exists(data_dir, "queries"):
+            print(f" queries table not found in {data_dir}")
+            print("Please run prepare_data.py first.")
+            return
 
-    queries_df = pd.read_csv(queries_path)
-    queries = queries_df['Queries'].dropna().tolist()
+        queries_df = read_table(data_dir, "queries", columns=['Queries'])
+        queries = queries_df['Queries'].dropna().tolist()
     
     print(f"Loaded {len(queries)} queries")
     
@@ -241,5 +283,6 @@ def main():
         json.dump(results, f, indent=2)
     
     print(f"\n Results saved to: {output_path}")
+    return output_path
 if __name__ == "__main__":
     main()
@@ -0,0 +1,143 @@
+import os
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+from typing import Callable, Dict, Iterable
+import numpy as np
+import pandas as pd
+from skyrocket.utils import perf
+from skyrocket.llm.circuit_breaker import LLM_SOURCE
+
+SQLITE_MAX_PARAMS = 900
+
+STAGE_COLUMNS = {
+    'topic': ['topic', 'topic_source'],
+    'entities': ['entities', 'entities_source'],
+    'judge': [
+        'accuracy', 'empathy', 'completeness', 'hallucination',
+        'escalation_needed', 'bias', 'overall_quality', 'judge_reasoning', 'judge_source'
+    ],
+}
+SOURCE_COLUMNS = {stage: f"{stage}_source" for stage in STAGE_COLUMNS}
+
+def content_hash(query: str, response: str = None) -> str:
+    payload = f"{query}\x1f{response if response is not None else ''}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def content_hashes(df: pd.DataFrame, query_col: str, response_col: str = None) -> pd.Series:
+    queries = df[query_col].astype(str)
+    responses = df[response_col].astype(str) if response_col and response_col in df.columns else [None] * len(df)
+    return pd.Series([content_hash(q, r) for q, r in zip(queries, responses)], index=df.index)
+
+class EnrichmentStore:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        column_defs = []
+        for stage, columns in STAGE_COLUMNS.items():
+            column_defs.extend(f"{col} TEXT" for col in columns)
+            column_defs.append(f"{stage}_version TEXT")
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS enrichments (
+                    content_hash TEXT PRIMARY KEY,
+                    {', '.join(column_defs)},
+                    updated_at TEXT NOT NULL
+                ) WITHOUT ROWID
+            """)
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(enrichments)")}
+            for column_def in column_defs:
+                if column_def.split()[0] not in existing:
+                    conn.execute(f"ALTER TABLE enrichments ADD COLUMN {column_def}")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def _encode(value):
+        if value is None or (np.isscalar(value) and pd.isna(value)):
+            return None
+        if isinstance(value, np.generic):
+            value = value.item()
+        return json.dumps(value, default=list)
+
+    @staticmethod
+    def _decode(value):
+        return json.loads(value) if value is not None else None
+
+    def lookup(self, hashes: Iterable[str], stage: str, version: str) -> pd.DataFrame:
+        columns = STAGE_COLUMNS[stage]
+        hashes = list(dict.fromkeys(hashes))
+        rows = []
+
+        with self._connect() as conn:
+            for i in range(0, len(hashes), SQLITE_MAX_PARAMS):
+                batch = hashes[i:i + SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows.extend(conn.execute(
+                    f"SELECT content_hash, {', '.join(columns)} FROM enrichments "
+                    f"WHERE {stage}_version = ? AND content_hash IN ({placeholders})",
+                    [version, *batch]
+                ).fetchall())
+
+        records = {row[0]: [self._decode(v) for v in row[1:]] for row in rows}
+        return pd.DataFrame.from_dict(records, orient='index', columns=columns)
+
+    def upsert(self, hashes: Iterable[str], stage: str, version: str, values: pd.DataFrame):
+        columns = STAGE_COLUMNS[stage]
+        now = datetime.now().isoformat()
+        rows = [
+            (h, *[self._encode(value) for value in record], version, now)
+            for h, record in zip(hashes, values[columns].itertuples(index=False, name=None))
+        ]
+        if not rows:
+            return
+
+        assignments = ", ".join(f"{col} = excluded.{col}" for col in columns + [f"{stage}_version", "updated_at"])
+        placeholders = ", ".join("?" * (len(columns) + 3))
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO enrichments (content_hash, {', '.join(columns)}, {stage}_version, updated_at) "
+                f"VALUES ({placeholders}) ON CONFLICT(content_hash) DO UPDATE SET {assignments}",
+                rows
+            )
+
+    def enrich(self, df: pd.DataFrame, stage: str, version: str,
+               compute: Callable[[pd.DataFrame], pd.DataFrame],
+               hash_col: str = 'content_hash') -> pd.DataFrame:
+        columns = STAGE_COLUMNS[stage]
+        cached = self.lookup(df[hash_col], stage, version)
+        missing = df[~df[hash_col].isin(cached.index)]
+
+        print(f"   Enrichment store [{stage}]: {len(df) - len(missing)} cached, {len(missing)} to compute")
+        perf.record_cache_hits(len(df) - len(missing))
+
+        if len(missing):
+            computed = compute(missing)
+            source_col = SOURCE_COLUMNS[stage]
+            if source_col not in computed.columns:
+                computed = computed.assign(**{source_col: LLM_SOURCE})
+            persisted = computed[computed[source_col] == LLM_SOURCE]
+            if len(persisted) < len(computed):
+                print(f"   Enrichment store [{stage}]: not caching {len(computed) - len(persisted)} fallback rows")
+            self.upsert(persisted[hash_col], stage, version, persisted)
+            computed_values = computed.set_index(hash_col)[columns]
+            computed_values = computed_values[~computed_values.index.duplicated(keep='last')]
+            cached = pd.concat([cached, computed_values])
+
+        values = cached.reindex(df[hash_col]).infer_objects()
+        values[SOURCE_COLUMNS[stage]] = values[SOURCE_COLUMNS[stage]].fillna(LLM_SOURCE)
+        return df.assign(**{col: values[col].to_numpy() for col in columns})
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            counts = {'rows': conn.execute("SELECT COUNT(*) FROM enrichments").fetchone()[0]}
+            for stage in STAGE_COLUMNS:
+                counts[stage] = conn.execute(
+                    f"SELECT COUNT(*) FROM enrichments WHERE {stage}_version IS NOT NULL"
+                ).fetchone()[0]
+        return counts
@@ -1,88 +1,260 @@
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import os
+from datetime import date, datetime
 from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+from openpyxl import load_workbook
+from skyrocket.data.storage import table_path
+from skyrocket.data.profiler import DatasetProfile
 
-def prepare_data(excel_path: str, output_dir: str = "data"):
-    print("="*80)
-    print("SkyRocket Data Preparation - Netomi AI Automation Engineer Submission")
-    print("="*80)
-    
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
-    print(f"\nLoading Excel file: {excel_path}")
-    xl_file = pd.ExcelFile(excel_path)
-    print(f"Sheets found: {xl_file.sheet_names}")
-    
-    print("\n1. Processing Queries sheet...")
-    queries_df = pd.read_excel(excel_path, sheet_name='Queries')
-    print(f"   Shape: {queries_df.shape}")
-    print(f"   Columns: {list(queries_df.columns)}")
+SHEET_OUTPUTS = {
+    'Queries': 'queries',
+    'GenAI_responses': 'genai_responses',
+}
+
+PROFILE_SPECS = {
+    'queries': {'distinct_columns': ['Queries']},
+    'genai_responses': {
+        'heavy_hitter_columns': ['category', 'Sub Category', 'flags'],
+        'length_columns': ['response']
+    },
+}
+CHUNK_SIZE = 10_000
+
+def _iter_row_chunks(rows: Iterator[tuple], chunk_size: int) -> Iterator[List[tuple]]:
+    chunk = []
+    for row in rows:
+        if all(value is None for value in row):
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _infer_type(values: List) -> Optional[pa.DataType]:
+    present = [value for value in values if value is not None]
+    if not present:
+        return None
+    if all(isinstance(value, datetime) for value in present):
+        return pa.timestamp('us')
+    if all(isinstance(value, date) for value in present):
+        return pa.date32()
+    if all(isinstance(value, bool) for value in present):
+        return pa.bool_()
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return pa.int64()
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return pa.float64()
+    return pa.string()
+
+def _widen_type(current: Optional[pa.DataType], seen: Optional[pa.DataType]) -> Optional[pa.DataType]:
+    if seen is None or current == seen:
+        return current
+    if current is None:
+        return seen
+    if {current, seen} == {pa.int64(), pa.float64()}:
+        return pa.float64()
+    return pa.string()
+
+def _column_values(chunk: List[tuple], index: int) -> List:
+    return [row[index] if index < len(row) else None for row in chunk]
+
+def _widen_schema(schema: Optional[pa.Schema], columns: List[str], chunk: List[tuple]) -> pa.Schema:
+    return pa.schema([
+        (name, _widen_type(schema.field(i).type if schema is not None else None,
+                           _infer_type(_column_values(chunk, i))) or pa.string())
+        for i, name in enumerate(columns)
+    ])
+
+def _cell_text(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _to_array(values: List, data_type: pa.DataType) -> pa.Array:
+    if pa.types.is_string(data_type):
+        values = [_cell_text(value) for value in values]
+    return pa.array(values, type=data_type)
+
+def _chunk_to_table(chunk: List[tuple], schema: pa.Schema) -> pa.Table:
+    return pa.Table.from_arrays([_to_array(_column_values(chunk, i), field.type) for i, field in enumerate(schema)],
+                                schema=schema)
+
+def _rewrite_widened(source: str, writer: pq.ParquetWriter, schema: pa.Schema):
+    for batch in pq.ParquetFile(source).iter_batches():
+        writer.write_table(pa.Table.from_arrays([
+            _to_array(column.to_pylist(), field.type) if pa.types.is_string(field.type) else column.cast(field.type)
+            for column, field in zip(batch.columns, schema)
+        ], schema=schema))
+
+def stream_sheet_to_files(worksheet, output_dir: str, output_name: str,
+                          chunk_size: int = CHUNK_SIZE,
+                          progress_callback: Optional[Callable[[str, int, Optional[int]], None]] = None,
+                          profile: Optional[DatasetProfile] = None) -> Dict:
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        raise ValueError(f"Sheet '{worksheet.title}' is empty")
     
-    queries_csv_path = os.path.join(output_dir, "queries.csv")
-    queries_df.to_csv(queries_csv_path, index=False)
-    print(f"  Saved to: {queries_csv_path}")
+    columns = [str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+    total_rows = worksheet.max_row - 1 if worksheet.max_row else None
     
-    print("\n2. Processing GenAI_responses sheet...")
-    responses_df = pd.read_excel(excel_path, sheet_name='GenAI_responses')
-    print(f"   Shape: {responses_df.shape}")
-    print(f"   Columns: {list(responses_df.columns)}")
+    parquet_path = table_path(output_dir, output_name)
     
-    responses_csv_path = os.path.join(output_dir, "genai_responses.csv")
-    responses_df.to_csv(responses_csv_path, index=False)
-    print(f"  Saved to: {responses_csv_path}")
+    # Types come from the rows seen so far. A later chunk that does not fit widens the column
+    # (int64 -> float64 -> string) and the rows already written are copied over to the wider schema.
+    schema = None
+    writer = None
+    part_path = None
+    generation = 0
+    rows_written = 0
+    try:
+        for chunk in _iter_row_chunks(rows, chunk_size):
+            widened = _widen_schema(schema, columns, chunk)
+            if writer is None or not widened.equals(schema):
+                previous = part_path
+                if writer is not None:
+                    writer.close()
+                generation += 1
+                part_path = f"{parquet_path}.{generation}.tmp"
+                writer = pq.ParquetWriter(part_path, widened)
+                if previous is not None:
+                    print(f"   Widened column types after {rows_written:,} rows, rewriting earlier rows")
+                    _rewrite_widened(previous, writer, widened)
+                    os.remove(previous)
+                schema = widened
+            
+            table = _chunk_to_table(chunk, schema)
+            writer.write_table(table)
+            if profile is not None:
+                profile.update(table.to_pandas())
+            
+            rows_written += table.num_rows
+            if progress_callback:
+                progress_callback(worksheet.title, rows_written, total_rows)
+        
+        if writer is None:
+            schema = _widen_schema(None, columns, [])
+            part_path = f"{parquet_path}.{generation}.tmp"
+            writer = pq.ParquetWriter(part_path, schema)
+        writer.close()
+        writer = None
+        os.replace(part_path, parquet_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if part_path is not None and os.path.exists(part_path):
+            os.remove(part_path)
     
+    return {
+        'sheet': worksheet.title,
+        'rows': rows_written,
+        'columns': columns,
+        'schema': {field.name: str(field.type) for field in schema},
+        'parquet_path': parquet_path
+    }
+
+def print_exploration_report(queries_profile: DatasetProfile, responses_profile: DatasetProfile):
     print("\n" + "="*80)
     print("INITIAL DATA EXPLORATION")
     print("="*80)
     
+    total_queries = max(queries_profile.row_count, 1)
+    unique_queries = queries_profile.distinct_count('Queries')
+    
     print("\nQueries Dataset:")
-    print(f"  Total queries: {len(queries_df):,}")
-    print(f"  Null values: {queries_df['Queries'].isnull().sum()}")
-    print(f"  Unique queries: {queries_df['Queries'].nunique():,}")
-    print(f"  Duplicate rate: {(1 - queries_df['Queries'].nunique() / len(queries_df)) * 100:.2f}%")
+    print(f"  Total queries: {queries_profile.row_count:,}")
+    print(f"  Null values: {queries_profile.null_counts.get('Queries', 0)}")
+    print(f"  Unique queries: ~{unique_queries:,}")
+    print(f"  Duplicate rate: ~{max(0.0, 1 - unique_queries / total_queries) * 100:.2f}%")
     
     print("\n  Sample queries:")
-    for i, query in enumerate(queries_df['Queries'].head(5), 1):
-        print(f"   {i}. {query}")
+    for i, row in enumerate(queries_profile.sample_rows, 1):
+        print(f"   {i}. {row.get('Queries')}")
+    
+    total_rows = max(responses_profile.row_count, 1)
     
     print("\nGenAI Responses Dataset:")
-    print(f"  Total rows: {len(responses_df):,}")
+    print(f"  Total rows: {responses_profile.row_count:,}")
     print(f"  Null values per column:")
-    for col in responses_df.columns:
-        null_count = responses_df[col].isnull().sum()
-        print(f"      {col}: {null_count} ({null_count/len(responses_df)*100:.1f}%)")
-    
-    if 'category' in responses_df.columns:
-        print("\n   Category distribution:")
-        cat_counts = responses_df['category'].value_counts()
-        for cat, count in cat_counts.head(10).items():
-            print(f"    {cat}: {count:,} ({count/len(responses_df)*100:.1f}%)")
-    
-    if 'Sub Category' in responses_df.columns:
-        print("\n   Top Sub-Categories:")
-        subcat_counts = responses_df['Sub Category'].value_counts()
-        for subcat, count in subcat_counts.head(10).items():
-            print(f"    {subcat}: {count:,} ({count/len(responses_df)*100:.1f}%)")
-    
-    if 'flags' in responses_df.columns:
-        print("\n   Flags distribution:")
-        flag_counts = responses_df['flags'].value_counts()
-        for flag, count in flag_counts.items():
-            print(f"    {flag}: {count:,} ({count/len(responses_df)*100:.1f}%)")
-    
-    if 'response' in responses_df.columns:
-        responses_df['response_length'] = responses_df['response'].astype(str).str.len()
+    for col, null_count in responses_profile.null_counts.items():
+        print(f"      {col}: {null_count} ({null_count/total_rows*100:.1f}%)")
+    
+    titles = {
+        'category': ("Category distribution", 10),
+        'Sub Category': ("Top Sub-Categories", 10),
+        'flags': ("Flags distribution", None),
+    }
+    for col, (title, limit) in titles.items():
+        sketch = responses_profile.heavy_hitters.get(col)
+        if sketch is None or sketch.count == 0:
+            continue
+        print(f"\n   {title}:")
+        for value, count in sketch.top(limit or sketch.capacity):
+            print(f"    {value}: {count:,} ({count/total_rows*100:.1f}%)")
+    
+    lengths = responses_profile.lengths.get('response')
+    if lengths is not None and lengths.count:
         print("\n   Response length statistics:")
-        print(f"    Mean: {responses_df['response_length'].mean():.0f} characters")
-        print(f"    Median: {responses_df['response_length'].median():.0f} characters")
-        print(f"    Min: {responses_df['response_length'].min():.0f} characters")
-        print(f"    Max: {responses_df['response_length'].max():.0f} characters")
+        print(f"    Mean: {lengths.mean:.0f} characters")
+        print(f"    Median: ~{lengths.quantile(0.5):.0f} characters")
+        print(f"    Min: {lengths.min:.0f} characters")
+        print(f"    Max: {lengths.max:.0f} characters")
+
+def prepare_data(excel_path: str, output_dir: str = "data", chunk_size: int = CHUNK_SIZE,
+                 progress_callback: Optional[Callable[[str, int, Optional[int]], None]] = None):
+    print("="*80)
+    print("SkyRocket Data Preparation - Netomi AI Automation Engineer Submission")
+    print("="*80)
+    
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    print(f"\nLoading Excel file: {excel_path}")
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
+    
+    try:
+        print(f"Sheets found: {workbook.sheetnames}")
+        
+        outputs = {}
+        profiles = {}
+        for step, (sheet_name, output_name) in enumerate(SHEET_OUTPUTS.items(), 1):
+            print(f"\n{step}. Processing {sheet_name} sheet...")
+            if sheet_name not in workbook.sheetnames:
+                raise ValueError(f"Worksheet named '{sheet_name}' not found")
+            
+            profiles[output_name] = DatasetProfile(output_name, **PROFILE_SPECS.get(output_name, {}))
+            info = stream_sheet_to_files(
+                workbook[sheet_name],
+                output_dir,
+                output_name,
+                chunk_size=chunk_size,
+                progress_callback=progress_callback,
+                profile=profiles[output_name]
+            )
+            outputs[sheet_name] = info
+            print(f"   Shape: ({info['rows']}, {len(info['columns'])})")
+            print(f"   Columns: {info['schema']}")
+            print(f"  Saved to: {info['parquet_path']}")
+    finally:
+        workbook.close()
+    
+    profile_dir = os.path.join(output_dir, 'profiles')
+    for profile in profiles.values():
+        profile.save(profile_dir)
+    
+    print_exploration_report(profiles['queries'], profiles['genai_responses'])
+    print(f"\nProfiles saved to: {profile_dir}")
     
     print("\n" + "="*80)
     print("Data preparation complete")
     print("="*80)
     
-    return queries_df, responses_df
+    return outputs
 
 if __name__ == "__main__":
     import sys
@@ -105,4 +277,4 @@ if __name__ == "__main__":
     print(f"Found Excel file: {os.path.abspath(excel_path)}\n")
     
     output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), "data")
-    queries_df, responses_df = prepare_data(excel_path, output_dir=output_dir)
+    prepare_data(excel_path, output_dir=output_dir)
@@ -0,0 +1,296 @@
+import os
+import json
+import base64
+import math
+import glob
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+class HyperLogLog:
+    def __init__(self, precision: int = 14, registers: np.ndarray = None):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = registers if registers is not None else np.zeros(self.m, dtype=np.uint8)
+
+    @staticmethod
+    def _bit_length(values: np.ndarray) -> np.ndarray:
+        hi = (values >> np.uint64(32)).astype(np.float64)
+        lo = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        return np.where(hi > 0, 32 + np.frexp(hi)[1], np.frexp(lo)[1])
+
+    def update(self, values: pd.Series):
+        values = values.dropna()
+        if values.empty:
+            return self
+
+        hashes = pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy(dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remainder = hashes << np.uint64(self.precision)
+        rank = np.minimum(64 - self._bit_length(remainder) + 1, 64 - self.precision + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        if self.precision != other.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        return HyperLogLog(self.precision, np.maximum(self.registers, other.registers))
+
+    def estimate(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m * self.m / float(np.sum(np.power(2.0, -self.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+
+        if raw <= 2.5 * self.m and zeros:
+            return int(round(self.m * math.log(self.m / zeros)))
+        return int(round(raw))
+
+    def to_dict(self) -> Dict:
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HyperLogLog':
+        registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return cls(data['precision'], registers)
+
+class QuantileSketch:
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def update(self, values: pd.Series):
+        values = pd.to_numeric(values, errors='coerce').dropna().to_numpy(dtype=np.float64)
+        values = values[values >= 0]
+        if len(values) == 0:
+            return self
+
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = float(values.min()) if self.min is None else min(self.min, float(values.min()))
+        self.max = float(values.max()) if self.max is None else max(self.max, float(values.max()))
+
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+
+        keys, counts = np.unique(np.ceil(np.log(positive) / self.log_gamma).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.bins[key] = self.bins.get(key, 0) + count
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        if self.relative_accuracy != other.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different accuracy")
+
+        merged = QuantileSketch(self.relative_accuracy)
+        merged.bins = dict(self.bins)
+        for key, count in other.bins.items():
+            merged.bins[key] = merged.bins.get(key, 0) + count
+        merged.zero_count = self.zero_count + other.zero_count
+        merged.count = self.count + other.count
+        merged.total = self.total + other.total
+        mins = [v for v in (self.min, other.min) if v is not None]
+        maxs = [v for v in (self.max, other.max) if v is not None]
+        merged.min = min(mins) if mins else None
+        merged.max = max(maxs) if maxs else None
+        return merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def to_dict(self) -> Dict:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'bins': {str(k): v for k, v in self.bins.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QuantileSketch':
+        sketch = cls(data['relative_accuracy'])
+        sketch.bins = {int(k): v for k, v in data['bins'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.total = data['total']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        return sketch
+
+class HeavyHitters:
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.counters: Dict[str, int] = {}
+        self.count = 0
+
+    def _trim(self):
+        if len(self.counters) <= self.capacity:
+            return
+        threshold = sorted(self.counters.values(), reverse=True)[self.capacity]
+        self.counters = {k: v - threshold for k, v in self.counters.items() if v > threshold}
+
+    def update(self, values: pd.Series):
+        counts = values.dropna().astype(str).value_counts()
+        self.count += int(counts.sum())
+        for value, count in counts.items():
+            self.counters[value] = self.counters.get(value, 0) + int(count)
+        self._trim()
+        return self
+
+    def merge(self, other: 'HeavyHitters') -> 'HeavyHitters':
+        merged = HeavyHitters(max(self.capacity, other.capacity))
+        merged.counters = dict(self.counters)
+        for value, count in other.counters.items():
+            merged.counters[value] = merged.counters.get(value, 0) + count
+        merged.count = self.count + other.count
+        merged._trim()
+        return merged
+
+    def top(self, n: int = 10) -> List[tuple]:
+        return sorted(self.counters.items(), key=lambda x: x[1], reverse=True)[:n]
+
+    def to_dict(self) -> Dict:
+        return {'capacity': self.capacity, 'counters': self.counters, 'count': self.count}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HeavyHitters':
+        sketch = cls(data['capacity'])
+        sketch.counters = dict(data['counters'])
+        sketch.count = data['count']
+        return sketch
+
+class DatasetProfile:
+    def __init__(self, name: str, distinct_columns: Iterable[str] = (),
+                 heavy_hitter_columns: Iterable[str] = (), length_columns: Iterable[str] = ()):
+        self.name = name
+        self.row_count = 0
+        self.null_counts: Dict[str, int] = {}
+        self.distinct = {col: HyperLogLog() for col in distinct_columns}
+        self.heavy_hitters = {col: HeavyHitters() for col in heavy_hitter_columns}
+        self.lengths = {col: QuantileSketch() for col in length_columns}
+        self.sample_rows: List[Dict] = []
+
+    def update(self, chunk: pd.DataFrame):
+        self.row_count += len(chunk)
+
+        for col, nulls in chunk.isnull().sum().items():
+            self.null_counts[col] = self.null_counts.get(col, 0) + int(nulls)
+
+        for col, sketch in self.distinct.items():
+            if col in chunk.columns:
+                sketch.update(chunk[col])
+
+        for col, sketch in self.heavy_hitters.items():
+            if col in chunk.columns:
+                sketch.update(chunk[col])
+
+        for col, sketch in self.lengths.items():
+            if col in chunk.columns:
+                sketch.update(chunk[col].astype(str).str.len())
+
+        if len(self.sample_rows) < 5:
+            self.sample_rows.extend(chunk.head(5 - len(self.sample_rows)).to_dict('records'))
+
+        return self
+
+    def merge(self, other: 'DatasetProfile') -> 'DatasetProfile':
+        merged = DatasetProfile(self.name)
+        merged.row_count = self.row_count + other.row_count
+
+        for col in set(self.null_counts) | set(other.null_counts):
+            merged.null_counts[col] = self.null_counts.get(col, 0) + other.null_counts.get(col, 0)
+
+        for attr in ('distinct', 'heavy_hitters', 'lengths'):
+            ours, theirs = getattr(self, attr), getattr(other, attr)
+            combined = getattr(merged, attr)
+            for col in set(ours) | set(theirs):
+                if col in ours and col in theirs:
+                    combined[col] = ours[col].merge(theirs[col])
+                else:
+                    combined[col] = ours.get(col) or theirs.get(col)
+
+        merged.sample_rows = (self.sample_rows + other.sample_rows)[:5]
+        return merged
+
+    def distinct_count(self, col: str) -> int:
+        return self.distinct[col].estimate()
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'row_count': self.row_count,
+            'null_counts': self.null_counts,
+            'distinct': {col: s.to_dict() for col, s in self.distinct.items()},
+            'heavy_hitters': {col: s.to_dict() for col, s in self.heavy_hitters.items()},
+            'lengths': {col: s.to_dict() for col, s in self.lengths.items()},
+            'sample_rows': self.sample_rows
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DatasetProfile':
+        profile = cls(data['name'])
+        profile.row_count = data['row_count']
+        profile.null_counts = data['null_counts']
+        profile.distinct = {col: HyperLogLog.from_dict(s) for col, s in data['distinct'].items()}
+        profile.heavy_hitters = {col: HeavyHitters.from_dict(s) for col, s in data['heavy_hitters'].items()}
+        profile.lengths = {col: QuantileSketch.from_dict(s) for col, s in data['lengths'].items()}
+        profile.sample_rows = data.get('sample_rows', [])
+        return profile
+
+    def save(self, profile_dir: str, timestamp: datetime = None) -> str:
+        os.makedirs(profile_dir, exist_ok=True)
+        timestamp = timestamp or datetime.now()
+        path = os.path.join(profile_dir, f"{self.name}_{timestamp.strftime('%Y%m%d_%H%M%S')}.json")
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, default=str)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> 'DatasetProfile':
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+def combine_profiles(profile_dir: str, name: str, start: datetime, end: datetime) -> Optional[DatasetProfile]:
+    combined = None
+    for path in sorted(glob.glob(os.path.join(profile_dir, f"{name}_*.json"))):
+        day = os.path.basename(path)[len(name) + 1:len(name) + 9]
+        try:
+            day_date = datetime.strptime(day, '%Y%m%d')
+        except ValueError:
+            continue
+        if start.date() <= day_date.date() <= end.date():
+            profile = DatasetProfile.load(path)
+            combined = profile if combined is None else combined.merge(profile)
+    return combined
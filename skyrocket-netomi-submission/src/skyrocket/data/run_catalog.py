@@ -0,0 +1,245 @@
+import os
+import re
+import json
+import sqlite3
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional
+
+METRIC_COLUMNS = ['total_queries', 'containment_rate', 'hallucination_rate', 'escalation_rate', 'avg_quality', 'n_topics']
+FILE_TIMESTAMP = re.compile(r'_(\d{8}_\d{6})\.')
+
+def _percent(fraction) -> Optional[float]:
+    return fraction * 100 if fraction is not None else None
+
+def _file_timestamp(path: str) -> float:
+    match = FILE_TIMESTAMP.search(os.path.basename(path))
+    if match:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timestamp()
+    return os.path.getmtime(path)
+
+def to_timestamp(value) -> Optional[float]:
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+def metrics_from_results(results: Dict) -> Dict:
+    evaluation = results.get('evaluation') or {}
+    topics = results.get('topics') or {}
+    return {
+        'total_queries': (results.get('data_summary') or {}).get('total_queries'),
+        'containment_rate': evaluation.get('containment_rate'),
+        'hallucination_rate': evaluation.get('hallucination_rate'),
+        'escalation_rate': evaluation.get('escalation_rate'),
+        'avg_quality': evaluation.get('avg_overall_quality'),
+        'n_topics': topics.get('n_topics'),
+    }
+
+def topic_counts_from_results(results: Dict) -> Dict[str, int]:
+    return {t['topic_name']: t['count'] for t in (results.get('topics') or {}).get('topics') or []}
+
+def metrics_from_pipeline(metrics: Dict) -> Dict:
+    return {
+        'total_queries': metrics.get('total_queries'),
+        'containment_rate': _percent(metrics.get('containment_rate')),
+        'hallucination_rate': _percent(metrics.get('hallucination_rate')),
+        'escalation_rate': _percent(1 - metrics['containment_rate']) if metrics.get('containment_rate') is not None else None,
+        'avg_quality': metrics.get('avg_quality_score'),
+        'n_topics': len(metrics.get('top_topics') or {}),
+    }
+
+class RunCatalog:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    started_at REAL,
+                    finished_at REAL NOT NULL,
+                    total_queries INTEGER,
+                    containment_rate REAL,
+                    hallucination_rate REAL,
+                    escalation_rate REAL,
+                    avg_quality REAL,
+                    n_topics INTEGER,
+                    artifacts TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS run_topics (
+                    run_id TEXT NOT NULL,
+                    topic_name TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    finished_at REAL NOT NULL,
+                    PRIMARY KEY (run_id, topic_name)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_finished ON runs (finished_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_source_finished ON runs (source, finished_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_run_topics_finished ON run_topics (finished_at, topic_name)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record_run(self, run_id: str, source: str, finished_at: float, metrics: Dict,
+                   topic_counts: Dict[str, int] = None, artifacts: Dict[str, str] = None,
+                   started_at: float = None, status: str = 'completed'):
+        values = {name: metrics.get(name) for name in METRIC_COLUMNS}
+
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO runs (run_id, source, status, started_at, finished_at, "
+                f"{', '.join(METRIC_COLUMNS)}, artifacts) VALUES ({', '.join('?' * (len(METRIC_COLUMNS) + 6))})",
+                [run_id, source, status, started_at, finished_at, *values.values(), json.dumps(artifacts or {})]
+            )
+            conn.execute("DELETE FROM run_topics WHERE run_id = ?", (run_id,))
+            conn.executemany(
+                "INSERT INTO run_topics (run_id, topic_name, count, finished_at) VALUES (?, ?, ?, ?)",
+                [(run_id, name, int(count), finished_at) for name, count in (topic_counts or {}).items()]
+            )
+
+    @staticmethod
+    def _range_clause(start: float, end: float, source: str, prefix: str = '') -> tuple:
+        clauses, params = [], []
+        if start is not None:
+            clauses.append(f"{prefix}finished_at >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append(f"{prefix}finished_at <= ?")
+            params.append(end)
+        if source:
+            clauses.append(f"{prefix}source = ?")
+            params.append(source)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def runs(self, start: float = None, end: float = None, source: str = None, limit: int = 500) -> List[Dict]:
+        where, params = self._range_clause(start, end, source)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM runs{where} ORDER BY finished_at LIMIT ?", [*params, limit]
+            ).fetchall()
+        runs = []
+        for row in rows:
+            run = dict(row)
+            run['artifacts'] = json.loads(run['artifacts'] or '{}')
+            runs.append(run)
+        return runs
+
+    def topic_volumes(self, start: float = None, end: float = None, source: str = None,
+                      top_n: int = 10) -> Dict[str, List[Dict]]:
+        where, params = self._range_clause(start, end, None, prefix='t.')
+        join = ""
+        if source:
+            join = " JOIN runs r ON r.run_id = t.run_id"
+            where += (" AND " if where else " WHERE ") + "r.source = ?"
+            params.append(source)
+
+        with self._connect() as conn:
+            top = [row[0] for row in conn.execute(
+                f"SELECT t.topic_name FROM run_topics t{join}{where} "
+                f"GROUP BY t.topic_name ORDER BY SUM(t.count) DESC LIMIT ?",
+                [*params, top_n]
+            ).fetchall()]
+            if not top:
+                return {}
+            topic_filter = (" AND " if where else " WHERE ") + f"t.topic_name IN ({', '.join('?' * len(top))})"
+            rows = conn.execute(
+                f"SELECT t.topic_name, t.run_id, t.finished_at, t.count FROM run_topics t{join}{where}{topic_filter} "
+                f"ORDER BY t.finished_at",
+                [*params, *top]
+            ).fetchall()
+
+        volumes = {name: [] for name in top}
+        for row in rows:
+            volumes[row['topic_name']].append({'run_id': row['run_id'], 'finished_at': row['finished_at'], 'count': row['count']})
+        return volumes
+
+    def has_run(self, run_id: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone() is not None
+
+def backfill(catalog: RunCatalog, data_dirs: List[str] = None, jobs_dir: str = None) -> int:
+    indexed = 0
+
+    for data_dir in data_dirs or []:
+        if not os.path.isdir(data_dir):
+            continue
+        for name in sorted(os.listdir(data_dir)):
+            path = os.path.join(data_dir, name)
+            if name.startswith('metrics_') and name.endswith('.json'):
+                run_id = f"pipeline:{name[len('metrics_'):-len('.json')]}"
+                if catalog.has_run(run_id):
+                    continue
+                with open(path, 'r') as f:
+                    metrics = json.load(f)
+                stamp = name[len('metrics_'):-len('.json')]
+                artifacts = {'metrics': path}
+                for kind, pattern in [('processed', f"processed_{stamp}.parquet"), ('perf', f"perf_{stamp}.json")]:
+                    if os.path.exists(os.path.join(data_dir, pattern)):
+                        artifacts[kind] = os.path.join(data_dir, pattern)
+                catalog.record_run(run_id, 'pipeline', _file_timestamp(path), metrics_from_pipeline(metrics),
+                                   metrics.get('top_topics'), artifacts)
+                indexed += 1
+            elif name.startswith('llm_judge_results_') and name.endswith('.json'):
+                run_id = f"llm_judge:{name[len('llm_judge_results_'):-len('.json')]}"
+                if catalog.has_run(run_id):
+                    continue
+                with open(path, 'r') as f:
+                    evaluation = json.load(f)
+                catalog.record_run(run_id, 'llm_judge', _file_timestamp(path),
+                                   metrics_from_results({'evaluation': evaluation}), artifacts={'judge': path})
+                indexed += 1
+            elif name.startswith('entity_extraction_results_') and name.endswith('.json'):
+                run_id = f"entity_extractor:{name[len('entity_extraction_results_'):-len('.json')]}"
+                if catalog.has_run(run_id):
+                    continue
+                with open(path, 'r') as f:
+                    entities = json.load(f)
+                catalog.record_run(run_id, 'entity_extractor', _file_timestamp(path),
+                                   {'total_queries': entities.get('total_texts')}, artifacts={'entities': path})
+                indexed += 1
+
+    if jobs_dir and os.path.isdir(jobs_dir):
+        for job_id in sorted(os.listdir(jobs_dir)):
+            path = os.path.join(jobs_dir, job_id, 'results.json')
+            if not os.path.exists(path) or catalog.has_run(job_id):
+                continue
+            with open(path, 'r') as f:
+                results = json.load(f)
+            catalog.record_run(job_id, 'webapp', os.path.getmtime(path), metrics_from_results(results),
+                               topic_counts_from_results(results), {'results': path})
+            indexed += 1
+
+    return indexed
+
+def main():
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+    parser = argparse.ArgumentParser(description="Index existing run outputs into the run catalog")
+    parser.add_argument('--db', default=os.path.join(base_dir, 'data', 'processed', 'run_catalog.db'))
+    parser.add_argument('--data-dir', action='append', default=None,
+                        help="Directory with metrics_*/llm_judge_results_*/entity_extraction_results_* files")
+    parser.add_argument('--jobs-dir', default=os.path.join(base_dir, 'webapp', 'backend', 'results', 'jobs'))
+    args = parser.parse_args()
+
+    data_dirs = args.data_dir or [os.path.join(base_dir, 'data'), os.path.join(base_dir, 'data', 'processed')]
+    catalog = RunCatalog(args.db)
+    indexed = backfill(catalog, data_dirs, args.jobs_dir)
+    print(f"Indexed {indexed} run(s) into {args.db}")
+
+if __name__ == "__main__":
+    main()
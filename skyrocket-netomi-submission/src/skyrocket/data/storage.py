@@ -0,0 +1,79 @@
+import os
+from typing import Iterator, List, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ENTITIES_TYPE = pa.map_(pa.string(), pa.list_(pa.string()))
+
+NESTED_COLUMN_TYPES = {
+    'entities': ENTITIES_TYPE,
+}
+
+def table_path(data_dir: str, name: str) -> str:
+    return os.path.join(data_dir, f"{name}.parquet")
+
+def resolve_table(data_dir: str, name: str) -> Optional[str]:
+    for extension in ('parquet', 'csv'):
+        path = os.path.join(data_dir, f"{name}.{extension}")
+        if os.path.exists(path):
+            return path
+    return None
+
+def table_exists(data_dir: str, name: str) -> bool:
+    return resolve_table(data_dir, name) is not None
+
+def read_schema(path: str) -> List[str]:
+    if path.endswith('.parquet'):
+        return pq.read_schema(path).names
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+def read_columns(data_dir: str, name: str) -> List[str]:
+    path = resolve_table(data_dir, name)
+    if path is None:
+        raise FileNotFoundError(f"No {name}.parquet or {name}.csv in {data_dir}")
+    return read_schema(path)
+
+def read_file(path: str, columns: List[str] = None) -> pd.DataFrame:
+    if path.endswith('.parquet'):
+        table = pq.read_table(path, columns=columns, memory_map=True)
+        return table.to_pandas(maps_as_pydicts='strict')
+    return pd.read_csv(path, usecols=columns)
+
+def iter_file_chunks(path: str, columns: List[str] = None, chunk_size: int = 50_000) -> Iterator[pd.DataFrame]:
+    if path.endswith('.parquet'):
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas(maps_as_pydicts='strict')
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+
+def read_table(data_dir: str, name: str, columns: List[str] = None) -> pd.DataFrame:
+    path = resolve_table(data_dir, name)
+    if path is None:
+        raise FileNotFoundError(f"No {name}.parquet or {name}.csv in {data_dir}")
+    return read_file(path, columns=columns)
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    nested = [col for col in df.columns if col in NESTED_COLUMN_TYPES]
+    table = pa.Table.from_pandas(df.drop(columns=nested), preserve_index=False)
+
+    for col in nested:
+        values = [value if isinstance(value, dict) else None for value in df[col]]
+        table = table.append_column(
+            pa.field(col, NESTED_COLUMN_TYPES[col]),
+            pa.array(values, type=NESTED_COLUMN_TYPES[col])
+        )
+
+    return table.select([str(col) for col in df.columns])
+
+def write_file(df: pd.DataFrame, path: str) -> str:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    pq.write_table(to_arrow(df), path)
+    return path
+
+def write_table(df: pd.DataFrame, data_dir: str, name: str) -> str:
+    return write_file(df, table_path(data_dir, name))
+
+def find_column(columns: List[str], keyword: str) -> Optional[str]:
+    return next((col for col in columns if keyword in col.lower()), None)
@@ -1,20 +1,136 @@
 import os
 import json
-from typing import List, Dict
-from groq import Groq
-from dotenv import load_dotenv
+import math
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Callable, List, Dict, Optional, Tuple
+import numpy as np
+from skyrocket.core.registry import get_llm_client, get_embedding_model
+from skyrocket.llm.backends import model_for
+from skyrocket.utils.lazy import load_env
+from skyrocket.utils.perf import timed_completion
 import pandas as pd
 
-load_dotenv()
+load_env()
+
+SYNTHETIC_CHUNK_SIZE = int(os.getenv("SKYROCKET_SYNTHETIC_CHUNK_SIZE", "20"))
+SYNTHETIC_WORKERS = int(os.getenv("SKYROCKET_SYNTHETIC_WORKERS", "4"))
+NOVELTY_THRESHOLD = float(os.getenv("SKYROCKET_NOVELTY_THRESHOLD", "0.9"))
+SYNTHETIC_MAX_CALLS = int(os.getenv("SKYROCKET_SYNTHETIC_MAX_CALLS", "0")) or None
+SYNTHETIC_MAX_TOKENS = int(os.getenv("SKYROCKET_SYNTHETIC_MAX_TOKENS", "0")) or None
+MAX_ROUNDS_FACTOR = 3
+HASH_DIM = 2048
+AVOID_EXAMPLES = 10
+
+def hashed_ngram_embeddings(texts: List[str], n: int = 3, dim: int = HASH_DIM) -> np.ndarray:
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        padded = f" {text.lower().strip()} "
+        buckets = [zlib.crc32(padded[i:i + n].encode('utf-8')) % dim for i in range(max(len(padded) - n + 1, 1))]
+        np.add.at(matrix[row], buckets, 1.0)
+    return matrix
+
+def build_encoder(use_embeddings: bool = True) -> Callable[[List[str]], np.ndarray]:
+    if use_embeddings:
+        try:
+            model = get_embedding_model()
+            lock = threading.Lock()
+            
+            def encode(texts: List[str]) -> np.ndarray:
+                with lock:
+                    return np.asarray(model.encode(texts, show_progress_bar=False), dtype=np.float32)
+            return encode
+        except Exception as e:
+            print(f"Embedding model unavailable ({e}), using character n-gram vectors for novelty filtering")
+    return hashed_ngram_embeddings
+
+class NoveltyFilter:
+    def __init__(self, encode: Callable[[List[str]], np.ndarray], threshold: float = NOVELTY_THRESHOLD,
+                 reference: List[str] = None):
+        self.encode = encode
+        self.threshold = threshold
+        self.matrix = None
+        if reference:
+            self._add(self._normalize(self.encode(reference)))
+    
+    @staticmethod
+    def _normalize(embeddings: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.where(norms == 0, 1.0, norms)
+    
+    def _add(self, embeddings: np.ndarray):
+        self.matrix = embeddings if self.matrix is None else np.vstack([self.matrix, embeddings])
+    
+    def filter(self, candidates: List[str]) -> List[str]:
+        candidates = list(dict.fromkeys(c.strip() for c in candidates if isinstance(c, str) and c.strip()))
+        if not candidates:
+            return []
+        
+        embeddings = self._normalize(self.encode(candidates))
+        novel = np.ones(len(candidates), dtype=bool)
+        if self.matrix is not None:
+            novel = (embeddings @ self.matrix.T).max(axis=1) < self.threshold
+        
+        within = embeddings @ embeddings.T
+        np.fill_diagonal(within, 0.0)
+        keep = np.zeros(len(candidates), dtype=bool)
+        for i in np.flatnonzero(novel):
+            keep[i] = not (within[i, keep] >= self.threshold).any()
+        
+        self._add(embeddings[keep])
+        return [c for c, k in zip(candidates, keep) if k]
+
+@dataclass
+class TopicGenerationStats:
+    requested: int = 0
+    accepted: int = 0
+    generated: int = 0
+    rejected_duplicates: int = 0
+    calls: int = 0
+    failed_calls: int = 0
+
+class GenerationBudget:
+    def __init__(self, max_calls: int = None, max_tokens: int = None):
+        self.max_calls = max_calls
+        self.max_tokens = max_tokens
+        self.calls = 0
+        self.tokens = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> bool:
+        with self._lock:
+            if self.exhausted:
+                return False
+            self.calls += 1
+            return True
+    
+    def spend_tokens(self, tokens: int):
+        with self._lock:
+            self.tokens += tokens
+    
+    @property
+    def exhausted(self) -> bool:
+        return ((self.max_calls is not None and self.calls >= self.max_calls) or
+                (self.max_tokens is not None and self.tokens >= self.max_tokens))
 
 class SyntheticDataGenerator:
-    def __init__(self, groq_api_key: str = None):
-        self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
-        self.groq_client = Groq(api_key=self.groq_api_key)
+    def __init__(self, api_key: str = None, use_embeddings: bool = True):
+        self.llm_client = get_llm_client(api_key)
+        self.use_embeddings = use_embeddings
     
     def generate_queries(self, topic_name: str, topic_description: str,
-                        example_queries: List[str], n_queries: int = 50) -> List[str]:
+                        example_queries: List[str], n_queries: int = 50,
+                        avoid_queries: List[str] = None) -> List[str]:
+        return self._request_queries(topic_name, topic_description, example_queries, n_queries, avoid_queries)[0]
+    
+    def _request_queries(self, topic_name: str, topic_description: str, example_queries: List[str],
+                         n_queries: int, avoid_queries: List[str] = None) -> Tuple[List[str], int]:
         examples_text = "\n".join([f"- {q}" for q in example_queries[:5]])
+        avoid_text = ""
+        if avoid_queries:
+            avoid_text = "\n**Already Generated (do not repeat or paraphrase)**:\n" + "\n".join(f"- {q}" for q in avoid_queries)
         
         prompt = f"""Generate {n_queries} realistic customer service queries for the following topic:
 
@@ -23,6 +139,7 @@ class SyntheticDataGenerator:
 
 **Example Queries**:
 {examples_text}
+{avoid_text}
 
 **Requirements**:
 1. Queries should be natural and realistic (how real customers would ask)
@@ -38,8 +155,10 @@ Return ONLY a JSON array of query strings:
 Generate exactly {n_queries} queries."""
         
         try:
-            completion = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
+            completion = timed_completion(
+                self.llm_client,
+                module="synthetic",
+                model=model_for('synthetic'),
                 messages=[
                     {
                         "role": "system",
@@ -48,9 +167,11 @@ Generate exactly {n_queries} queries."""
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.8,
-                max_tokens=2000
+                max_tokens=min(2000, 60 * n_queries + 200)
             )
             
+            usage = getattr(completion, 'usage', None)
+            tokens = getattr(usage, 'total_tokens', 0) or 0
             response_text = completion.choices[0].message.content.strip()
             
             if "```json" in response_text:
@@ -59,18 +180,54 @@ Generate exactly {n_queries} queries."""
                 response_text = response_text.split("```")[1].split("```")[0].strip()
             
             generated_queries = json.loads(response_text)
+            if not isinstance(generated_queries, list):
+                raise ValueError("expected a JSON array of queries")
             
             print(f"Generated {len(generated_queries)} queries for '{topic_name}'")
             
-            return generated_queries
+            return generated_queries, tokens
             
         except Exception as e:
             print(f"Error generating queries for '{topic_name}': {e}")
-            return []
+            return [], 0
+    
+    def _generate_novel(self, topic: Dict, n_queries: int, chunk_size: int, novelty: NoveltyFilter,
+                        budget: GenerationBudget) -> Tuple[List[str], TopicGenerationStats]:
+        stats = TopicGenerationStats(requested=n_queries)
+        accepted = []
+        max_rounds = MAX_ROUNDS_FACTOR * math.ceil(n_queries / chunk_size)
+        
+        while len(accepted) < n_queries and stats.calls < max_rounds and budget.acquire():
+            stats.calls += 1
+            candidates, tokens = self._request_queries(
+                topic_name=topic['topic_name'],
+                topic_description=topic['description'],
+                example_queries=topic['representative_queries'],
+                n_queries=min(chunk_size, n_queries - len(accepted)),
+                avoid_queries=accepted[-AVOID_EXAMPLES:]
+            )
+            budget.spend_tokens(tokens)
+            if not candidates:
+                stats.failed_calls += 1
+                continue
+            
+            novel = novelty.filter(candidates)[:n_queries - len(accepted)]
+            stats.generated += len(candidates)
+            stats.rejected_duplicates += len(candidates) - len(novel)
+            accepted.extend(novel)
+        
+        stats.accepted = len(accepted)
+        return accepted, stats
     
     def augment_low_volume_topics(self, topics_config: Dict, 
                                   threshold_percentile: float = 0.3,
-                                  queries_per_topic: int = 50) -> Dict:
+                                  queries_per_topic: int = 50,
+                                  chunk_size: int = SYNTHETIC_CHUNK_SIZE,
+                                  max_workers: int = SYNTHETIC_WORKERS,
+                                  max_calls: Optional[int] = SYNTHETIC_MAX_CALLS,
+                                  max_tokens: Optional[int] = SYNTHETIC_MAX_TOKENS,
+                                  novelty_threshold: float = NOVELTY_THRESHOLD,
+                                  existing_queries: Dict[str, List[str]] = None) -> Dict:
         topics = topics_config['topics']
         
         sorted_topics = sorted(topics, key=lambda x: x['count'])
@@ -86,24 +243,44 @@ Generate exactly {n_queries} queries."""
         for topic in low_volume_topics:
             print(f"  - {topic['topic_name']}: {topic['count']} queries ({topic['percentage']:.1f}%)")
         
-        print(f"\nGenerating {queries_per_topic} synthetic queries per topic using Groq...")
+        print(f"\nGenerating {queries_per_topic} novel synthetic queries per topic using Groq "
+              f"({len(low_volume_topics)} topics in parallel, chunks of {chunk_size})...")
+        
+        encode = build_encoder(self.use_embeddings)
+        budget = GenerationBudget(max_calls=max_calls, max_tokens=max_tokens)
+        filters = {
+            topic['topic_name']: NoveltyFilter(
+                encode, novelty_threshold,
+                reference=(existing_queries or {}).get(topic['topic_name']) or topic['representative_queries']
+            )
+            for topic in low_volume_topics
+        }
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='synthetic') as executor:
+            futures = {
+                topic['topic_name']: executor.submit(
+                    self._generate_novel, topic, queries_per_topic, chunk_size, filters[topic['topic_name']], budget
+                )
+                for topic in low_volume_topics
+            }
+            generated = {name: future.result() for name, future in futures.items()}
         
         augmented_data = {
             'low_volume_topics': [],
             'synthetic_queries': {},
-            'total_generated': 0
+            'total_generated': 0,
+            'stats': {},
+            'budget': {'calls': budget.calls, 'tokens': budget.tokens, 'exhausted': budget.exhausted}
         }
         
         for topic in low_volume_topics:
             topic_name = topic['topic_name']
-            print(f"\nGenerating for '{topic_name}'...")
+            synthetic_queries, stats = generated[topic_name]
+            augmented_data['stats'][topic_name] = asdict(stats)
             
-            synthetic_queries = self.generate_queries(
-                topic_name=topic_name,
-                topic_description=topic['description'],
-                example_queries=topic['representative_queries'],
-                n_queries=queries_per_topic
-            )
+            print(f"\n'{topic_name}': {stats.accepted}/{stats.requested} novel queries "
+                  f"from {stats.generated} generated in {stats.calls} calls "
+                  f"({stats.rejected_duplicates} near-duplicates dropped)")
             
             if synthetic_queries:
                 augmented_data['low_volume_topics'].append(topic_name)
@@ -115,7 +292,9 @@ Generate exactly {n_queries} queries."""
                     print(f"    {i}. {query}")
         
         print(f"\n{'='*80}")
-        print(f"Generated {augmented_data['total_generated']} synthetic queries total")
+        print(f"Generated {augmented_data['total_generated']} novel synthetic queries total "
+              f"({budget.calls} LLM calls, {budget.tokens:,} tokens"
+              f"{', budget exhausted' if budget.exhausted else ''})")
         print("="*80)
         
         return augmented_data
@@ -0,0 +1,239 @@
+import os
+import time
+import logging
+import random
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from skyrocket.utils.lazy import lazy_import, load_env
+from skyrocket.llm.rate_limiter import RATE_LIMIT_RETRIES, DEFAULT_RETRY_AFTER, estimate_tokens, get_rate_limiter
+
+load_env()
+
+logger = logging.getLogger(__name__)
+
+groq = lazy_import('groq')
+httpx = lazy_import('httpx')
+
+LLM_BACKEND = os.getenv("SKYROCKET_LLM_BACKEND", "groq")
+LLM_BASE_URL = os.getenv("SKYROCKET_LLM_BASE_URL")
+LLM_API_KEY = os.getenv("SKYROCKET_LLM_API_KEY")
+LLM_TIMEOUT = float(os.getenv("SKYROCKET_LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("SKYROCKET_LLM_MAX_RETRIES", "2"))
+DEFAULT_MODEL = os.getenv("SKYROCKET_LLM_MODEL", "llama-3.1-8b-instant")
+
+_provider_latency: contextvars.ContextVar = contextvars.ContextVar('skyrocket_provider_latency', default=None)
+
+@contextmanager
+def track_provider_latency():
+    samples = []
+    token = _provider_latency.set(samples)
+    try:
+        yield samples
+    finally:
+        _provider_latency.reset(token)
+
+def model_for(call_type: str) -> str:
+    return os.getenv(f"SKYROCKET_LLM_MODEL_{call_type.upper()}", DEFAULT_MODEL)
+
+class LLMError(Exception):
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class RateLimitError(LLMError):
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+def _retry_after(headers) -> Optional[float]:
+    try:
+        return float(headers.get('retry-after')) if headers is not None and headers.get('retry-after') else None
+    except (TypeError, ValueError):
+        return None
+
+@dataclass
+class Message:
+    content: str
+    role: str = 'assistant'
+
+@dataclass
+class Choice:
+    message: Message
+    index: int = 0
+    finish_reason: Optional[str] = None
+
+@dataclass
+class Usage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+@dataclass
+class Completion:
+    choices: List[Choice]
+    model: str = ''
+    id: str = ''
+    usage: Usage = field(default_factory=Usage)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Completion':
+        return cls(
+            id=data.get('id', ''),
+            model=data.get('model', ''),
+            choices=[
+                Choice(
+                    message=Message(content=(c.get('message') or {}).get('content') or '',
+                                    role=(c.get('message') or {}).get('role', 'assistant')),
+                    index=c.get('index', i),
+                    finish_reason=c.get('finish_reason')
+                )
+                for i, c in enumerate(data.get('choices') or [])
+            ],
+            usage=Usage(**{k: v for k, v in (data.get('usage') or {}).items() if k in Usage.__dataclass_fields__})
+        )
+
+class _Completions:
+    def __init__(self, backend: 'LLMBackend'):
+        self._backend = backend
+
+    def create(self, **kwargs):
+        return self._backend.complete(**kwargs)
+
+class _Chat:
+    def __init__(self, backend: 'LLMBackend'):
+        self.completions = _Completions(backend)
+
+class LLMBackend:
+    name = 'base'
+
+    def __init__(self, max_retries: int = LLM_MAX_RETRIES):
+        self.chat = _Chat(self)
+        self.max_retries = max_retries
+
+    def _complete_once(self, **kwargs) -> Completion:
+        raise NotImplementedError
+
+    def _complete_with_retries(self, **kwargs):
+        samples = _provider_latency.get()
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                return self._complete_once(**kwargs)
+            except RateLimitError:
+                raise
+            except LLMError as e:
+                if e.status_code is not None and e.status_code < 500:
+                    raise
+                error = e
+            finally:
+                if samples is not None:
+                    samples.append(time.perf_counter() - started)
+            if attempt < self.max_retries:
+                time.sleep(min(0.5 * 2 ** attempt, 8.0) * (1 + random.random() / 4))
+        raise error
+
+    def complete(self, **kwargs):
+        limiter = get_rate_limiter()
+        key = f"{self.name}:{kwargs.get('model', '')}"
+        cost = estimate_tokens(kwargs.get('messages'), kwargs.get('max_tokens'))
+
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            lease_id = limiter.acquire(key, cost) if limiter else None
+            started = time.perf_counter()
+            try:
+                completion = self._complete_with_retries(**kwargs)
+            except RateLimitError as e:
+                if limiter:
+                    limiter.release(key, lease_id, cost, rate_limited=True, retry_after=e.retry_after)
+                if attempt == RATE_LIMIT_RETRIES:
+                    raise
+                logger.warning("Rate limited on %s, retrying (%d/%d)", key, attempt + 1, RATE_LIMIT_RETRIES)
+                if not limiter:
+                    time.sleep(e.retry_after or DEFAULT_RETRY_AFTER)
+                continue
+            except Exception:
+                if limiter:
+                    limiter.release(key, lease_id, cost)
+                raise
+
+            if limiter:
+                usage = getattr(completion, 'usage', None)
+                limiter.release(key, lease_id, cost, used_tokens=getattr(usage, 'total_tokens', None) or None,
+                                latency=time.perf_counter() - started)
+            return completion
+
+class GroqBackend(LLMBackend):
+    name = 'groq'
+
+    def __init__(self, api_key: str = None, base_url: str = None, timeout: float = LLM_TIMEOUT,
+                 max_retries: int = LLM_MAX_RETRIES):
+        super().__init__(max_retries=max_retries)
+        api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY not found. Please set it in .env or pass it as an argument.")
+        self.client = groq.Groq(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+
+    def _complete_once(self, **kwargs):
+        try:
+            return self.client.chat.completions.create(**kwargs)
+        except groq.RateLimitError as e:
+            raise RateLimitError(str(e), retry_after=_retry_after(getattr(e.response, 'headers', None))) from e
+        except groq.APIStatusError as e:
+            raise LLMError(str(e), status_code=e.status_code) from e
+        except groq.APIError as e:
+            raise LLMError(str(e)) from e
+
+class OpenAICompatibleBackend(LLMBackend):
+    name = 'openai'
+
+    def __init__(self, base_url: str, api_key: str = None, timeout: float = LLM_TIMEOUT,
+                 max_retries: int = LLM_MAX_RETRIES):
+        super().__init__(max_retries=max_retries)
+        if not base_url:
+            raise ValueError("SKYROCKET_LLM_BASE_URL is required for the OpenAI-compatible backend")
+        self.base_url = base_url.rstrip('/')
+        headers = {'Authorization': f"Bearer {api_key}"} if api_key else {}
+        self.client = httpx.Client(base_url=self.base_url, headers=headers, timeout=timeout)
+
+    def _complete_once(self, **kwargs) -> Completion:
+        try:
+            response = self.client.post('/chat/completions', json=kwargs)
+        except httpx.HTTPError as e:
+            raise LLMError(f"Request to {self.base_url} failed: {e}") from e
+        if response.status_code == 200:
+            return Completion.from_dict(response.json())
+        message = f"{response.status_code} from {self.base_url}: {response.text[:200]}"
+        if response.status_code == 429:
+            raise RateLimitError(message, retry_after=_retry_after(response.headers))
+        raise LLMError(message, status_code=response.status_code)
+
+_stand_in_lock = threading.Lock()
+_stand_in_server = None
+
+def stand_in_url() -> str:
+    global _stand_in_server
+    from skyrocket.llm.stand_in import start_server
+
+    with _stand_in_lock:
+        if _stand_in_server is None:
+            _stand_in_server = start_server(
+                latency_ms=float(os.getenv("SKYROCKET_STAND_IN_LATENCY_MS", "0")),
+                jitter_ms=float(os.getenv("SKYROCKET_STAND_IN_JITTER_MS", "0")),
+                error_rate=float(os.getenv("SKYROCKET_STAND_IN_ERROR_RATE", "0")),
+                rate_limit_rate=float(os.getenv("SKYROCKET_STAND_IN_RATE_LIMIT_RATE", "0")),
+                malformed_rate=float(os.getenv("SKYROCKET_STAND_IN_MALFORMED_RATE", "0"))
+            )
+        return f"http://127.0.0.1:{_stand_in_server.server_address[1]}"
+
+def create_backend(backend: str = None, api_key: str = None, base_url: str = None) -> LLMBackend:
+    backend = (backend or LLM_BACKEND).lower()
+    if backend == 'groq':
+        return GroqBackend(api_key=api_key, base_url=base_url or LLM_BASE_URL)
+    if backend in ('openai', 'openai-compatible'):
+        return OpenAICompatibleBackend(base_url or LLM_BASE_URL, api_key=api_key or LLM_API_KEY)
+    if backend == 'stand-in':
+        return OpenAICompatibleBackend(stand_in_url())
+    raise ValueError(f"Unknown LLM backend '{backend}' (expected groq, openai or stand-in)")
@@ -0,0 +1,152 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict
+from skyrocket.utils.lazy import load_env
+from skyrocket.llm.backends import LLMError, track_provider_latency
+
+load_env()
+
+logger = logging.getLogger(__name__)
+
+LLM_SOURCE = 'llm'
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+BREAKER_WINDOW = int(os.getenv("SKYROCKET_BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.getenv("SKYROCKET_BREAKER_MIN_CALLS", "5"))
+BREAKER_ERROR_RATE = float(os.getenv("SKYROCKET_BREAKER_ERROR_RATE", "0.5"))
+BREAKER_SLOW_RATE = float(os.getenv("SKYROCKET_BREAKER_SLOW_RATE", "0.5"))
+BREAKER_LATENCY_SLO_SECONDS = float(os.getenv("SKYROCKET_BREAKER_LATENCY_SLO_MS", "10000")) / 1000.0
+BREAKER_OPEN_SECONDS = float(os.getenv("SKYROCKET_BREAKER_OPEN_SECONDS", "30"))
+BREAKER_HALF_OPEN_PROBES = int(os.getenv("SKYROCKET_BREAKER_HALF_OPEN_PROBES", "1"))
+
+class CircuitOpenError(LLMError):
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit for '{name}' is open, failing fast (next probe in {retry_in:.1f}s)", status_code=503)
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    def __init__(self, name: str, window: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 error_rate: float = BREAKER_ERROR_RATE, slow_rate: float = BREAKER_SLOW_RATE,
+                 latency_slo: float = BREAKER_LATENCY_SLO_SECONDS, open_seconds: float = BREAKER_OPEN_SECONDS,
+                 half_open_probes: int = BREAKER_HALF_OPEN_PROBES):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.latency_slo = latency_slo
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+        return self._state
+
+    def _open(self, now: float):
+        if self._state != OPEN:
+            self.times_opened += 1
+            logger.warning("Circuit '%s' opened, using local fallback for %gs", self.name, self.open_seconds)
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, latency: float, error: bool = False):
+        now = time.monotonic()
+        slow = self.latency_slo > 0 and latency > self.latency_slo
+        with self._lock:
+            state = self._current_state(now)
+            if state == HALF_OPEN:
+                self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+                if error or slow:
+                    self._open(now)
+                else:
+                    logger.info("Circuit '%s' closed, provider recovered", self.name)
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+            if state == OPEN:
+                return
+
+            self._outcomes.append((error, slow))
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+            errors = sum(1 for e, _ in self._outcomes if e)
+            slow_calls = sum(1 for _, s in self._outcomes if s)
+            if errors / calls >= self.error_rate or slow_calls / calls >= self.slow_rate:
+                self._open(now)
+
+    def call(self, fn: Callable, *args, **kwargs):
+        if not self.allow():
+            with self._lock:
+                retry_in = max(self.open_seconds - (time.monotonic() - self._opened_at), 0.0)
+            raise CircuitOpenError(self.name, retry_in)
+
+        # Only provider round-trips count toward the SLO, not rate-limiter waits or retry sleeps.
+        with track_provider_latency() as samples:
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                self.record(max(samples, default=0.0), error=True)
+                raise
+        self.record(max(samples, default=0.0))
+        return result
+
+    def status(self) -> Dict:
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            calls = len(self._outcomes)
+            return {
+                'state': state,
+                'window_calls': calls,
+                'window_errors': sum(1 for e, _ in self._outcomes if e),
+                'window_slow': sum(1 for _, s in self._outcomes if s),
+                'times_opened': self.times_opened,
+                'rejected': self.rejected
+            }
+
+_breakers_lock = threading.Lock()
+_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_breaker(call_type: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if call_type not in _breakers:
+            _breakers[call_type] = CircuitBreaker(call_type)
+        return _breakers[call_type]
+
+def breaker_status() -> Dict[str, Dict]:
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.status() for name, breaker in breakers.items()}
@@ -0,0 +1,203 @@
+import os
+import time
+import uuid
+import random
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from skyrocket.utils.lazy import load_env
+
+load_env()
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+_STAND_IN = os.getenv("SKYROCKET_LLM_BACKEND", "groq") == "stand-in"
+
+RATE_LIMIT_DB = os.getenv("SKYROCKET_RATE_LIMIT_DB", os.path.join(BASE_DIR, 'data', 'processed', 'llm_rate_limit.db'))
+LLM_RPM = float(os.getenv("SKYROCKET_LLM_RPM", "0" if _STAND_IN else "30"))
+LLM_TPM = float(os.getenv("SKYROCKET_LLM_TPM", "0" if _STAND_IN else "6000"))
+MAX_CONCURRENCY = int(os.getenv("SKYROCKET_LLM_MAX_CONCURRENCY", "8"))
+MIN_CONCURRENCY = 1.0
+INITIAL_CONCURRENCY = float(os.getenv("SKYROCKET_LLM_INITIAL_CONCURRENCY", "4"))
+LATENCY_TARGET_SECONDS = float(os.getenv("SKYROCKET_LLM_LATENCY_TARGET_MS", "8000")) / 1000.0
+RATE_LIMIT_RETRIES = int(os.getenv("SKYROCKET_LLM_RATE_LIMIT_RETRIES", "5"))
+LEASE_SECONDS = 300.0
+MAX_WAIT_STEP = 1.0
+RATE_LIMIT_BACKOFF = 0.5
+LATENCY_BACKOFF = 0.8
+DEFAULT_RETRY_AFTER = 2.0
+
+def estimate_tokens(messages, max_tokens: int = None) -> int:
+    chars = sum(len(str(m.get('content', ''))) for m in messages or [])
+    return chars // 4 + (max_tokens or 256)
+
+class RateLimiter:
+    def __init__(self, db_path: str = RATE_LIMIT_DB, rpm: float = LLM_RPM, tpm: float = LLM_TPM,
+                 max_concurrency: int = MAX_CONCURRENCY, latency_target: float = LATENCY_TARGET_SECONDS):
+        self.db_path = db_path
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS limits (
+                    key TEXT PRIMARY KEY,
+                    request_tokens REAL NOT NULL,
+                    llm_tokens REAL NOT NULL,
+                    refilled_at REAL NOT NULL,
+                    window REAL NOT NULL,
+                    blocked_until REAL NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS leases (
+                    id TEXT PRIMARY KEY,
+                    key TEXT NOT NULL,
+                    pid INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_leases_key ON leases (key, expires_at)")
+
+    @property
+    def enabled(self) -> bool:
+        return self.rpm > 0 or self.tpm > 0 or self.max_concurrency > 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _state(self, conn: sqlite3.Connection, key: str, now: float) -> Dict:
+        row = conn.execute("SELECT * FROM limits WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            state = {'key': key, 'request_tokens': self.rpm, 'llm_tokens': self.tpm, 'refilled_at': now,
+                     'window': min(INITIAL_CONCURRENCY, self.max_concurrency or INITIAL_CONCURRENCY),
+                     'blocked_until': 0.0}
+            conn.execute(
+                "INSERT INTO limits (key, request_tokens, llm_tokens, refilled_at, window, blocked_until) "
+                "VALUES (:key, :request_tokens, :llm_tokens, :refilled_at, :window, :blocked_until)", state
+            )
+            return state
+
+        state = dict(row)
+        elapsed = max(now - state['refilled_at'], 0.0)
+        state['request_tokens'] = min(self.rpm, state['request_tokens'] + elapsed * self.rpm / 60.0)
+        state['llm_tokens'] = min(self.tpm, state['llm_tokens'] + elapsed * self.tpm / 60.0)
+        state['refilled_at'] = now
+        return state
+
+    def _save(self, conn: sqlite3.Connection, state: Dict):
+        conn.execute(
+            "UPDATE limits SET request_tokens = :request_tokens, llm_tokens = :llm_tokens, "
+            "refilled_at = :refilled_at, window = :window, blocked_until = :blocked_until WHERE key = :key", state
+        )
+
+    def _try_acquire(self, key: str, cost: int) -> Tuple[Optional[str], float]:
+        now = time.time()
+        cost = min(cost, self.tpm) if self.tpm > 0 else cost
+
+        with self._transaction() as conn:
+            state = self._state(conn, key, now)
+            waits = [state['blocked_until'] - now]
+            if self.rpm > 0 and state['request_tokens'] < 1:
+                waits.append((1 - state['request_tokens']) * 60.0 / self.rpm)
+            if self.tpm > 0 and state['llm_tokens'] < cost:
+                waits.append((cost - state['llm_tokens']) * 60.0 / self.tpm)
+            if self.max_concurrency > 0:
+                conn.execute("DELETE FROM leases WHERE key = ? AND expires_at < ?", (key, now))
+                in_flight = conn.execute("SELECT COUNT(*) FROM leases WHERE key = ?", (key,)).fetchone()[0]
+                if in_flight >= int(state['window']):
+                    waits.append(0.05)
+
+            wait = max(waits)
+            if wait > 0:
+                self._save(conn, state)
+                return None, wait
+
+            if self.rpm > 0:
+                state['request_tokens'] -= 1
+            if self.tpm > 0:
+                state['llm_tokens'] -= cost
+            self._save(conn, state)
+
+            lease_id = uuid.uuid4().hex
+            if self.max_concurrency > 0:
+                conn.execute("INSERT INTO leases (id, key, pid, expires_at) VALUES (?, ?, ?, ?)",
+                             (lease_id, key, os.getpid(), now + LEASE_SECONDS))
+        return lease_id, 0.0
+
+    def acquire(self, key: str, cost: int) -> str:
+        while True:
+            lease_id, wait = self._try_acquire(key, cost)
+            if lease_id is not None:
+                return lease_id
+            time.sleep(min(wait, MAX_WAIT_STEP) * (1 + random.random() / 10))
+
+    def release(self, key: str, lease_id: str, cost: int, used_tokens: int = None, latency: float = None,
+                rate_limited: bool = False, retry_after: float = None):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM leases WHERE id = ?", (lease_id,))
+            state = self._state(conn, key, now)
+
+            if self.tpm > 0 and used_tokens is not None:
+                state['llm_tokens'] = min(self.tpm, state['llm_tokens'] + min(cost, self.tpm) - used_tokens)
+
+            if rate_limited:
+                state['window'] = max(MIN_CONCURRENCY, state['window'] * RATE_LIMIT_BACKOFF)
+                state['blocked_until'] = max(state['blocked_until'], now + (retry_after or DEFAULT_RETRY_AFTER))
+                if self.rpm > 0:
+                    state['request_tokens'] = min(state['request_tokens'], 0.0)
+            elif latency is not None and self.latency_target > 0 and latency > self.latency_target:
+                state['window'] = max(MIN_CONCURRENCY, state['window'] * LATENCY_BACKOFF)
+            elif latency is not None and self.max_concurrency > 0:
+                state['window'] = min(float(self.max_concurrency), state['window'] + 1.0 / state['window'])
+
+            self._save(conn, state)
+
+    def status(self) -> Dict[str, Dict]:
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM limits").fetchall()
+            leases = dict(conn.execute(
+                "SELECT key, COUNT(*) FROM leases WHERE expires_at >= ? GROUP BY key", (now,)
+            ).fetchall())
+        return {
+            row['key']: {
+                'concurrency_window': round(row['window'], 2),
+                'in_flight': leases.get(row['key'], 0),
+                'blocked_for_seconds': round(max(row['blocked_until'] - now, 0.0), 2),
+                'rpm': self.rpm,
+                'tpm': self.tpm
+            }
+            for row in rows
+        }
+
+_limiter_lock = threading.Lock()
+_limiter = None
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            limiter = RateLimiter()
+            _limiter = limiter if limiter.enabled else False
+        return _limiter or None
@@ -0,0 +1,222 @@
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+ITEM_PATTERN = re.compile(r'^\[(\d+)\]', re.MULTILINE)
+TOPIC_PATTERN = re.compile(r'^\d+\. \*\*(.+?)\*\*:', re.MULTILINE)
+LABEL_QUERY_PATTERN = re.compile(r'^- (.+)$', re.MULTILINE)
+COUNT_PATTERN = re.compile(r'Generate (\d+)')
+QUERY_PATTERN = re.compile(r'^QUERY: "(.*)"$', re.MULTILINE | re.DOTALL)
+WORD_PATTERN = re.compile(r"[a-z]{4,}")
+STOP_WORDS = {'with', 'have', 'that', 'this', 'from', 'what', 'when', 'where', 'would', 'could', 'please',
+              'need', 'want', 'help', 'your', 'about', 'there', 'they', 'will', 'just', 'know', 'like'}
+ENTITY_PATTERNS = {
+    'ORDER_ID': re.compile(r'#\d{3,}'),
+    'EMAIL': re.compile(r'[\w.+-]+@[\w-]+\.[\w.]+'),
+    'AMOUNT': re.compile(r'\$\d+(?:\.\d{2})?'),
+    'TRACKING_NUMBER': re.compile(r'\b1Z[0-9A-Z]{16}\b'),
+}
+
+def _stable_index(text: str, size: int) -> int:
+    return int(hashlib.md5(text.encode('utf-8')).hexdigest(), 16) % max(size, 1)
+
+def _entities(text: str) -> List[Dict]:
+    return [
+        {'type': entity_type, 'value': value, 'confidence': 'high'}
+        for entity_type, pattern in ENTITY_PATTERNS.items()
+        for value in pattern.findall(text)
+    ]
+
+def _evaluation(text: str) -> Dict:
+    score = 3 + _stable_index(text, 3)
+    return {
+        'accuracy': score,
+        'empathy': max(score - 1, 1),
+        'completeness': score,
+        'hallucination': _stable_index(text + 'h', 20) == 0,
+        'escalation_needed': _stable_index(text + 'e', 5) == 0,
+        'bias': False,
+        'reasoning': 'Stand-in evaluation'
+    }
+
+def _items(prompt: str) -> List[str]:
+    positions = [(m.start(), m.group(1)) for m in ITEM_PATTERN.finditer(prompt)]
+    return [
+        prompt[start:positions[i + 1][0] if i + 1 < len(positions) else len(prompt)]
+        for i, (start, _) in enumerate(positions)
+    ]
+
+def _label(prompt: str) -> Dict:
+    words = Counter(
+        word for query in LABEL_QUERY_PATTERN.findall(prompt)
+        for word in WORD_PATTERN.findall(query.lower()) if word not in STOP_WORDS
+    )
+    top = [word for word, _ in words.most_common(2)] or ['general', 'inquiry']
+    name = " ".join(word.title() for word in top)
+    return {'topic_name': name, 'description': f"Customers asking about {' and '.join(top)}"}
+
+def _synthetic_queries(prompt: str) -> List[str]:
+    match = COUNT_PATTERN.search(prompt)
+    count = int(match.group(1)) if match else 10
+    topic = prompt.split('**Topic**:', 1)[-1].split('\n', 1)[0].strip() or 'my order'
+    seed = _stable_index(prompt, 10 ** 9)
+    return [f"question {seed + i} about {topic.lower()}" for i in range(count)]
+
+def respond(system: str, prompt: str) -> str:
+    system = system.lower()
+
+    if 'topic classifier' in system:
+        topics = TOPIC_PATTERN.findall(prompt) or ['General Inquiry']
+        if 'json' in system:
+            return json.dumps({'topics': [topics[_stable_index(item, len(topics))] for item in _items(prompt)]})
+        return topics[_stable_index(prompt.rsplit('Query:', 1)[-1], len(topics))]
+
+    if 'entity extraction' in system:
+        if 'TEXTS:' in prompt:
+            return json.dumps({'results': [
+                {'index': i, 'entities': _entities(item)} for i, item in enumerate(_items(prompt), 1)
+            ]})
+        match = QUERY_PATTERN.search(prompt.split('\nOUTPUT FORMAT', 1)[0])
+        return json.dumps(_entities(match.group(1) if match else prompt))
+
+    if 'quality evaluator' in system:
+        if '"evaluations"' in prompt:
+            return json.dumps({'evaluations': [
+                {'index': i, **_evaluation(item)} for i, item in enumerate(_items(prompt), 1)
+            ]})
+        return json.dumps(_evaluation(prompt))
+
+    if 'generating realistic customer service data' in system:
+        return json.dumps(_synthetic_queries(prompt))
+
+    return json.dumps(_label(prompt))
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = "StandInLLM/0.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.endswith('/chat/completions'):
+            self.send_error(404)
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        messages = body.get('messages', [])
+        system = next((m['content'] for m in messages if m.get('role') == 'system'), '')
+        prompt = next((m['content'] for m in reversed(messages) if m.get('role') == 'user'), '')
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        latency = server.latency_ms / 1000.0
+        if server.jitter_ms:
+            latency += random.uniform(0, server.jitter_ms / 1000.0)
+        time.sleep(latency)
+
+        with server.lock:
+            roll = server.rng.random()
+            if roll < server.error_rate:
+                server.errors += 1
+                fault = 'error'
+            elif roll < server.error_rate + server.rate_limit_rate:
+                server.rate_limited += 1
+                fault = 'rate_limit'
+            elif roll < server.error_rate + server.rate_limit_rate + server.malformed_rate:
+                server.malformed += 1
+                fault = 'malformed'
+            else:
+                fault = None
+
+        if fault == 'error':
+            self._send_json(500, {'error': {'message': 'Stand-in injected failure', 'type': 'internal_server_error'}})
+            return
+        if fault == 'rate_limit':
+            self._send_json(429, {'error': {
+                'message': 'Rate limit reached (stand-in). Please try again shortly.',
+                'type': 'requests', 'code': 'rate_limit_exceeded'
+            }}, headers={'Retry-After': str(server.retry_after)})
+            return
+
+        content = respond(system, prompt)
+        if fault == 'malformed':
+            content = content[:max(len(content) // 2, 1)]
+        self._send_json(200, {
+            'id': f"standin-{server.requests}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stand-in'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': len(prompt) // 4,
+                'completion_tokens': len(content) // 4,
+                'total_tokens': (len(prompt) + len(content)) // 4
+            }
+        })
+
+    def _send_json(self, status: int, body: Dict, headers: Dict[str, str] = None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+def start_server(host: str = '127.0.0.1', port: int = 0, latency_ms: float = 50.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, malformed_rate: float = 0.0,
+                 retry_after: float = 1.0, seed: int = None) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.daemon_threads = True
+    server.latency_ms = latency_ms
+    server.jitter_ms = jitter_ms
+    server.error_rate = error_rate
+    server.rate_limit_rate = rate_limit_rate
+    server.malformed_rate = malformed_rate
+    server.retry_after = retry_after
+    server.rng = random.Random(seed)
+    server.requests = 0
+    server.errors = 0
+    server.rate_limited = 0
+    server.malformed = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, name='stand-in-llm', daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Groq-compatible stand-in LLM server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of requests answered with HTTP 429")
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help="Fraction of responses with truncated JSON")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    server = start_server(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                          args.rate_limit_rate, args.malformed_rate, args.retry_after, args.seed)
+    print(f"Stand-in LLM listening on http://{args.host}:{server.server_address[1]} "
+          f"(use SKYROCKET_LLM_BACKEND=openai with SKYROCKET_LLM_BASE_URL, or GROQ_BASE_URL, set to this address)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
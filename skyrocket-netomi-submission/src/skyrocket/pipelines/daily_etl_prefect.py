@@ -1,22 +1,86 @@
 import os
+import hashlib
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Callable, List, Dict
 import pandas as pd
-from prefect import flow, task
-from prefect.tasks import task_input_hash
+from prefect import flow, task, unmapped
+from prefect.task_runners import ThreadPoolTaskRunner
+from prefect.transactions import get_transaction
 import pandera as pa
 from pandera import Column, DataFrameSchema, Check
-from dotenv import load_dotenv
 import json
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
 
-from skyrocket.core.topic_classifier import TopicClassifier
-from skyrocket.core.entity_extractor import EntityExtractor
-from skyrocket.core.llm_judge import LLMJudge
+from skyrocket.data.storage import iter_file_chunks, write_file
+from skyrocket.data.enrichment_store import EnrichmentStore, SOURCE_COLUMNS, content_hashes
+from skyrocket.data.run_catalog import RunCatalog, metrics_from_pipeline
+from skyrocket.pipelines.state_store import PipelineStateStore, row_fingerprints
+from skyrocket.pipelines.streaming import StreamingPipeline, StreamingStage
+from skyrocket.llm.circuit_breaker import LLM_SOURCE
+from skyrocket.utils import perf
+from skyrocket.utils.lazy import lazy_import, load_env
 
-load_dotenv()
+load_env()
+
+topic_classifier = lazy_import('skyrocket.core.topic_classifier')
+entity_extractor = lazy_import('skyrocket.core.entity_extractor')
+llm_judge = lazy_import('skyrocket.core.llm_judge')
+
+PIPELINE_NAME = "daily_customer_query_pipeline"
+FINGERPRINT_COLUMNS = ["query_id", "query_text", "response_text", "timestamp"]
+EXTRACT_CHUNK_SIZE = 50_000
+STAGE_CHUNK_SIZE = int(os.getenv("SKYROCKET_CHUNK_SIZE", "200"))
+MAX_WORKERS = int(os.getenv("SKYROCKET_MAX_WORKERS", "8"))
+TASK_RUNNER = os.getenv("SKYROCKET_TASK_RUNNER", "threads")
+STREAM_QUEUE_SIZE = int(os.getenv("SKYROCKET_STREAM_QUEUE_SIZE", "8"))
+STREAM_WORKERS = int(os.getenv("SKYROCKET_STREAM_WORKERS", "4"))
+FALLBACK_ALERT_RATE = 0.05
+PATH_ONLY_CACHE_PARAMETERS = {'enrichment_db'}
+PERF_STAGES_ATTR = 'skyrocket_perf_stages'
+
+def build_task_runner():
+    if TASK_RUNNER == "processes":
+        from prefect.task_runners import ProcessPoolTaskRunner
+        return ProcessPoolTaskRunner(max_workers=MAX_WORKERS)
+    return ThreadPoolTaskRunner(max_workers=MAX_WORKERS)
+
+def run_chunk_stage(compute: Callable[[pd.DataFrame], pd.DataFrame], df: pd.DataFrame) -> pd.DataFrame:
+    if perf.get_recorder() is not None:
+        return compute(df)
+    
+    # Process-pool workers have no flow recorder, so their stage reports ride back on the chunk for merge_chunks.
+    carried = list(df.attrs.get(PERF_STAGES_ATTR, []))
+    result, recorder = perf.run_recorded(PIPELINE_NAME, compute, df)
+    result.attrs[PERF_STAGES_ATTR] = carried + list(recorder.stages.values())
+    return result
+
+def stage_versions() -> str:
+    return "|".join([
+        f"{topic_classifier.MODEL_NAME}:{topic_classifier.PROMPT_VERSION}",
+        entity_extractor.EntityExtractor.VERSION,
+        llm_judge.LLMJudge.VERSION
+    ])
+
+def chunk_cache_key(context, parameters: Dict) -> str:
+    digest = hashlib.sha256(context.task.name.encode())
+    digest.update(stage_versions().encode())
+    
+    for name, value in sorted(parameters.items()):
+        digest.update(name.encode())
+        if name in PATH_ONLY_CACHE_PARAMETERS:
+            digest.update(os.path.abspath(value).encode() if value else b'')
+        elif isinstance(value, pd.DataFrame):
+            fingerprints = value['row_fingerprint'] if 'row_fingerprint' in value.columns else row_fingerprints(value)
+            digest.update("|".join(fingerprints).encode())
+        elif isinstance(value, str) and os.path.isfile(value):
+            with open(value, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        else:
+            digest.update(repr(value).encode())
+    
+    return digest.hexdigest()
 
 queries_schema = DataFrameSchema({
     "query_id": Column(int, nullable=False),
@@ -32,16 +96,47 @@ responses_schema = DataFrameSchema({
 })
 
 @task(name="Extract New Queries", retries=3, retry_delay_seconds=60)
-def extract_new_queries(data_source: str, last_processed_date: datetime = None) -> pd.DataFrame:
+def extract_new_queries(data_source: str, last_processed_date: datetime = None,
+                        state_db: str = None, chunk_size: int = EXTRACT_CHUNK_SIZE) -> pd.DataFrame:
     print(f"Extracting new queries from {data_source}")
+    if last_processed_date:
+        print(f"Watermark: {last_processed_date.isoformat()}")
     
-    df = pd.read_csv(data_source)
+    state = PipelineStateStore(state_db) if state_db else None
     
-    if last_processed_date:
-        if 'timestamp' in df.columns:
-            df = df[pd.to_datetime(df['timestamp']) > last_processed_date]
+    with perf.stage("extract") as stage:
+        new_chunks = []
+        rows_scanned = 0
+        for chunk in iter_file_chunks(data_source, chunk_size=chunk_size):
+            rows_scanned += len(chunk)
+            
+            if 'timestamp' in chunk.columns:
+                chunk['timestamp'] = pd.to_datetime(chunk['timestamp'], errors='coerce')
+                if last_processed_date:
+                    chunk = chunk[chunk['timestamp'].isna() | (chunk['timestamp'] >= last_processed_date)]
+            
+            if chunk.empty:
+                continue
+            
+            fingerprint_cols = [c for c in FINGERPRINT_COLUMNS if c in chunk.columns] or None
+            chunk = chunk.assign(
+                row_fingerprint=row_fingerprints(chunk, fingerprint_cols).to_numpy(),
+                content_hash=content_hashes(chunk, 'query_text', 'response_text').to_numpy()
+            )
+            
+            if state is not None:
+                seen = state.seen_fingerprints(PIPELINE_NAME, chunk['row_fingerprint'])
+                if seen:
+                    chunk = chunk[~chunk['row_fingerprint'].isin(seen)]
+            
+            if not chunk.empty:
+                new_chunks.append(chunk)
+        
+        df = pd.concat(new_chunks, ignore_index=True) if new_chunks else pd.DataFrame()
+        stage.report.rows_in += rows_scanned
+        stage.rows_out = len(df)
     
-    print(f"Extracted {len(df)} new queries")
+    print(f"Scanned {rows_scanned} rows, extracted {len(df)} new queries")
     return df
 
 @task(name="Validate Data Quality", retries=2)
@@ -60,66 +155,133 @@ def validate_data_quality(df: pd.DataFrame, schema: DataFrameSchema) -> pd.DataF
         print(f"Dropped {len(df) - len(clean_df)} invalid rows")
         return clean_df
 
-@task(name="Classify Topics", cache_key_fn=task_input_hash, cache_expiration=timedelta(hours=24))
-def classify_topics(df: pd.DataFrame, topics_config_path: str) -> pd.DataFrame:
-    print(f"Classifying {len(df)} queries into topics")
-    
+@task(name="Split Into Chunks")
+def split_into_chunks(df: pd.DataFrame, chunk_size: int = STAGE_CHUNK_SIZE) -> List[pd.DataFrame]:
+    chunks = [df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size)]
+    print(f"Split {len(df)} rows into {len(chunks)} chunks of up to {chunk_size}")
+    return chunks
+
+def load_classifier(topics_config_path: str) -> 'topic_classifier.TopicClassifier':
     with open(topics_config_path, 'r') as f:
         topics_config = json.load(f)
+    return topic_classifier.TopicClassifier(topics_config)
+
+def open_store(enrichment_db: str = None) -> EnrichmentStore:
+    return EnrichmentStore(enrichment_db) if enrichment_db else None
+
+def classify_frame(df: pd.DataFrame, classifier: 'topic_classifier.TopicClassifier', store: EnrichmentStore = None) -> pd.DataFrame:
+    def compute(frame: pd.DataFrame) -> pd.DataFrame:
+        results = [classifier.classify_query(query) for query in frame['query_text']]
+        return frame.assign(topic=[r['topic_name'] for r in results], topic_source=[r['source'] for r in results])
     
-    classifier = TopicClassifier(topics_config)
-    
-    topics = []
-    for query in df['query_text']:
-        result = classifier.classify_query(query)
-        topics.append(result['topic_name'])
+    with perf.stage("classify", rows_in=len(df)):
+        return store.enrich(df, 'topic', classifier.version, compute) if store else compute(df)
+
+def extract_frame(df: pd.DataFrame, extractor: 'entity_extractor.EntityExtractor', store: EnrichmentStore = None) -> pd.DataFrame:
+    def compute(frame: pd.DataFrame) -> pd.DataFrame:
+        responses = frame['response_text'] if 'response_text' in frame.columns else [None] * len(frame)
+        return entity_extractor.assign_entities(frame, [
+            extractor.extract_values(entity_extractor.combine_query_response(query, response), with_source=True)
+            for query, response in zip(frame['query_text'], responses)
+        ])
+    
+    with perf.stage("extract_entities", rows_in=len(df)):
+        return store.enrich(df, 'entities', entity_extractor.EntityExtractor.VERSION, compute) if store else compute(df)
+
+def evaluate_frame(df: pd.DataFrame, judge: 'llm_judge.LLMJudge', store: EnrichmentStore = None) -> pd.DataFrame:
+    with perf.stage("evaluate", rows_in=len(df)):
+        return judge.evaluate_dataset(df, query_col='query_text', response_col='response_text', store=store)
+
+@task(name="Classify Topics", retries=2, retry_delay_seconds=30,
+      cache_key_fn=chunk_cache_key, cache_expiration=timedelta(hours=24))
+def classify_topics(df: pd.DataFrame, topics_config_path: str, enrichment_db: str = None) -> pd.DataFrame:
+    print(f"Classifying {len(df)} queries into topics")
     
-    df['topic'] = topics
+    classified_df = run_chunk_stage(
+        lambda chunk: classify_frame(chunk, load_classifier(topics_config_path), open_store(enrichment_db)), df
+    )
     print("Classification complete")
     
-    return df
+    return skip_cache_when_degraded(classified_df)
 
-@task(name="Extract Entities")
-def extract_entities(df: pd.DataFrame) -> pd.DataFrame:
+@task(name="Extract Entities", retries=2, retry_delay_seconds=30,
+      cache_key_fn=chunk_cache_key, cache_expiration=timedelta(hours=24))
+def extract_entities(df: pd.DataFrame, enrichment_db: str = None) -> pd.DataFrame:
     print(f"Extracting entities from {len(df)} queries")
     
-    extractor = EntityExtractor()
-    
-    entities_list = []
-    for query in df['query_text']:
-        entities = extractor.extract_hybrid(query, use_groq=False)
-        entities_json = {k: [e.value for e in v] for k, v in entities.items()}
-        entities_list.append(entities_json)
-    
-    df['entities'] = [str(e) for e in entities_list]
+    enriched_df = run_chunk_stage(
+        lambda chunk: extract_frame(chunk, entity_extractor.EntityExtractor(), open_store(enrichment_db)), df
+    )
     print("Entity extraction complete")
     
-    return df
+    return skip_cache_when_degraded(enriched_df)
 
-@task(name="Evaluate Responses")
-def evaluate_responses(df: pd.DataFrame) -> pd.DataFrame:
+@task(name="Evaluate Responses", retries=2, retry_delay_seconds=30,
+      cache_key_fn=chunk_cache_key, cache_expiration=timedelta(hours=24))
+def evaluate_responses(df: pd.DataFrame, enrichment_db: str = None) -> pd.DataFrame:
     print(f"Evaluating {len(df)} responses")
     
-    judge = LLMJudge()
-    
-    evaluated_df = judge.evaluate_dataset(
-        df,
-        query_col='query_text',
-        response_col='response_text'
+    evaluated_df = run_chunk_stage(
+        lambda chunk: evaluate_frame(chunk, llm_judge.LLMJudge(), open_store(enrichment_db)), df
     )
-    
-    return evaluated_df
+    return skip_cache_when_degraded(evaluated_df)
+
+@task(name="Run Streaming Stages", retries=1)
+def run_streaming_stages(df: pd.DataFrame, topics_config_path: str,
+                         enrichment_db: str = None,
+                         batch_size: int = STAGE_CHUNK_SIZE,
+                         workers: int = STREAM_WORKERS,
+                         queue_size: int = STREAM_QUEUE_SIZE) -> pd.DataFrame:
+    print(f"Streaming {len(df)} rows through stages (batch={batch_size}, workers={workers}, queue={queue_size})")
+    
+    classifier = load_classifier(topics_config_path)
+    extractor = entity_extractor.EntityExtractor()
+    store = open_store(enrichment_db)
+    
+    stages = [
+        StreamingStage("classify", lambda batch: classify_frame(batch, classifier, store), workers),
+        StreamingStage("extract", lambda batch: extract_frame(batch, extractor, store), workers),
+    ]
+    if 'response_text' in df.columns:
+        judge = llm_judge.LLMJudge()
+        stages.append(StreamingStage("evaluate", lambda batch: evaluate_frame(batch, judge, store), workers))
+    
+    pipeline = StreamingPipeline(stages, batch_size=batch_size, queue_size=queue_size)
+    result_df = pipeline.run(df).reset_index(drop=True)
+    
+    print("Streaming stages complete")
+    pipeline.print_stats()
+    
+    return result_df
+
+@task(name="Merge Chunks")
+def merge_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    recorder = perf.get_recorder()
+    for chunk in chunks:
+        stages = chunk.attrs.pop(PERF_STAGES_ATTR, None)
+        if stages and recorder is not None:
+            recorder.absorb(stages)
+    
+    merged = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    print(f"Merged {len(chunks)} chunks into {len(merged)} rows")
+    return merged
 
 @task(name="Calculate Metrics")
 def calculate_metrics(df: pd.DataFrame) -> Dict:
     print("Calculating business metrics")
     
+    judge_metrics = llm_judge.JudgeMetrics.from_frame(df) if 'overall_quality' in df.columns else None
+    
     metrics = {
         "total_queries": len(df),
-        "containment_rate": (1 - df['escalation_needed'].sum() / len(df)) if 'escalation_needed' in df.columns else 0,
-        "avg_quality_score": df['overall_quality'].mean() if 'overall_quality' in df.columns else 0,
-        "hallucination_rate": df['hallucination'].sum() / len(df) if 'hallucination' in df.columns else 0,
+        "containment_rate": (1 - judge_metrics.rate('escalation_needed')) if judge_metrics else 0,
+        "avg_quality_score": judge_metrics.mean('overall_quality') if judge_metrics else 0,
+        "hallucination_rate": judge_metrics.rate('hallucination') if judge_metrics else 0,
         "top_topics": df['topic'].value_counts().head(5).to_dict() if 'topic' in df.columns else {},
+        "fallback_rates": {
+            column: float((df[column] != LLM_SOURCE).mean())
+            for column in SOURCE_COLUMNS.values() if column in df.columns and len(df)
+        },
         "timestamp": datetime.now().isoformat()
     }
     
@@ -149,6 +311,10 @@ def check_quality_thresholds(metrics: Dict) -> bool:
                 if value < threshold:
                     alerts.append(f"{metric}: {value:.2%} below threshold {threshold:.2%}")
     
+    for column, rate in metrics.get("fallback_rates", {}).items():
+        if rate > FALLBACK_ALERT_RATE:
+            alerts.append(f"{column}: {rate:.2%} of rows came from local fallbacks, not the LLM")
+    
     if alerts:
         print("Quality issues detected:")
         for alert in alerts:
@@ -160,48 +326,138 @@ def check_quality_thresholds(metrics: Dict) -> bool:
         return True
 
 @task(name="Save Results")
-def save_results(df: pd.DataFrame, metrics: Dict, output_dir: str):
+def save_results(df: pd.DataFrame, metrics: Dict, output_dir: str, perf_report: Dict = None):
     print(f"Saving results to {output_dir}")
     
     os.makedirs(output_dir, exist_ok=True)
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    data_path = os.path.join(output_dir, f"processed_{timestamp}.csv")
-    df.to_csv(data_path, index=False)
+    data_path = os.path.join(output_dir, f"processed_{timestamp}.parquet")
+    write_file(df, data_path)
     
     metrics_path = os.path.join(output_dir, f"metrics_{timestamp}.json")
     with open(metrics_path, 'w') as f:
         json.dump(metrics, f, indent=2)
     
+    artifacts = {'processed': data_path, 'metrics': metrics_path}
+    if perf_report is not None:
+        perf_path = os.path.join(output_dir, f"perf_{timestamp}.json")
+        with open(perf_path, 'w') as f:
+            json.dump(perf_report, f, indent=2)
+        artifacts['perf'] = perf_path
+    
     print(f"Saved to {output_dir}")
+    return artifacts
+
+@task(name="Catalog Run")
+def catalog_run(df: pd.DataFrame, metrics: Dict, artifacts: Dict, catalog_db: str, started_at: datetime, mode: str):
+    run_id = f"pipeline:{os.path.basename(artifacts['metrics'])[len('metrics_'):-len('.json')]}"
+    topic_counts = df['topic'].value_counts().to_dict() if 'topic' in df.columns else {}
+    
+    RunCatalog(catalog_db).record_run(
+        run_id, 'pipeline', datetime.now().timestamp(), metrics_from_pipeline(metrics),
+        topic_counts=topic_counts, artifacts={**artifacts, 'mode': mode}, started_at=started_at.timestamp()
+    )
+    print(f"Recorded run {run_id} in {catalog_db}")
+
+def print_perf_report(report: Dict):
+    print("Stage performance:")
+    for stage in report['stages']:
+        print(f"  {stage['stage']}: {stage['wall_seconds']}s wall, {stage['cpu_seconds']}s cpu, "
+              f"{stage['rows_out']} rows ({stage['rows_per_sec']} rows/s), {stage['llm_requests']} LLM calls, "
+              f"{stage['cache_hits']} cache hits, p95 {stage['latency_p95_ms']} ms")
 
-@flow(name="Daily Customer Query Processing")
+def degraded_rows(df: pd.DataFrame) -> pd.Series:
+    degraded = pd.Series(False, index=df.index)
+    for column in SOURCE_COLUMNS.values():
+        if column in df.columns:
+            degraded |= df[column] != LLM_SOURCE
+    return degraded
+
+def skip_cache_when_degraded(df: pd.DataFrame) -> pd.DataFrame:
+    # Fallback rows must be retried on the next run, so the chunk result is not written to the task cache.
+    transaction = get_transaction()
+    if transaction is not None and degraded_rows(df).any():
+        transaction.write_on_commit = False
+    return df
+
+@task(name="Commit Watermark")
+def commit_watermark(df: pd.DataFrame, state_db: str):
+    state = PipelineStateStore(state_db)
+    
+    degraded = degraded_rows(df)
+    complete = df[~degraded]
+    
+    timestamps = df['timestamp'] if 'timestamp' in df.columns else None
+    watermark = timestamps.max() if timestamps is not None and timestamps.notna().any() else None
+    if watermark is not None and degraded.any() and timestamps[degraded].notna().any():
+        watermark = min(watermark, timestamps[degraded].min())
+    
+    state.commit(
+        PIPELINE_NAME,
+        complete['row_fingerprint'],
+        row_timestamps=complete['timestamp'] if timestamps is not None else None,
+        watermark=watermark.to_pydatetime() if watermark is not None else None
+    )
+    
+    print(f"Recorded {len(complete)} processed rows" + (f", watermark now {watermark.isoformat()}" if watermark is not None else ""))
+    if degraded.any():
+        print(f"Left {int(degraded.sum())} rows with fallback results for the next run to retry")
+
+@flow(name="Daily Customer Query Processing", task_runner=build_task_runner())
 def daily_customer_query_pipeline(
     data_source: str = "data/queries.csv",
     topics_config: str = "data/topic_discovery_results.json",
-    output_dir: str = "data/processed"
+    output_dir: str = "data/processed",
+    state_db: str = "data/processed/pipeline_state.db",
+    enrichment_db: str = "data/processed/enrichment.db",
+    catalog_db: str = "data/processed/run_catalog.db",
+    full_refresh: bool = False,
+    chunk_size: int = STAGE_CHUNK_SIZE,
+    mode: str = "batch"
 ):
     print("="*80)
     print("DAILY CUSTOMER QUERY PROCESSING PIPELINE")
     print("="*80)
     
-    raw_df = extract_new_queries(data_source)
+    recorder = perf.start_run(f"{PIPELINE_NAME}:{mode}")
+    started_at = datetime.now()
     
-    validated_df = raw_df
+    state = PipelineStateStore(state_db)
+    if full_refresh:
+        state.reset(PIPELINE_NAME)
     
-    classified_df = classify_topics(validated_df, topics_config)
-    enriched_df = extract_entities(classified_df)
+    raw_df = extract_new_queries(data_source, state.get_watermark(PIPELINE_NAME), state_db)
     
-    if 'response_text' in enriched_df.columns:
-        evaluated_df = evaluate_responses(enriched_df)
+    if raw_df.empty:
+        print("No new queries since the last run")
+        return {"total_queries": 0, "timestamp": datetime.now().isoformat()}
+    
+    validated_df = raw_df
+    
+    if mode == "streaming":
+        evaluated_df = run_streaming_stages(validated_df, topics_config, enrichment_db, chunk_size)
     else:
-        evaluated_df = enriched_df
+        chunks = split_into_chunks(validated_df, chunk_size)
+        
+        classified = classify_topics.map(chunks, unmapped(topics_config), unmapped(enrichment_db))
+        enriched = extract_entities.map(classified, unmapped(enrichment_db))
+        
+        if 'response_text' in validated_df.columns:
+            evaluated = evaluate_responses.map(enriched, unmapped(enrichment_db))
+        else:
+            evaluated = enriched
+        
+        evaluated_df = merge_chunks(evaluated)
     
     metrics = calculate_metrics(evaluated_df)
     
     quality_ok = check_quality_thresholds(metrics)
     
-    save_results(evaluated_df, metrics, output_dir)
+    print_perf_report(recorder.to_dict())
+    artifacts = save_results(evaluated_df, metrics, output_dir, recorder.to_dict())
+    catalog_run(evaluated_df, metrics, artifacts, catalog_db, started_at, mode)
+    commit_watermark(evaluated_df, state_db)
     
     print("="*80)
     print(f"Pipeline complete - Quality: {'PASS' if quality_ok else 'FAIL'}")
@@ -0,0 +1,92 @@
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+import pandas as pd
+
+SQLITE_MAX_PARAMS = 900
+
+def row_fingerprints(df: pd.DataFrame, columns: List[str] = None) -> pd.Series:
+    subset = df[columns] if columns else df
+    hashes = pd.util.hash_pandas_object(subset.astype(str), index=False)
+    return hashes.map(lambda h: f"{h:016x}")
+
+class PipelineStateStore:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    pipeline TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    pipeline TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    row_timestamp TEXT,
+                    PRIMARY KEY (pipeline, fingerprint)
+                ) WITHOUT ROWID
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get_watermark(self, pipeline: str) -> Optional[datetime]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM watermarks WHERE pipeline = ?", (pipeline,)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def seen_fingerprints(self, pipeline: str, fingerprints: Iterable[str]) -> Set[str]:
+        fingerprints = list(fingerprints)
+        seen = set()
+        with self._connect() as conn:
+            for i in range(0, len(fingerprints), SQLITE_MAX_PARAMS):
+                batch = fingerprints[i:i + SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT fingerprint FROM fingerprints WHERE pipeline = ? AND fingerprint IN ({placeholders})",
+                    [pipeline, *batch]
+                ).fetchall()
+                seen.update(r[0] for r in rows)
+        return seen
+
+    def commit(self, pipeline: str, fingerprints: Iterable[str],
+               row_timestamps: Iterable[Optional[datetime]] = None,
+               watermark: Optional[datetime] = None):
+        fingerprints = list(fingerprints)
+        row_timestamps = list(row_timestamps) if row_timestamps is not None else [None] * len(fingerprints)
+        rows = [
+            (pipeline, fp, ts.isoformat() if ts is not None and not pd.isna(ts) else None)
+            for fp, ts in zip(fingerprints, row_timestamps)
+        ]
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO fingerprints (pipeline, fingerprint, row_timestamp) VALUES (?, ?, ?)",
+                rows
+            )
+
+            if watermark is not None:
+                current = conn.execute(
+                    "SELECT value FROM watermarks WHERE pipeline = ?", (pipeline,)
+                ).fetchone()
+                if current is None or datetime.fromisoformat(current[0]) < watermark:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO watermarks (pipeline, value, updated_at) VALUES (?, ?, ?)",
+                        (pipeline, watermark.isoformat(), datetime.now().isoformat())
+                    )
+                    conn.execute(
+                        "DELETE FROM fingerprints WHERE pipeline = ? AND row_timestamp IS NOT NULL AND row_timestamp < ?",
+                        (pipeline, watermark.isoformat())
+                    )
+
+    def reset(self, pipeline: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM watermarks WHERE pipeline = ?", (pipeline,))
+            conn.execute("DELETE FROM fingerprints WHERE pipeline = ?", (pipeline,))
@@ -0,0 +1,126 @@
+import queue
+import threading
+import contextvars
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+import pandas as pd
+
+_STOP = object()
+
+@dataclass
+class StreamingStage:
+    name: str
+    fn: Callable[[pd.DataFrame], pd.DataFrame]
+    workers: int = 4
+
+@dataclass
+class StageStats:
+    batches: int = 0
+    rows: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+
+class StreamingPipeline:
+    def __init__(self, stages: List[StreamingStage], batch_size: int = 20, queue_size: int = 8):
+        if not stages:
+            raise ValueError("StreamingPipeline needs at least one stage")
+        self.stages = stages
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.stats: Dict[str, StageStats] = {}
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        remaining = [stage.workers for stage in self.stages]
+        lock = threading.Lock()
+        abort = threading.Event()
+        errors: List[BaseException] = []
+        self.stats = {stage.name: StageStats() for stage in self.stages}
+
+        def put(q: queue.Queue, item) -> bool:
+            while not abort.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feeder():
+            for seq, start in enumerate(range(0, len(df), self.batch_size)):
+                if not put(queues[0], (seq, df.iloc[start:start + self.batch_size])):
+                    break
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_STOP)
+
+        def worker(index: int):
+            stage = self.stages[index]
+            inbox, outbox = queues[index], queues[index + 1]
+            stats = self.stats[stage.name]
+
+            while True:
+                item = inbox.get()
+                if item is _STOP:
+                    break
+                if abort.is_set():
+                    continue
+
+                seq, batch = item
+                started = time.perf_counter()
+                try:
+                    result = stage.fn(batch)
+                except BaseException as e:
+                    errors.append(e)
+                    abort.set()
+                    continue
+
+                with lock:
+                    stats.batches += 1
+                    stats.rows += len(result)
+                    stats.busy_seconds += time.perf_counter() - started
+                    stats.max_queue_depth = max(stats.max_queue_depth, inbox.qsize())
+                put(outbox, (seq, result))
+
+            with lock:
+                remaining[index] -= 1
+                last_worker = remaining[index] == 0
+            if last_worker:
+                downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+                for _ in range(downstream):
+                    outbox.put(_STOP)
+
+        def spawn(target: Callable, name: str, *args) -> threading.Thread:
+            # Each thread runs in its own copy of the caller's context so perf stages reach the run's recorder.
+            context = contextvars.copy_context()
+            return threading.Thread(target=context.run, args=(target, *args), name=name, daemon=True)
+
+        threads = [spawn(feeder, "stream-feeder")]
+        for index, stage in enumerate(self.stages):
+            threads.extend(spawn(worker, f"stream-{stage.name}-{n}", index) for n in range(stage.workers))
+        for thread in threads:
+            thread.start()
+
+        results = {}
+        while True:
+            item = queues[-1].get()
+            if item is _STOP:
+                break
+            seq, batch = item
+            results[seq] = batch
+
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+        if not results:
+            return df.iloc[0:0]
+        return pd.concat([results[seq] for seq in sorted(results)])
+
+    def print_stats(self):
+        for name, stats in self.stats.items():
+            rate = stats.rows / stats.busy_seconds if stats.busy_seconds else 0.0
+            print(f"   {name}: {stats.batches} batches, {stats.rows} rows, "
+                  f"{stats.busy_seconds:.1f}s busy ({rate:.1f} rows/s), max queue depth {stats.max_queue_depth}")
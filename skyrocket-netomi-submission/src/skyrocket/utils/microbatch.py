@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Set
+
+@dataclass
+class BatcherStats:
+    batches: int = 0
+    items: int = 0
+    max_batch: int = 0
+
+    @property
+    def mean_batch(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+class MicroBatcher:
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 16, max_wait_ms: float = 10.0,
+                 executor: Optional[Executor] = None, name: str = "batch"):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self.name = name
+        self.stats = BatcherStats()
+        self._pending: List[tuple] = []
+        self._timer: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush(loop)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush, loop)
+
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+        if self._pending:
+            self._timer = loop.call_soon(self._flush, loop)
+
+        self.stats.batches += 1
+        self.stats.items += len(batch)
+        self.stats.max_batch = max(self.stats.max_batch, len(batch))
+        task = loop.create_task(self._run(loop, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, loop: asyncio.AbstractEventLoop, batch: List[tuple]):
+        items = [item for item, _ in batch]
+        try:
+            results = await loop.run_in_executor(self.executor, self.process_batch, items)
+            if len(results) != len(items):
+                raise RuntimeError(f"{self.name}: expected {len(items)} results, got {len(results)}")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,286 @@
+import os
+import sys
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+RSS_SAMPLE_INTERVAL = 0.05
+
+_current_stage: contextvars.ContextVar = contextvars.ContextVar('skyrocket_perf_stage', default=None)
+_run_recorder: contextvars.ContextVar = contextvars.ContextVar('skyrocket_perf_recorder', default=None)
+_listeners: List[Callable[[str, Dict], None]] = []
+
+def _current_rss_bytes() -> int:
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+@dataclass
+class StageReport:
+    name: str
+    calls: int = 0
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+    busy_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    rows_in: int = 0
+    rows_out: int = 0
+    llm_requests: int = 0
+    llm_retries: int = 0
+    llm_errors: int = 0
+    llm_fallbacks: int = 0
+    cache_hits: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    def merge(self, other: 'StageReport'):
+        self.calls += other.calls
+        starts = [t for t in (self.first_start, other.first_start) if t is not None]
+        ends = [t for t in (self.last_end, other.last_end) if t is not None]
+        self.first_start = min(starts) if starts else None
+        self.last_end = max(ends) if ends else None
+        self.busy_seconds += other.busy_seconds
+        self.cpu_seconds += other.cpu_seconds
+        self.peak_rss_bytes = max(self.peak_rss_bytes, other.peak_rss_bytes)
+        self.rows_in += other.rows_in
+        self.rows_out += other.rows_out
+        self.llm_requests += other.llm_requests
+        self.llm_retries += other.llm_retries
+        self.llm_errors += other.llm_errors
+        self.llm_fallbacks += other.llm_fallbacks
+        self.cache_hits += other.cache_hits
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.latencies.extend(other.latencies)
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    def to_dict(self) -> Dict:
+        wall = self.wall_seconds
+        return {
+            'stage': self.name,
+            'calls': self.calls,
+            'wall_seconds': round(wall, 3),
+            'busy_seconds': round(self.busy_seconds, 3),
+            'cpu_seconds': round(self.cpu_seconds, 3),
+            'peak_rss_mb': round(self.peak_rss_bytes / (1024 * 1024), 1),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'rows_per_sec': round(self.rows_out / wall, 2) if wall > 0 else None,
+            'llm_requests': self.llm_requests,
+            'llm_retries': self.llm_retries,
+            'llm_errors': self.llm_errors,
+            'llm_fallbacks': self.llm_fallbacks,
+            'cache_hits': self.cache_hits,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'latency_p50_ms': round(_percentile(self.latencies, 0.50) * 1000, 1) if self.latencies else None,
+            'latency_p95_ms': round(_percentile(self.latencies, 0.95) * 1000, 1) if self.latencies else None,
+            'latency_p99_ms': round(_percentile(self.latencies, 0.99) * 1000, 1) if self.latencies else None
+        }
+
+class StageHandle:
+    def __init__(self, report: StageReport):
+        self.report = report
+        self.rows_out = None
+
+class PerfRecorder:
+    def __init__(self, run_name: str):
+        self.run_name = run_name
+        self.started_at = time.time()
+        self.started_counter = time.perf_counter()
+        self.stages: Dict[str, StageReport] = {}
+        self._lock = threading.Lock()
+        self._stage_peaks: Dict[StageHandle, int] = {}
+        self._sampler: Optional[threading.Thread] = None
+
+    def _stage_report(self, name: str) -> StageReport:
+        with self._lock:
+            if name not in self.stages:
+                self.stages[name] = StageReport(name)
+            return self.stages[name]
+
+    def _sample_rss(self):
+        # One sampler per recorder serves every open stage and exits once none are left.
+        while True:
+            time.sleep(RSS_SAMPLE_INTERVAL)
+            rss = _current_rss_bytes()
+            with self._lock:
+                if not self._stage_peaks:
+                    self._sampler = None
+                    return
+                for handle, peak in self._stage_peaks.items():
+                    self._stage_peaks[handle] = max(peak, rss)
+
+    def _open_stage(self, handle: StageHandle):
+        rss = _current_rss_bytes()
+        with self._lock:
+            self._stage_peaks[handle] = rss
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_rss, name=f"perf-rss-{self.run_name}", daemon=True)
+                self._sampler.start()
+
+    def _close_stage(self, handle: StageHandle) -> int:
+        rss = _current_rss_bytes()
+        with self._lock:
+            return max(self._stage_peaks.pop(handle), rss)
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = 0):
+        report = self._stage_report(name)
+        handle = StageHandle(report)
+        token = _current_stage.set(report)
+        self._open_stage(handle)
+
+        started, cpu_started = time.perf_counter(), time.process_time()
+        try:
+            yield handle
+        finally:
+            ended, cpu_ended = time.perf_counter(), time.process_time()
+            peak = self._close_stage(handle)
+            _current_stage.reset(token)
+
+            with self._lock:
+                report.calls += 1
+                report.first_start = started if report.first_start is None else min(report.first_start, started)
+                report.last_end = ended if report.last_end is None else max(report.last_end, ended)
+                report.busy_seconds += ended - started
+                report.cpu_seconds += cpu_ended - cpu_started
+                report.peak_rss_bytes = max(report.peak_rss_bytes, peak)
+                report.rows_in += rows_in
+                report.rows_out += handle.rows_out if handle.rows_out is not None else rows_in
+
+            _notify('stage', {'stage': name, 'seconds': ended - started, 'rows': rows_in})
+
+    def absorb(self, reports: List[StageReport]):
+        # Reports that started before this run are cached task results replayed by Prefect.
+        for other in reports:
+            if other.first_start is None or other.first_start < self.started_counter:
+                continue
+            report = self._stage_report(other.name)
+            with self._lock:
+                report.merge(other)
+
+    def to_dict(self) -> Dict:
+        return {
+            'run_name': self.run_name,
+            'started_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started_at)),
+            'total_seconds': round(time.time() - self.started_at, 3),
+            'stages': [report.to_dict() for report in self.stages.values()]
+        }
+
+    def save(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+def add_listener(listener: Callable[[str, Dict], None]):
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+def _notify(event: str, data: Dict):
+    for listener in list(_listeners):
+        try:
+            listener(event, data)
+        except Exception as e:
+            print(f"Perf listener failed: {e}")
+
+def start_run(run_name: str) -> PerfRecorder:
+    recorder = PerfRecorder(run_name)
+    _run_recorder.set(recorder)
+    return recorder
+
+def run_recorded(run_name: str, fn: Callable, *args, **kwargs):
+    def run():
+        recorder = start_run(run_name)
+        return fn(*args, **kwargs), recorder
+    return contextvars.copy_context().run(run)
+
+def get_recorder() -> Optional[PerfRecorder]:
+    return _run_recorder.get()
+
+@contextmanager
+def stage(name: str, rows_in: int = 0):
+    recorder = get_recorder()
+    if recorder is None:
+        yield StageHandle(StageReport(name))
+        return
+    with recorder.stage(name, rows_in=rows_in) as handle:
+        yield handle
+
+def record_llm_call(latency: float, usage=None, retries: int = 0, error: bool = False, module: str = None):
+    _notify('llm_call', {'module': module or 'unknown', 'seconds': latency, 'error': error, 'retries': retries})
+
+    report = _current_stage.get()
+    if report is None:
+        return
+    recorder = get_recorder()
+    lock = recorder._lock if recorder is not None else threading.Lock()
+    with lock:
+        report.llm_requests += 1
+        report.llm_retries += retries
+        report.llm_errors += int(error)
+        report.latencies.append(latency)
+        if usage is not None:
+            report.prompt_tokens += getattr(usage, 'prompt_tokens', 0) or 0
+            report.completion_tokens += getattr(usage, 'completion_tokens', 0) or 0
+
+def record_cache_hits(count: int):
+    report = _current_stage.get()
+    if report is None or count <= 0:
+        return
+    recorder = get_recorder()
+    lock = recorder._lock if recorder is not None else threading.Lock()
+    with lock:
+        report.cache_hits += count
+
+def record_fallback(module: str, source: str):
+    _notify('llm_fallback', {'module': module, 'source': source})
+    report = _current_stage.get()
+    if report is None:
+        return
+    recorder = get_recorder()
+    lock = recorder._lock if recorder is not None else threading.Lock()
+    with lock:
+        report.llm_fallbacks += 1
+
+def timed_completion(client, module: str = None, attempt: int = 0, **kwargs):
+    retries = int(attempt > 0)
+    started = time.perf_counter()
+    try:
+        completion = client.chat.completions.create(**kwargs)
+    except Exception:
+        record_llm_call(time.perf_counter() - started, retries=retries, error=True, module=module)
+        raise
+    record_llm_call(time.perf_counter() - started, usage=getattr(completion, 'usage', None),
+                    retries=retries, module=module)
+    return completion
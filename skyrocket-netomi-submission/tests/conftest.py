@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+_limits_dir = tempfile.mkdtemp(prefix='skyrocket-test-limits-')
+os.environ.setdefault('SKYROCKET_LLM_BACKEND', 'stand-in')
+os.environ.setdefault('SKYROCKET_LLM_RPM', '0')
+os.environ.setdefault('SKYROCKET_LLM_TPM', '0')
+os.environ.setdefault('SKYROCKET_RATE_LIMIT_DB', os.path.join(_limits_dir, 'llm_rate_limit.db'))
+os.environ.setdefault('PREFECT_HOME', os.path.join(_limits_dir, 'prefect'))
+os.environ.setdefault('PREFECT_LOGGING_LEVEL', 'WARNING')
@@ -0,0 +1,49 @@
+import json
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from skyrocket.core import entity_extractor, llm_judge
+from skyrocket.data.prepare_data import prepare_data
+import app as app_module
+
+def responses():
+    return pd.DataFrame({
+        'query': ['Where is order #12345?', 'I want a refund', 'Reset my password'],
+        'response': ['It ships tomorrow.', 'Sorry, I can help with that refund.', 'Use the reset link we emailed.'],
+        'category': ['Shipping', 'Billing', 'Account'],
+    })
+
+@pytest.fixture
+def no_table_reads(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('stage read from data_dir although a frame was given')
+
+    for module in (entity_extractor, llm_judge):
+        for name in ('read_table', 'read_columns', 'table_exists'):
+            monkeypatch.setattr(module, name, fail)
+
+@pytest.mark.parametrize('stage', [entity_extractor, llm_judge])
+def test_stages_use_the_given_frame_instead_of_data_dir(stage, tmp_path, no_table_reads):
+    output = stage.main(data_dir=str(tmp_path), enrichment_db=str(tmp_path / 'enrichment.db'),
+                        responses_df=responses())
+
+    assert output is not None
+    with open(output, encoding='utf-8') as f:
+        results = json.load(f)
+    assert results.get('total_texts', results.get('total_evaluated')) == 3
+
+def test_load_responses_reads_only_the_stage_columns(tmp_path):
+    wb = Workbook()
+    wb.active.title = 'Queries'
+    wb.active.append(['Queries'])
+    wb.active.append(['Where is my order?'])
+    sheet = wb.create_sheet('GenAI_responses')
+    sheet.append(['Customer Query', 'Bot Response', 'Category', 'notes'])
+    sheet.append(['Where is my order?', 'It ships tomorrow.', 'Shipping', 'long free text'])
+    wb.save(tmp_path / 'upload.xlsx')
+    prepare_data(str(tmp_path / 'upload.xlsx'), output_dir=str(tmp_path / 'data'))
+
+    df = app_module.load_responses(str(tmp_path / 'data'))
+
+    assert list(df.columns) == ['Customer Query', 'Bot Response', 'Category']
+    assert df.iloc[0].tolist() == ['Where is my order?', 'It ships tomorrow.', 'Shipping']
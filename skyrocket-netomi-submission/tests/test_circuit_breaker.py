@@ -0,0 +1,103 @@
+import logging
+import time
+import pytest
+from skyrocket.llm import backends
+from skyrocket.llm.backends import LLMBackend, LLMError, Completion
+from skyrocket.llm.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+class FakeBackend(LLMBackend):
+    name = 'fake'
+
+    def __init__(self, latency: float = 0.0, fail: bool = False):
+        super().__init__(max_retries=0)
+        self.latency = latency
+        self.fail = fail
+
+    def _complete_once(self, **kwargs):
+        time.sleep(self.latency)
+        if self.fail:
+            raise LLMError("provider down", status_code=503)
+        return Completion.from_dict({'choices': [{'message': {'content': 'ok'}}]})
+
+class SlowLimiter:
+    def __init__(self, wait: float):
+        self.wait = wait
+
+    def acquire(self, key, cost):
+        time.sleep(self.wait)
+        return 'lease'
+
+    def release(self, *args, **kwargs):
+        pass
+
+def make_breaker(**kwargs):
+    defaults = dict(window=4, min_calls=2, error_rate=0.5, slow_rate=0.5, latency_slo=0.05, open_seconds=0.1)
+    return CircuitBreaker('test', **{**defaults, **kwargs})
+
+def fail():
+    raise LLMError("boom", status_code=500)
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        with pytest.raises(LLMError):
+            breaker.call(fail)
+
+def test_opens_after_error_threshold_and_fails_fast(caplog):
+    breaker = make_breaker()
+    with caplog.at_level(logging.WARNING, logger='skyrocket.llm.circuit_breaker'):
+        trip(breaker)
+    assert breaker.state == OPEN
+    assert 'opened, using local fallback' in caplog.text
+
+    called = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: called.append(1))
+    assert called == []
+    assert breaker.status()['rejected'] == 1
+
+def test_half_open_probe_success_closes(caplog):
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.12)
+    assert breaker.state == HALF_OPEN
+
+    with caplog.at_level(logging.INFO, logger='skyrocket.llm.circuit_breaker'):
+        assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CLOSED
+    assert 'closed, provider recovered' in caplog.text
+
+def test_half_open_probe_failure_reopens():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.12)
+
+    with pytest.raises(LLMError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+    assert breaker.status()['times_opened'] == 2
+
+def test_half_open_admits_limited_probes():
+    breaker = make_breaker(half_open_probes=1)
+    trip(breaker)
+    time.sleep(0.12)
+
+    assert breaker.allow()
+    assert not breaker.allow()
+
+def test_slow_provider_opens_breaker():
+    breaker = make_breaker()
+    backend = FakeBackend(latency=0.08)
+    for _ in range(2):
+        breaker.call(backend.complete, model='m', messages=[])
+    assert breaker.state == OPEN
+
+def test_rate_limiter_wait_does_not_count_toward_latency(monkeypatch):
+    monkeypatch.setattr(backends, 'get_rate_limiter', lambda: SlowLimiter(wait=0.1))
+    breaker = make_breaker()
+    backend = FakeBackend(latency=0.0)
+
+    for _ in range(4):
+        breaker.call(backend.complete, model='m', messages=[])
+
+    assert breaker.state == CLOSED
+    assert breaker.status()['window_slow'] == 0
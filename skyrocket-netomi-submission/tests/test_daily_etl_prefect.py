@@ -0,0 +1,129 @@
+import sqlite3
+import contextvars
+from datetime import datetime
+from types import SimpleNamespace
+import pandas as pd
+from prefect import flow
+from skyrocket.pipelines import daily_etl_prefect as pipeline
+from skyrocket.pipelines.state_store import PipelineStateStore
+from skyrocket.utils import perf
+
+def context(task_name='Classify Topics'):
+    return SimpleNamespace(task=SimpleNamespace(name=task_name))
+
+def chunk():
+    return pd.DataFrame({'query_id': [1, 2], 'query_text': ['a', 'b'], 'timestamp': ['2024-01-01'] * 2})
+
+def test_cache_key_ignores_enrichment_db_contents(tmp_path):
+    db_path = str(tmp_path / 'enrichment.db')
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE t (v TEXT)")
+
+    before = pipeline.chunk_cache_key(context(), {'df': chunk(), 'enrichment_db': db_path})
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany("INSERT INTO t VALUES (?)", [(str(i),) for i in range(1000)])
+    after = pipeline.chunk_cache_key(context(), {'df': chunk(), 'enrichment_db': db_path})
+
+    assert before == after
+
+def test_cache_key_tracks_chunk_contents_and_stage_versions(monkeypatch, tmp_path):
+    params = {'df': chunk(), 'enrichment_db': str(tmp_path / 'enrichment.db')}
+    key = pipeline.chunk_cache_key(context(), params)
+
+    changed = chunk().assign(query_text=['a', 'c'])
+    assert pipeline.chunk_cache_key(context(), {**params, 'df': changed}) != key
+    assert pipeline.chunk_cache_key(context('Extract Entities'), params) != key
+
+    monkeypatch.setattr(pipeline, 'stage_versions', lambda: 'new-model')
+    assert pipeline.chunk_cache_key(context(), params) != key
+
+def processed(tmp_path, sources):
+    data_path = tmp_path / 'queries.csv'
+    pd.DataFrame({
+        'query_id': range(1, len(sources) + 1),
+        'query_text': [f"query {i}" for i in range(len(sources))],
+        'timestamp': [f"2024-01-0{i + 1}" for i in range(len(sources))]
+    }).to_csv(data_path, index=False)
+
+    state_db = str(tmp_path / 'state.db')
+    df = pipeline.extract_new_queries.fn(str(data_path), None, state_db)
+    return str(data_path), state_db, df.assign(topic_source=sources, entities_source='llm')
+
+def test_commit_watermark_skips_fallback_rows(tmp_path):
+    data_path, state_db, df = processed(tmp_path, ['llm', 'embedding_centroid', 'llm', 'llm'])
+    pipeline.commit_watermark.fn(df, state_db)
+
+    state = PipelineStateStore(state_db)
+    assert state.get_watermark(pipeline.PIPELINE_NAME) == datetime(2024, 1, 2)
+    assert state.seen_fingerprints(pipeline.PIPELINE_NAME, df['row_fingerprint']) == {
+        df['row_fingerprint'][2], df['row_fingerprint'][3]
+    }
+
+    rerun = pipeline.extract_new_queries.fn(data_path, state.get_watermark(pipeline.PIPELINE_NAME), state_db)
+    assert list(rerun['query_id']) == [2]
+
+def test_commit_watermark_advances_when_every_row_used_the_llm(tmp_path):
+    data_path, state_db, df = processed(tmp_path, ['llm'] * 3)
+    pipeline.commit_watermark.fn(df, state_db)
+
+    state = PipelineStateStore(state_db)
+    assert state.get_watermark(pipeline.PIPELINE_NAME) == datetime(2024, 1, 3)
+    assert pipeline.extract_new_queries.fn(data_path, state.get_watermark(pipeline.PIPELINE_NAME), state_db).empty
+
+def worker_stage(name):
+    def compute(df):
+        with perf.stage(name, rows_in=len(df)):
+            return df.assign(**{name: True})
+    return compute
+
+def test_worker_stage_reports_reach_the_flow_recorder():
+    df = pd.DataFrame({'query_text': ['a', 'b', 'c']})
+
+    def flow_side():
+        recorder = perf.start_run('test')
+        classified = contextvars.Context().run(pipeline.run_chunk_stage, worker_stage('classify'), df)
+        evaluated = contextvars.Context().run(pipeline.run_chunk_stage, worker_stage('evaluate'), classified)
+        assert [s.name for s in evaluated.attrs[pipeline.PERF_STAGES_ATTR]] == ['classify', 'evaluate']
+
+        stale = perf.StageReport('classify', calls=1, first_start=recorder.started_counter - 60,
+                                 last_end=recorder.started_counter - 59)
+        stale_chunk = df.copy()
+        stale_chunk.attrs[pipeline.PERF_STAGES_ATTR] = [stale]
+
+        merged = pipeline.merge_chunks.fn([evaluated, evaluated.copy(), stale_chunk])
+        return merged, recorder
+    merged, recorder = contextvars.Context().run(flow_side)
+
+    assert pipeline.PERF_STAGES_ATTR not in merged.attrs
+    assert recorder.stages['classify'].calls == 2
+    assert recorder.stages['classify'].rows_in == 6
+    assert recorder.stages['evaluate'].calls == 2
+
+def test_chunk_stages_record_in_place_when_the_flow_recorder_is_visible():
+    def flow_side():
+        recorder = perf.start_run('test')
+        result = pipeline.run_chunk_stage(worker_stage('classify'), pd.DataFrame({'query_text': ['a']}))
+        return result, recorder
+    result, recorder = contextvars.Context().run(flow_side)
+
+    assert pipeline.PERF_STAGES_ATTR not in result.attrs
+    assert recorder.stages['classify'].calls == 1
+
+def test_degraded_chunks_are_recomputed_on_rerun(tmp_path, monkeypatch):
+    topics_path = tmp_path / 'topics.json'
+    topics_path.write_text('{"topics": [{"topic_name": "Billing", "description": "Charges", "representative_queries": ["refund"]}]}')
+    sources = iter(['embedding_centroid', 'llm', 'llm'])
+    calls = []
+
+    def classify(df, classifier, store=None):
+        calls.append(len(df))
+        return df.assign(topic='Billing', topic_source=next(sources))
+    monkeypatch.setattr(pipeline, 'classify_frame', classify)
+
+    @flow
+    def rerun():
+        df = pd.DataFrame({'query_id': [1], 'query_text': [f"refund for {tmp_path.name}"]})
+        return [pipeline.classify_topics(df, str(topics_path))['topic_source'][0] for _ in range(3)]
+
+    assert rerun() == ['embedding_centroid', 'llm', 'llm']
+    assert len(calls) == 2
@@ -0,0 +1,79 @@
+import sqlite3
+import pandas as pd
+import pytest
+from skyrocket.data.enrichment_store import EnrichmentStore, content_hashes
+
+@pytest.fixture
+def store(tmp_path):
+    return EnrichmentStore(str(tmp_path / 'enrichment.db'))
+
+def frame(queries):
+    df = pd.DataFrame({'query_text': queries})
+    return df.assign(content_hash=content_hashes(df, 'query_text'))
+
+def classify(calls, source='llm'):
+    def compute(missing):
+        calls.append(list(missing['query_text']))
+        return missing.assign(topic=[q.upper() for q in missing['query_text']], topic_source=source)
+    return compute
+
+def test_reuses_rows_for_the_same_version(store):
+    calls = []
+    first = store.enrich(frame(['a', 'b']), 'topic', 'v1', classify(calls))
+    second = store.enrich(frame(['b', 'a', 'c']), 'topic', 'v1', classify(calls))
+
+    assert calls == [['a', 'b'], ['c']]
+    assert list(first['topic']) == ['A', 'B']
+    assert list(second['topic']) == ['B', 'A', 'C']
+    assert list(second['topic_source']) == ['llm'] * 3
+
+def test_version_change_invalidates_rows(store):
+    calls = []
+    store.enrich(frame(['a', 'b']), 'topic', 'v1', classify(calls))
+    store.enrich(frame(['a', 'b']), 'topic', 'v2', classify(calls))
+    store.enrich(frame(['a', 'b']), 'topic', 'v2', classify(calls))
+
+    assert calls == [['a', 'b'], ['a', 'b']]
+
+def test_stages_are_versioned_independently(store):
+    calls = []
+    store.enrich(frame(['a']), 'topic', 'v1', classify(calls))
+    store.enrich(
+        frame(['a']), 'entities', 'e1',
+        lambda missing: missing.assign(entities=[{'EMAIL': ['x@y.z']}], entities_source='llm')
+    )
+
+    assert store.enrich(frame(['a']), 'topic', 'v1', classify(calls))['topic'].tolist() == ['A']
+    assert calls == [['a']]
+    assert store.stats() == {'rows': 1, 'topic': 1, 'entities': 1, 'judge': 0}
+
+def test_fallback_rows_are_returned_but_not_persisted(store):
+    calls = []
+    degraded = store.enrich(frame(['a', 'b']), 'topic', 'v1', classify(calls, source='embedding_centroid'))
+    assert list(degraded['topic']) == ['A', 'B']
+    assert list(degraded['topic_source']) == ['embedding_centroid'] * 2
+    assert store.stats()['topic'] == 0
+
+    recovered = store.enrich(frame(['a', 'b']), 'topic', 'v1', classify(calls))
+    assert calls == [['a', 'b'], ['a', 'b']]
+    assert list(recovered['topic_source']) == ['llm', 'llm']
+
+def test_missing_source_column_defaults_to_llm(store):
+    result = store.enrich(frame(['a']), 'topic', 'v1', lambda missing: missing.assign(topic='A'))
+    assert result['topic_source'].tolist() == ['llm']
+    assert store.stats()['topic'] == 1
+
+def test_migrates_databases_without_source_columns(tmp_path):
+    db_path = str(tmp_path / 'legacy.db')
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE enrichments (content_hash TEXT PRIMARY KEY, topic TEXT, topic_version TEXT, "
+            "updated_at TEXT NOT NULL) WITHOUT ROWID"
+        )
+        df = frame(['a'])
+        conn.execute("INSERT INTO enrichments VALUES (?, ?, 'v1', 'now')", (df['content_hash'][0], '"A"'))
+
+    store = EnrichmentStore(db_path)
+    result = store.enrich(frame(['a']), 'topic', 'v1', classify([]))
+    assert result['topic'].tolist() == ['A']
+    assert result['topic_source'].tolist() == ['llm']
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+import httpx
+import app as app_module
+
+class FakeJobManager:
+    def __init__(self, queued_ticks: int):
+        self.job = SimpleNamespace(id='job-1', status='queued', error=None)
+        self.queued_ticks = queued_ticks
+        self.ticks = 0
+        self.threads = set()
+
+    def get(self, job_id):
+        return self.job if job_id == self.job.id else None
+
+    def status(self, job):
+        self.threads.add(threading.current_thread().name)
+        self.ticks += 1
+        if self.ticks > self.queued_ticks:
+            job.status = 'completed'
+        return {
+            'job_id': job.id,
+            'status': job.status,
+            'progress': 0,
+            'current_step': None,
+            'queue_position': 1,
+            'estimated_wait_seconds': 120.0 - self.ticks * 0.5
+        }
+
+def read_events(monkeypatch, manager):
+    monkeypatch.setattr(app_module, 'job_manager', manager)
+    monkeypatch.setattr(app_module, 'SSE_POLL_SECONDS', 0.01)
+    monkeypatch.setattr(app_module, 'SSE_KEEPALIVE_SECONDS', 0.05)
+
+    async def fetch():
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            response = await client.get('/api/jobs/job-1/events')
+            return response.text
+
+    return asyncio.run(fetch())
+
+def test_eta_changes_alone_do_not_emit_progress_events(monkeypatch):
+    manager = FakeJobManager(queued_ticks=20)
+    text = read_events(monkeypatch, manager)
+
+    assert text.count('event: progress') == 2
+    assert ': keep-alive' in text
+    assert 'event: finished' in text
+
+def test_job_state_is_read_off_the_event_loop(monkeypatch):
+    manager = FakeJobManager(queued_ticks=2)
+    read_events(monkeypatch, manager)
+
+    assert threading.main_thread().name not in manager.threads
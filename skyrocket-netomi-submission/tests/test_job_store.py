@@ -0,0 +1,157 @@
+import sqlite3
+import threading
+import time
+import pytest
+from job_store import JobStore
+from jobs import JobManager
+
+def alive(pid):
+    return True
+
+def job_row(job_id, status='queued', content_hash=None, created_at=None, work_dir='/tmp/none', owner_pid=None):
+    return {'id': job_id, 'filename': f"{job_id}.xlsx", 'work_dir': work_dir, 'content_hash': content_hash,
+            'status': status, 'created_at': created_at if created_at is not None else time.time(),
+            'owner_pid': owner_pid}
+
+def test_claims_queued_jobs_oldest_first_up_to_the_running_limit(tmp_path):
+    store = JobStore(tmp_path / 'jobs.db')
+    for i, job_id in enumerate(['b', 'a', 'c']):
+        store.insert(job_row(job_id, created_at=100 + i))
+
+    first = store.claim_next(max_running=2, owner_pid=42)
+    second = store.claim_next(max_running=2, owner_pid=42)
+
+    assert (first['id'], second['id']) == ('b', 'a')
+    assert first['status'] == 'processing' and first['owner_pid'] == 42
+    assert store.claim_next(max_running=2, owner_pid=42) is None
+    assert store.queued_ids() == ['c']
+
+    store.update('b', status='completed')
+    assert store.claim_next(max_running=2, owner_pid=42)['id'] == 'c'
+    assert store.claim_next(max_running=2, owner_pid=42) is None
+
+def test_concurrent_claims_never_hand_out_a_job_twice(tmp_path):
+    store = JobStore(tmp_path / 'jobs.db')
+    for i in range(20):
+        store.insert(job_row(f"job-{i:02d}", created_at=i))
+
+    claimed = []
+    lock = threading.Lock()
+
+    def claim():
+        while True:
+            row = store.claim_next(max_running=100, owner_pid=1)
+            if row is None:
+                return
+            with lock:
+                claimed.append(row['id'])
+
+    threads = [threading.Thread(target=claim) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == [f"job-{i:02d}" for i in range(20)]
+
+def test_fail_orphaned_marks_jobs_of_dead_owners(tmp_path):
+    store = JobStore(tmp_path / 'jobs.db')
+    store.insert(job_row('alive'))
+    store.insert(job_row('dead'))
+    store.claim_next(max_running=5, owner_pid=1)
+    store.claim_next(max_running=5, owner_pid=2)
+
+    assert store.fail_orphaned(lambda pid: pid == 1) == 1
+    assert store.get('dead')['status'] == 'error'
+    assert store.get('alive')['status'] == 'processing'
+
+def test_fail_orphaned_reaps_pending_uploads_of_dead_owners(tmp_path):
+    store = JobStore(tmp_path / 'jobs.db')
+    store.insert(job_row('receiving', status='pending', owner_pid=1))
+    store.insert(job_row('abandoned', status='pending', owner_pid=2))
+    store.insert(job_row('unowned', status='pending'))
+
+    assert store.fail_orphaned(lambda pid: pid == 1) == 2
+    assert store.get('receiving')['status'] == 'pending'
+    assert store.get('abandoned')['status'] == 'error'
+    assert store.get('unowned')['status'] == 'error'
+
+def test_pending_upload_is_only_reused_while_its_owner_is_alive(tmp_path):
+    store = JobStore(tmp_path / 'jobs.db')
+    store.insert(job_row('receiving', status='pending', content_hash='h', owner_pid=1))
+
+    existing = store.insert_unless_duplicate(job_row('again', content_hash='h', owner_pid=3),
+                                             has_results=lambda row: True, is_alive=lambda pid: pid == 1)
+    assert existing['id'] == 'receiving'
+
+    existing = store.insert_unless_duplicate(job_row('retry', content_hash='h', owner_pid=3),
+                                             has_results=lambda row: True, is_alive=lambda pid: pid == 3)
+    assert existing is None
+    assert store.get('receiving')['status'] == 'error'
+    assert store.get('retry')['owner_pid'] == 3
+
+def test_duplicate_upload_reuses_the_latest_live_job(tmp_path):
+    store = JobStore(tmp_path / 'jobs.db')
+    store.insert(job_row('failed', status='error', content_hash='h', created_at=3))
+    store.insert(job_row('done', status='completed', content_hash='h', created_at=2))
+
+    existing = store.insert_unless_duplicate(job_row('new', content_hash='h'), has_results=lambda row: True, is_alive=alive)
+
+    assert existing['id'] == 'done'
+    assert store.get('new') is None
+    assert store.insert_unless_duplicate(job_row('other', content_hash='x'),
+                                         has_results=lambda row: True, is_alive=alive) is None
+    assert store.get('other') is not None
+
+def test_completed_job_without_results_is_not_reused(tmp_path):
+    store = JobStore(tmp_path / 'jobs.db')
+    store.insert(job_row('lost', status='completed', content_hash='h', created_at=2))
+    store.insert(job_row('older', status='completed', content_hash='h', created_at=1))
+
+    existing = store.insert_unless_duplicate(job_row('new', content_hash='h'),
+                                             has_results=lambda row: row['id'] == 'older', is_alive=alive)
+    assert existing['id'] == 'older'
+    assert store.get('lost')['status'] == 'error'
+
+    assert store.insert_unless_duplicate(job_row('newer', content_hash='h'),
+                                         has_results=lambda row: False, is_alive=alive) is None
+    assert store.get('newer')['status'] == 'queued'
+
+def test_job_manager_reruns_uploads_whose_results_were_deleted(tmp_path):
+    manager = JobManager(tmp_path / 'jobs', max_workers=1)
+    job, created = manager.get_or_create('data.xlsx', 'hash')
+    assert created
+    manager.store.update(job.id, status='completed')
+
+    job.results_path.write_text('{}')
+    reused, created = manager.get_or_create('data.xlsx', 'hash')
+    assert not created and reused.id == job.id
+
+    job.results_path.unlink()
+    fresh, created = manager.get_or_create('data.xlsx', 'hash')
+    assert created and fresh.id != job.id
+    manager.executor.shutdown()
+
+def test_connections_are_closed_after_each_call(tmp_path, monkeypatch):
+    store = JobStore(tmp_path / 'jobs.db')
+    opened = []
+    connect = store._connect
+
+    def tracking_connect():
+        conn = connect()
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(store, '_connect', tracking_connect)
+    store.insert(job_row('a', content_hash='h'))
+    store.update('a', progress=10)
+    store.get('a')
+    store.list()
+    store.queued_ids()
+    store.claim_next(max_running=1, owner_pid=1)
+    store.insert_unless_duplicate(job_row('b', content_hash='h'), has_results=lambda row: True, is_alive=alive)
+
+    assert len(opened) == 7
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
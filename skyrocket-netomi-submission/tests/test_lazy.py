@@ -0,0 +1,9 @@
+import pickle
+from skyrocket.utils.lazy import lazy_import
+
+def test_lazy_module_pickles_by_name_without_importing():
+    module = lazy_import('json')
+    restored = pickle.loads(pickle.dumps(module))
+
+    assert not module.loaded and not restored.loaded
+    assert restored.dumps([1]) == '[1]'
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from skyrocket.core.llm_judge import JudgeMetrics
+
+def judged_frame():
+    rng = np.random.default_rng(3)
+    n = 41
+    df = pd.DataFrame({
+        'accuracy': rng.integers(1, 6, n).astype(float),
+        'empathy': rng.integers(1, 6, n).astype(float),
+        'completeness': rng.integers(1, 6, n).astype(float),
+        'hallucination': rng.random(n) < 0.2,
+        'escalation_needed': rng.random(n) < 0.3,
+        'bias': rng.random(n) < 0.05,
+    })
+    df['overall_quality'] = df[['accuracy', 'empathy', 'completeness']].mean(axis=1)
+    df.loc[[4, 17, 30], 'accuracy'] = np.nan
+    df.loc[9, 'overall_quality'] = np.nan
+    return df
+
+@pytest.mark.parametrize('split', [1, 13, 20, 40])
+def test_merged_halves_match_pandas(split):
+    df = judged_frame()
+    metrics = JudgeMetrics.from_frame(df.iloc[:split]).merge(JudgeMetrics.from_frame(df.iloc[split:]))
+
+    for col in ('accuracy', 'empathy', 'completeness', 'overall_quality'):
+        assert metrics.mean(col) == pytest.approx(pd.Series(df[col]).mean())
+        assert metrics.std(col) == pytest.approx(pd.Series(df[col]).std())
+
+def test_chunked_updates_match_a_single_pass():
+    df = judged_frame()
+    chunked = JudgeMetrics()
+    for start in range(0, len(df), 7):
+        part = df.iloc[start:start + 7]
+        chunked.update({c: part[c].to_numpy() for c in part.columns})
+
+    expected = JudgeMetrics.from_frame(df).to_dict()
+    actual = chunked.to_dict()
+    assert actual.pop('quality_distribution') == expected.pop('quality_distribution')
+    assert actual == pytest.approx(expected)
+
+def test_to_dict_matches_pandas():
+    df = judged_frame()
+    summary = JudgeMetrics.from_frame(df).to_dict()
+    quality = df['overall_quality'].dropna()
+
+    assert summary['total_evaluated'] == len(df)
+    assert summary['avg_accuracy'] == pytest.approx(df['accuracy'].mean())
+    assert summary['avg_overall_quality'] == pytest.approx(quality.mean())
+    assert summary['hallucination_rate'] == pytest.approx(df['hallucination'].mean() * 100)
+    assert summary['containment_rate'] == pytest.approx((1 - df['escalation_needed'].mean()) * 100)
+    assert summary['bias_rate'] == pytest.approx(df['bias'].mean() * 100)
+    assert summary['quality_distribution'] == {
+        'excellent': int((quality >= 4.0).sum()),
+        'good': int(((quality >= 3.0) & (quality < 4.0)).sum()),
+        'poor': int((quality < 3.0).sum()),
+    }
+
+def test_std_needs_two_finite_scores():
+    metrics = JudgeMetrics.from_columns({'accuracy': np.array([4.0, np.nan, np.inf])})
+
+    assert metrics.mean('accuracy') == 4.0
+    assert np.isnan(metrics.std('accuracy'))
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+import pytest
+import app as app_module
+import metrics
+from jobs import JobManager
+
+def gauge(name):
+    return metrics.REGISTRY.get_sample_value(name)
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_queue_and_running_gauges_with_one_worker(tmp_path, monkeypatch):
+    release = threading.Event()
+    started = []
+
+    def analysis(job):
+        started.append(job.id)
+        release.wait(5)
+        job.update(status='completed')
+
+    monkeypatch.setattr(app_module, 'run_analysis_sync', analysis)
+    manager = JobManager(tmp_path / 'jobs', max_workers=1, on_queue_change=metrics.ANALYSIS_QUEUED.set)
+    manager.start(app_module.run_job)
+    running_before = gauge('skyrocket_analysis_in_progress')
+
+    for name in ('a.xlsx', 'b.xlsx'):
+        manager.submit(manager.create(name))
+
+    assert wait_for(lambda: len(started) == 1)
+    assert wait_for(lambda: gauge('skyrocket_analysis_queued') == 1)
+    assert gauge('skyrocket_analysis_in_progress') == running_before + 1
+
+    release.set()
+    assert wait_for(lambda: len(started) == 2)
+    assert wait_for(lambda: gauge('skyrocket_analysis_in_progress') == running_before)
+    assert gauge('skyrocket_analysis_queued') == 0
+    manager.executor.shutdown(wait=True)
+
+def test_metrics_aggregate_across_worker_processes(tmp_path, monkeypatch):
+    backend = Path(__file__).resolve().parents[1] / 'webapp' / 'backend'
+    env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': str(tmp_path),
+           'PYTHONPATH': os.pathsep.join([str(backend), os.environ.get('PYTHONPATH', '')])}
+    worker = "import metrics; metrics.ANALYSIS_RUNS.labels(status='completed').inc()"
+    for _ in range(2):
+        subprocess.run([sys.executable, '-c', worker], env=env, check=True)
+
+    monkeypatch.setattr(metrics, 'MULTIPROC_DIR', str(tmp_path))
+    payload, _ = metrics.render_metrics()
+    assert 'skyrocket_analysis_runs_total{status="completed"} 2.0' in payload.decode()
+
+def test_several_workers_need_a_multiprocess_dir(monkeypatch):
+    monkeypatch.setattr(metrics, 'MULTIPROC_DIR', None)
+    metrics.check_worker_setup(1)
+    with pytest.raises(RuntimeError, match='PROMETHEUS_MULTIPROC_DIR'):
+        metrics.check_worker_setup(2)
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import pytest
+from skyrocket.utils.microbatch import MicroBatcher
+
+def test_concurrent_submits_coalesce_into_one_batch():
+    calls = []
+
+    def process(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=8, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        return batcher, results
+
+    batcher, results = asyncio.run(run())
+    assert results == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2, 3, 4]]
+    assert batcher.stats.batches == 1 and batcher.stats.max_batch == 5
+    assert not batcher._tasks
+
+def test_full_batches_flush_without_waiting_for_the_timer():
+    sizes = []
+
+    def process(items):
+        sizes.append(len(items))
+        return items
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=10_000)
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(8))), timeout=5)
+
+    assert asyncio.run(run()) == list(range(8))
+    assert sizes == [4, 4]
+
+def failing_batch(items):
+    raise ValueError("provider down")
+
+def short_batch(items):
+    return items[:-1]
+
+@pytest.mark.parametrize('process', [failing_batch, short_batch])
+def test_batch_failure_resolves_every_future_with_the_error(process):
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=8, max_wait_ms=5)
+        return batcher, await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    batcher, results = asyncio.run(run())
+    assert len(results) == 3 and all(isinstance(r, Exception) for r in results)
+    assert len({id(r) for r in results}) == 1
+    assert not batcher._tasks
+
+def test_in_flight_batches_are_held_until_they_finish():
+    release = threading.Event()
+
+    def process(items):
+        release.wait(5)
+        return items
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=2, max_wait_ms=5)
+        pending = asyncio.gather(batcher.submit('a'), batcher.submit('b'))
+        await asyncio.sleep(0.05)
+        held = len(batcher._tasks)
+        release.set()
+        return held, await pending, len(batcher._tasks)
+
+    assert asyncio.run(run()) == (1, ['a', 'b'], 0)
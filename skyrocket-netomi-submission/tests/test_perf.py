@@ -0,0 +1,70 @@
+import contextvars
+import threading
+import time
+import pandas as pd
+from skyrocket.pipelines.streaming import StreamingPipeline, StreamingStage
+from skyrocket.utils import perf
+
+def samplers():
+    return [t for t in threading.enumerate() if t.name.startswith('perf-rss-')]
+
+def in_fresh_context(fn):
+    return contextvars.Context().run(fn)
+
+def test_concurrent_stages_share_one_rss_sampler():
+    def run():
+        recorder = perf.start_run('sampler')
+        barrier = threading.Barrier(6)
+        counts = []
+
+        def work():
+            with perf.stage('work', rows_in=1):
+                barrier.wait()
+                time.sleep(3 * perf.RSS_SAMPLE_INTERVAL)
+                counts.append(len(samplers()))
+
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(work,)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return recorder, counts
+
+    recorder, counts = in_fresh_context(run)
+    assert max(counts) == 1
+    assert recorder.stages['work'].calls == 6
+    assert recorder.stages['work'].peak_rss_bytes > 0
+
+    deadline = time.time() + 2
+    while samplers() and time.time() < deadline:
+        time.sleep(perf.RSS_SAMPLE_INTERVAL)
+    assert not samplers()
+
+def test_recorder_does_not_leak_into_unrelated_threads():
+    def run():
+        recorder = perf.start_run('scoped')
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(perf.get_recorder()))
+        thread.start()
+        thread.join()
+        return recorder, seen
+
+    recorder, seen = in_fresh_context(run)
+    assert seen == [None]
+    assert in_fresh_context(perf.get_recorder) is None
+
+def test_streaming_workers_record_into_the_callers_recorder():
+    def classify(batch):
+        with perf.stage('classify', rows_in=len(batch)):
+            return batch
+
+    def run():
+        recorder = perf.start_run('streaming')
+        pipeline = StreamingPipeline([StreamingStage('classify', classify, workers=3)], batch_size=2)
+        result = pipeline.run(pd.DataFrame({'query_text': list('abcdefg')}))
+        return recorder, result
+
+    recorder, result = in_fresh_context(run)
+    assert list(result['query_text']) == list('abcdefg')
+    assert recorder.stages['classify'].calls == 4
+    assert recorder.stages['classify'].rows_in == 7
@@ -0,0 +1,67 @@
+from datetime import datetime
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from skyrocket.data.prepare_data import prepare_data
+
+def workbook(path, responses):
+    wb = Workbook()
+    queries = wb.active
+    queries.title = 'Queries'
+    queries.append(['Queries', 'timestamp', 'turns'])
+    for i in range(5):
+        queries.append([f"query {i}", datetime(2024, 1, i + 1, 9, 30), i])
+
+    sheet = wb.create_sheet('GenAI_responses')
+    sheet.append(['query', 'response', 'category', 'score'])
+    for row in responses:
+        sheet.append(row)
+    wb.save(path)
+    return str(path)
+
+def test_sheets_are_written_with_inferred_types(tmp_path):
+    path = workbook(tmp_path / 'data.xlsx', [
+        ['q1', 'r1', 'Billing', 4.5],
+        ['q2', 'r2', None, 3],
+        ['q3', 'r3', 7, None],
+    ])
+    outputs = prepare_data(path, output_dir=str(tmp_path / 'out'), chunk_size=2)
+
+    assert outputs['Queries']['rows'] == 5
+    assert outputs['GenAI_responses']['rows'] == 3
+
+    queries = pq.read_table(outputs['Queries']['parquet_path'])
+    assert queries.schema.field('Queries').type == pa.string()
+    assert queries.schema.field('timestamp').type == pa.timestamp('us')
+    assert queries.schema.field('turns').type == pa.int64()
+    assert queries.column('timestamp')[4].as_py() == datetime(2024, 1, 5, 9, 30)
+
+    responses = pq.read_table(outputs['GenAI_responses']['parquet_path'])
+    assert responses.schema.field('score').type == pa.float64()
+    assert responses.column('category').to_pylist() == ['Billing', None, '7']
+
+def test_later_chunks_widen_column_types_and_keep_earlier_rows(tmp_path):
+    path = workbook(tmp_path / 'data.xlsx', [
+        ['q1', 'r1', 'Billing', 4],
+        ['q2', 'r2', 5, 3],
+        ['q3', 'r3', 'Travel', 2.5],
+        ['q4', 'r4', 'Travel', 'n/a'],
+        ['q5', 'r5', None, 1],
+    ])
+    out_dir = tmp_path / 'out'
+    outputs = prepare_data(path, output_dir=str(out_dir), chunk_size=1)
+
+    responses = pq.read_table(outputs['GenAI_responses']['parquet_path'])
+    assert responses.schema.field('score').type == pa.string()
+    assert responses.column('score').to_pylist() == ['4', '3', '2.5', 'n/a', '1']
+    assert responses.column('category').to_pylist() == ['Billing', '5', 'Travel', 'Travel', None]
+    assert outputs['GenAI_responses']['rows'] == 5
+    assert not list(out_dir.glob('*.tmp'))
+
+def test_int_columns_widen_to_float_when_a_decimal_appears(tmp_path):
+    path = workbook(tmp_path / 'data.xlsx', [['q1', 'r1', 'A', 1], ['q2', 'r2', 'B', 2], ['q3', 'r3', 'C', 2.5]])
+    outputs = prepare_data(path, output_dir=str(tmp_path / 'out'), chunk_size=2)
+
+    responses = pq.read_table(outputs['GenAI_responses']['parquet_path'])
+    assert responses.schema.field('score').type == pa.float64()
+    assert responses.column('score').to_pylist() == [1.0, 2.0, 2.5]
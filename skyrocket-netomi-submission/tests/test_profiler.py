@@ -0,0 +1,103 @@
+from collections import Counter
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from skyrocket.data.profiler import DatasetProfile, HeavyHitters, HyperLogLog, QuantileSketch, combine_profiles
+
+@pytest.mark.parametrize('cardinality', [50, 5_000, 200_000])
+def test_hyperloglog_estimate_is_within_three_standard_errors(cardinality):
+    sketch = HyperLogLog()
+    values = pd.Series([f"query-{i}" for i in range(cardinality)])
+    for start in range(0, cardinality, 50_000):
+        sketch.update(pd.concat([values.iloc[start:start + 50_000]] * 2))
+
+    tolerance = 3 * 1.04 / np.sqrt(sketch.m)
+    assert abs(sketch.estimate() - cardinality) <= max(tolerance * cardinality, 1)
+
+def test_quantiles_stay_within_the_relative_accuracy():
+    rng = np.random.default_rng(7)
+    values = np.concatenate([rng.lognormal(5, 1.2, 20_000), np.zeros(500)])
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for chunk in np.array_split(values, 7):
+        sketch.update(pd.Series(chunk))
+
+    ordered = np.sort(values)
+    for q in (0.0, 0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+        expected = ordered[int(q * (len(ordered) - 1))]
+        assert sketch.quantile(q) == pytest.approx(expected, rel=0.01 + 1e-9, abs=1e-9)
+    assert sketch.min == ordered[0] and sketch.max == ordered[-1]
+    assert sketch.mean == pytest.approx(values.mean())
+
+def zipf_stream(seed: int, size: int) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series(rng.zipf(1.3, size) % 500).map(lambda v: f"category-{v}")
+
+def assert_misra_gries(sketch: HeavyHitters, stream: pd.Series):
+    truth = Counter(stream)
+    slack = sketch.count / (sketch.capacity + 1)
+    for value, count in truth.items():
+        estimate = sketch.counters.get(value, 0)
+        assert count - slack <= estimate <= count
+        if count > slack:
+            assert value in sketch.counters
+
+def test_heavy_hitters_keep_the_misra_gries_bound():
+    stream = zipf_stream(1, 30_000)
+    sketch = HeavyHitters(capacity=16)
+    for start in range(0, len(stream), 3_500):
+        sketch.update(stream.iloc[start:start + 3_500])
+
+    assert sketch.count == len(stream)
+    assert len(sketch.counters) <= sketch.capacity
+    assert_misra_gries(sketch, stream)
+
+def test_merged_heavy_hitters_keep_the_bound_in_any_grouping():
+    days = [zipf_stream(seed, 10_000) for seed in (2, 3, 4)]
+    a, b, c = (HeavyHitters(capacity=16).update(day) for day in days)
+    stream = pd.concat(days)
+
+    left, right = a.merge(b).merge(c), a.merge(b.merge(c))
+    for merged in (left, right):
+        assert merged.count == len(stream)
+        assert_misra_gries(merged, stream)
+    assert [value for value, _ in left.top(5)] == [value for value, _ in right.top(5)]
+
+def daily_frame(seed: int, rows: int = 3_000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    queries = pd.Series([f"query-{v}" for v in rng.integers(0, 4_000, rows)])
+    queries[rng.random(rows) < 0.02] = None
+    return pd.DataFrame({
+        'Queries': queries,
+        'category': zipf_stream(seed, rows),
+        'response': ['x' * int(n) for n in rng.lognormal(4, 0.8, rows)]
+    })
+
+def profile(frame: pd.DataFrame) -> DatasetProfile:
+    return DatasetProfile('responses', distinct_columns=['Queries'], heavy_hitter_columns=['category'],
+                          length_columns=['response']).update(frame)
+
+def test_daily_profiles_combine_associatively(tmp_path):
+    frames = [daily_frame(seed) for seed in (10, 11, 12)]
+    for day, frame in enumerate(frames, 1):
+        profile(frame).save(str(tmp_path), timestamp=datetime(2024, 3, day, 23, 0))
+    profile(daily_frame(13)).save(str(tmp_path), timestamp=datetime(2024, 3, 9))
+
+    combined = combine_profiles(str(tmp_path), 'responses', datetime(2024, 3, 1), datetime(2024, 3, 3))
+    a, b, c = (profile(frame) for frame in frames)
+    regrouped = a.merge(b.merge(c))
+    whole = profile(pd.concat(frames, ignore_index=True))
+
+    for merged in (combined, regrouped):
+        assert merged.row_count == whole.row_count == 9_000
+        assert merged.null_counts == whole.null_counts
+        assert np.array_equal(merged.distinct['Queries'].registers, whole.distinct['Queries'].registers)
+        assert merged.lengths['response'].bins == whole.lengths['response'].bins
+        assert merged.lengths['response'].quantile(0.5) == whole.lengths['response'].quantile(0.5)
+        assert merged.heavy_hitters['category'].count == whole.heavy_hitters['category'].count
+    assert combined.distinct_count('Queries') == regrouped.distinct_count('Queries')
+    assert combined.heavy_hitters['category'].top(3) == regrouped.heavy_hitters['category'].top(3)
+
+def test_combine_profiles_returns_none_outside_the_range(tmp_path):
+    profile(daily_frame(20, rows=100)).save(str(tmp_path), timestamp=datetime(2024, 3, 1))
+    assert combine_profiles(str(tmp_path), 'responses', datetime(2024, 4, 1), datetime(2024, 4, 30)) is None
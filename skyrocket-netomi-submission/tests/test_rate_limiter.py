@@ -0,0 +1,113 @@
+import sqlite3
+import multiprocessing
+import pytest
+from skyrocket.llm import rate_limiter
+from skyrocket.llm.rate_limiter import RateLimiter, estimate_tokens
+
+KEY = 'groq:test-model'
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'limits.db')
+
+def test_request_bucket_blocks_when_empty(db_path):
+    limiter = RateLimiter(db_path, rpm=2, tpm=0, max_concurrency=0)
+    assert limiter._try_acquire(KEY, 10)[0] is not None
+    assert limiter._try_acquire(KEY, 10)[0] is not None
+
+    lease_id, wait = limiter._try_acquire(KEY, 10)
+    assert lease_id is None
+    assert 0 < wait <= 30.0
+
+def test_token_bucket_reconciles_reported_usage(db_path):
+    limiter = RateLimiter(db_path, rpm=0, tpm=1000, max_concurrency=0)
+    lease_id, _ = limiter._try_acquire(KEY, 800)
+    assert limiter._try_acquire(KEY, 800)[0] is None
+
+    limiter.release(KEY, lease_id, 800, used_tokens=100)
+    assert limiter._try_acquire(KEY, 800)[0] is not None
+
+def test_buckets_are_shared_between_instances(db_path):
+    first = RateLimiter(db_path, rpm=1, tpm=0, max_concurrency=0)
+    second = RateLimiter(db_path, rpm=1, tpm=0, max_concurrency=0)
+    assert first._try_acquire(KEY, 1)[0] is not None
+    assert second._try_acquire(KEY, 1)[0] is None
+
+def _acquire_in_child(db_path, results):
+    limiter = RateLimiter(db_path, rpm=3, tpm=0, max_concurrency=0)
+    results.put(limiter._try_acquire(KEY, 1)[0] is not None)
+
+def test_buckets_are_shared_between_processes(db_path):
+    RateLimiter(db_path, rpm=3, tpm=0, max_concurrency=0)
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_acquire_in_child, args=(db_path, results)) for _ in range(5)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+
+    granted = [results.get(timeout=5) for _ in workers]
+    assert sum(granted) == 3
+
+def test_concurrency_window_limits_leases(db_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'INITIAL_CONCURRENCY', 2.0)
+    limiter = RateLimiter(db_path, rpm=0, tpm=0, max_concurrency=8)
+    first, _ = limiter._try_acquire(KEY, 1)
+    assert limiter._try_acquire(KEY, 1)[0] is not None
+    assert limiter._try_acquire(KEY, 1)[0] is None
+
+    limiter.release(KEY, first, 1, latency=0.01)
+    assert limiter._try_acquire(KEY, 1)[0] is not None
+
+def test_expired_leases_are_pruned(db_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'INITIAL_CONCURRENCY', 1.0)
+    monkeypatch.setattr(rate_limiter, 'LEASE_SECONDS', -1.0)
+    limiter = RateLimiter(db_path, rpm=0, tpm=0, max_concurrency=4)
+    assert limiter._try_acquire(KEY, 1)[0] is not None
+    assert limiter._try_acquire(KEY, 1)[0] is not None
+
+def window(limiter):
+    return limiter.status()[KEY]['concurrency_window']
+
+def test_aimd_grows_additively_and_halves_on_rate_limit(db_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'INITIAL_CONCURRENCY', 2.0)
+    limiter = RateLimiter(db_path, rpm=0, tpm=0, max_concurrency=8, latency_target=10.0)
+
+    for _ in range(4):
+        lease_id, _ = limiter._try_acquire(KEY, 1)
+        limiter.release(KEY, lease_id, 1, latency=0.01)
+    grown = window(limiter)
+    assert 3.0 <= grown < 4.0
+
+    lease_id, _ = limiter._try_acquire(KEY, 1)
+    limiter.release(KEY, lease_id, 1, rate_limited=True, retry_after=5)
+    assert window(limiter) == pytest.approx(grown / 2, abs=0.01)
+    assert limiter.status()[KEY]['blocked_for_seconds'] > 4
+
+    lease_id, wait = limiter._try_acquire(KEY, 1)
+    assert lease_id is None and wait > 4
+
+def test_window_shrinks_on_slow_calls_and_respects_bounds(db_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'INITIAL_CONCURRENCY', 2.0)
+    limiter = RateLimiter(db_path, rpm=0, tpm=0, max_concurrency=2, latency_target=0.5)
+
+    lease_id, _ = limiter._try_acquire(KEY, 1)
+    limiter.release(KEY, lease_id, 1, latency=0.01)
+    assert window(limiter) == 2.0
+
+    for _ in range(10):
+        lease_id, _ = limiter._try_acquire(KEY, 1)
+        limiter.release(KEY, lease_id, 1, latency=1.0)
+    assert window(limiter) == rate_limiter.MIN_CONCURRENCY
+
+def test_state_survives_in_sqlite(db_path):
+    limiter = RateLimiter(db_path, rpm=5, tpm=0, max_concurrency=0)
+    limiter._try_acquire(KEY, 1)
+    with sqlite3.connect(db_path) as conn:
+        tokens = conn.execute("SELECT request_tokens FROM limits WHERE key = ?", (KEY,)).fetchone()[0]
+    assert tokens == pytest.approx(4.0, abs=0.01)
+
+def test_estimate_tokens_counts_prompt_and_completion():
+    messages = [{'role': 'user', 'content': 'x' * 400}]
+    assert estimate_tokens(messages, max_tokens=50) == 150
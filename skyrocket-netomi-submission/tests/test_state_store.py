@@ -0,0 +1,46 @@
+from datetime import datetime
+import pandas as pd
+from skyrocket.pipelines.state_store import PipelineStateStore, row_fingerprints
+
+PIPELINE = 'test_pipeline'
+
+def test_fingerprints_are_stable_and_content_based():
+    df = pd.DataFrame({'query_id': [1, 2], 'query_text': ['a', 'b']})
+    first = row_fingerprints(df)
+    assert list(first) == list(row_fingerprints(df.copy()))
+    assert first[0] != row_fingerprints(df.assign(query_text=['c', 'b']))[0]
+    assert list(row_fingerprints(df, ['query_id'])) != list(first)
+
+def test_commit_deduplicates_fingerprints(tmp_path):
+    state = PipelineStateStore(str(tmp_path / 'state.db'))
+    state.commit(PIPELINE, ['a', 'b'])
+    state.commit(PIPELINE, ['b', 'c'])
+
+    assert state.seen_fingerprints(PIPELINE, ['a', 'b', 'c', 'd']) == {'a', 'b', 'c'}
+    assert state.seen_fingerprints('other', ['a']) == set()
+
+def test_watermark_only_moves_forward(tmp_path):
+    state = PipelineStateStore(str(tmp_path / 'state.db'))
+    assert state.get_watermark(PIPELINE) is None
+
+    state.commit(PIPELINE, [], watermark=datetime(2024, 1, 10))
+    state.commit(PIPELINE, [], watermark=datetime(2024, 1, 5))
+    assert state.get_watermark(PIPELINE) == datetime(2024, 1, 10)
+
+def test_advancing_watermark_prunes_older_fingerprints(tmp_path):
+    state = PipelineStateStore(str(tmp_path / 'state.db'))
+    state.commit(
+        PIPELINE, ['old', 'edge', 'new', 'undated'],
+        row_timestamps=[datetime(2024, 1, 1), datetime(2024, 1, 5), datetime(2024, 1, 9), None],
+        watermark=datetime(2024, 1, 5)
+    )
+
+    assert state.seen_fingerprints(PIPELINE, ['old', 'edge', 'new', 'undated']) == {'edge', 'new', 'undated'}
+
+def test_reset_clears_pipeline_state(tmp_path):
+    state = PipelineStateStore(str(tmp_path / 'state.db'))
+    state.commit(PIPELINE, ['a'], watermark=datetime(2024, 1, 1))
+    state.reset(PIPELINE)
+
+    assert state.get_watermark(PIPELINE) is None
+    assert state.seen_fingerprints(PIPELINE, ['a']) == set()
@@ -0,0 +1,34 @@
+import numpy as np
+from skyrocket.core import topic_classifier
+
+TOPICS = {'topics': [
+    {'topic_name': 'Billing', 'description': 'Charges and refunds', 'representative_queries': ['refund my card']},
+    {'topic_name': 'Travel', 'description': 'Flights and hotels', 'representative_queries': ['book a flight']},
+]}
+
+class FakeEmbeddings:
+    def encode(self, texts, **kwargs):
+        return np.array([[1.0, 0.0] if 'refund' in text or 'Billing' in text else [0.0, 1.0] for text in texts])
+
+def test_embedding_load_failure_is_cached(monkeypatch):
+    loads = []
+
+    def unavailable():
+        loads.append(1)
+        raise OSError("model download failed")
+
+    monkeypatch.setattr(topic_classifier, 'get_embedding_model', unavailable)
+    classifier = topic_classifier.TopicClassifier(TOPICS)
+
+    results = [classifier._classify_locally(query) for query in ['refund please', 'book a flight', 'hello']]
+
+    assert [r['topic_name'] for r in results] == ['Unknown'] * 3
+    assert {r['source'] for r in results} == {topic_classifier.FALLBACK_SOURCE}
+    assert len(loads) == 1
+
+def test_centroid_fallback_picks_the_nearest_topic(monkeypatch):
+    monkeypatch.setattr(topic_classifier, 'get_embedding_model', FakeEmbeddings)
+    classifier = topic_classifier.TopicClassifier(TOPICS)
+
+    assert classifier._classify_locally('refund the charge')['topic_name'] == 'Billing'
+    assert classifier._classify_locally('flight to Paris')['topic_name'] == 'Travel'
@@ -0,0 +1,87 @@
+import hashlib
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from upload_stream import stream_upload_to_disk
+
+MAX_SIZE = 64 * 1024
+BOUNDARY = 'test-boundary'
+
+def make_app(destination):
+    app = FastAPI()
+
+    @app.post('/upload')
+    async def upload(request: Request):
+        upload = await stream_upload_to_disk(
+            request, destination, MAX_SIZE, lambda name: name.endswith(('.csv', '.xlsx'))
+        )
+        return {'filename': upload.filename, 'size': upload.size, 'sha256': upload.digest.hexdigest()}
+
+    return app
+
+def part(name, payload, filename=None):
+    disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else '')
+    return (f'--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n').encode() + payload + b'\r\n'
+
+def body(*parts):
+    return b''.join(parts) + f'--{BOUNDARY}--\r\n'.encode()
+
+def post(app, content):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.post('/upload', content=content,
+                                     headers={'content-type': f'multipart/form-data; boundary={BOUNDARY}'})
+    return asyncio.run(send())
+
+def test_streams_file_to_disk_and_hashes_it(tmp_path):
+    destination = tmp_path / 'upload.part'
+    payload = b'query,response\n' + b'x' * 20000
+    response = post(make_app(destination), body(part('note', b'ignored'), part('file', payload, 'data.csv')))
+
+    assert response.status_code == 200
+    assert response.json() == {'filename': 'data.csv', 'size': len(payload),
+                               'sha256': hashlib.sha256(payload).hexdigest()}
+    assert destination.read_bytes() == payload
+
+def test_rejects_oversized_upload_while_streaming(tmp_path):
+    destination = tmp_path / 'upload.part'
+    sent = []
+
+    async def chunks():
+        yield part('file', b'', 'big.csv')[:-2]
+        for _ in range(100):
+            sent.append(1)
+            yield b'x' * 8192
+        yield b'\r\n' + f'--{BOUNDARY}--\r\n'.encode()
+
+    response = post(make_app(destination), chunks())
+
+    assert response.status_code == 400
+    assert 'too large' in response.json()['detail']
+    assert len(sent) < 100
+    assert not destination.exists()
+
+@pytest.mark.parametrize('content, detail', [
+    (body(part('file', b'data', 'malware.exe')), 'Invalid file type'),
+    (body(part('note', b'no file here')), "No 'file'"),
+])
+def test_rejects_bad_uploads(tmp_path, content, detail):
+    destination = tmp_path / 'upload.part'
+    response = post(make_app(destination), content)
+
+    assert response.status_code == 400
+    assert detail in response.json()['detail']
+    assert not destination.exists()
+
+def test_rejects_non_multipart_requests(tmp_path):
+    app = make_app(tmp_path / 'upload.part')
+
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.post('/upload', content=b'raw', headers={'content-type': 'text/csv'})
+
+    assert asyncio.run(send()).status_code == 400
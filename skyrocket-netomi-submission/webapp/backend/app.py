@@ -2,22 +2,38 @@ import os
 import sys
 import json
 import pandas as pd
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, Response
 from pathlib import Path
+from pydantic import BaseModel
 import asyncio
 from typing import Optional
 import time
+import hashlib
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
 
 from skyrocket.data.prepare_data import prepare_data
-from pdf_generator import generate_pdf_report
+from skyrocket.data.storage import read_columns, read_table, find_column
+from skyrocket.data.run_catalog import RunCatalog, metrics_from_results, topic_counts_from_results, to_timestamp
+from skyrocket.utils import perf
+from skyrocket.core import registry
+from skyrocket.llm.circuit_breaker import breaker_status
+from skyrocket.core.live_analyzer import LiveAnalyzer
+from report_cache import ReportCache
+import metrics
+import results_api
+from upload_stream import stream_upload_to_disk
+from jobs import Job, JobManager
 from dotenv import load_dotenv
 
 load_dotenv()
 
+GZIP_MIN_SIZE = 1024
+RESULTS_CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
 app = FastAPI(
     title="SkyRocket Analytics API",
     description="AI-Powered Customer Service Analytics Platform",
@@ -32,23 +48,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-UPLOAD_FOLDER = Path(__file__).parent / 'uploads'
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+app.add_middleware(metrics.PrometheusMiddleware)
+perf.add_listener(metrics.observe_perf_event)
+
 RESULTS_FOLDER = Path(__file__).parent / 'results'
+JOBS_FOLDER = RESULTS_FOLDER / 'jobs'
+INCOMING_FOLDER = JOBS_FOLDER / 'incoming'
+REPORTS_FOLDER = RESULTS_FOLDER / 'reports'
 DATA_FOLDER = Path(__file__).parent.parent.parent / 'data'
+ENRICHMENT_DB = DATA_FOLDER / 'enrichment.db'
+RUN_CATALOG_DB = os.getenv("SKYROCKET_RUN_CATALOG", str(DATA_FOLDER / 'processed' / 'run_catalog.db'))
 ALLOWED_EXTENSIONS = {'xlsx', 'csv'}
 MAX_FILE_SIZE = 50 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_CONCURRENT_JOBS = int(os.getenv("SKYROCKET_MAX_CONCURRENT_JOBS", "2"))
+SSE_KEEPALIVE_SECONDS = 15
+SSE_POLL_SECONDS = 0.5
+SSE_PROGRESS_FIELDS = ('status', 'progress', 'current_step', 'rows_processed', 'queue_position', 'error')
+REPORT_WORKERS = int(os.getenv("SKYROCKET_REPORT_WORKERS", "1"))
+SERVER_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
 
-UPLOAD_FOLDER.mkdir(exist_ok=True)
 RESULTS_FOLDER.mkdir(exist_ok=True)
 DATA_FOLDER.mkdir(exist_ok=True)
+INCOMING_FOLDER.mkdir(parents=True, exist_ok=True)
+
+job_manager = JobManager(JOBS_FOLDER, max_workers=MAX_CONCURRENT_JOBS, on_queue_change=metrics.ANALYSIS_QUEUED.set)
+report_cache = ReportCache(REPORTS_FOLDER, max_workers=REPORT_WORKERS)
+run_catalog = RunCatalog(RUN_CATALOG_DB)
+
+live_analyzer: Optional[LiveAnalyzer] = None
+live_analyzer_lock = asyncio.Lock()
 
-analysis_state = {
-    'status': 'idle',
-    'progress': 0,
-    'current_step': '',
-    'results': None,
-    'error': None
-}
+class QueryRequest(BaseModel):
+    query: str
+
+class PairRequest(BaseModel):
+    query: str
+    response: str
+
+PREPARE_PROGRESS_RANGE = 15
 
 def allowed_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -65,133 +104,238 @@ def convert_types(obj):
     else:
         return obj
 
-def run_analysis_sync(file_path: str, file_type: str):
-    global analysis_state
+def load_json(path: Optional[str], fallback=None):
+    if path and os.path.exists(path):
+        with open(path, 'r') as f:
+            return convert_types(json.load(f))
+    return fallback
+
+def prepare_progress_reporter(job: Job):
+    sheets_done = {}
+    
+    def report(sheet_name: str, rows_done: int, total_rows: Optional[int]):
+        sheets_done[sheet_name] = rows_done
+        job.rows_processed = sum(sheets_done.values())
+        
+        if total_rows:
+            sheet_fraction = min(rows_done / total_rows, 1.0)
+            job.update(
+                progress=int(PREPARE_PROGRESS_RANGE * (len(sheets_done) - 1 + sheet_fraction) / 2),
+                current_step=f'Preparing data... {sheet_name}: {rows_done:,}/{total_rows:,} rows'
+            )
+        else:
+            job.update(current_step=f'Preparing data... {sheet_name}: {rows_done:,} rows')
+    
+    return report
+
+def load_responses(data_dir: str) -> pd.DataFrame:
+    columns = read_columns(data_dir, 'genai_responses')
+    wanted = [find_column(columns, 'query'), find_column(columns, 'response')]
+    wanted += [col for col in columns if col.lower() == 'category']
+    return read_table(data_dir, 'genai_responses', columns=[col for col in wanted if col])
+
+def run_analysis_sync(job: Job):
+    data_dir = str(job.data_dir)
     
     try:
-        analysis_state['status'] = 'processing'
-        analysis_state['progress'] = 0
-        analysis_state['current_step'] = 'Preparing data...'
+        job.update(progress=0, current_step='Preparing data...')
+        
+        recorder = perf.start_run(f'webapp_analysis:{job.id}')
         
         print(f"\n{'='*80}")
-        print("STEP 1: DATA PREPARATION")
+        print(f"[{job.id}] STEP 1: DATA PREPARATION")
         print(f"{'='*80}")
         
-        queries_df, responses_df = prepare_data(file_path, output_dir=str(DATA_FOLDER))
+        with perf.stage('prepare_data') as stage:
+            prepared = prepare_data(
+                str(job.upload_path),
+                output_dir=data_dir,
+                progress_callback=prepare_progress_reporter(job)
+            )
+            stage.rows_out = sum(info['rows'] for info in prepared.values())
         
-        analysis_state['progress'] = 15
-        analysis_state['current_step'] = 'Data preparation complete. Loading prepared data...'
+        job.update(progress=PREPARE_PROGRESS_RANGE, current_step='Data preparation complete.')
         
-        queries_csv = DATA_FOLDER / 'queries.csv'
-        responses_csv = DATA_FOLDER / 'genai_responses.csv'
+        response_rows = prepared['GenAI_responses']['rows']
+        queries = read_table(data_dir, 'queries', columns=['Queries'])['Queries'].dropna()
+        responses_df = load_responses(data_dir)
         
-        if not queries_csv.exists() or not responses_csv.exists():
-            raise FileNotFoundError("Prepared CSV files not found after data preparation")
-        
-        queries_df = pd.read_csv(queries_csv)
-        responses_df = pd.read_csv(responses_csv)
-        
-        queries = queries_df['Queries'].dropna().tolist()
-        
-        analysis_state['progress'] = 20
-        analysis_state['current_step'] = 'Running topic discovery...'
+        job.update(progress=20, current_step='Running topic discovery...')
         
         print(f"\n{'='*80}")
-        print("STEP 2: TOPIC DISCOVERY")
+        print(f"[{job.id}] STEP 2: TOPIC DISCOVERY")
         print(f"{'='*80}")
         
         from skyrocket.core import topic_discovery
-        topic_discovery.main()
+        with perf.stage('topic_discovery', rows_in=len(queries)):
+            topic_results_file = topic_discovery.main(data_dir=data_dir, queries=queries.tolist())
         
-        topic_results_file = DATA_FOLDER / 'topic_discovery_results.json'
-        if topic_results_file.exists():
-            with open(topic_results_file, 'r') as f:
-                topic_results = json.load(f)
-        else:
-            topic_results = {'error': 'No topic discovery results found'}
+        topic_results = load_json(topic_results_file, {'error': 'No topic discovery results found'})
         
-        topic_results = convert_types(topic_results)
-        
-        analysis_state['progress'] = 40
-        analysis_state['current_step'] = 'Extracting entities from GenAI responses...'
+        job.update(progress=40, current_step='Extracting entities from GenAI responses...')
         
         print(f"\n{'='*80}")
-        print("STEP 3: ENTITY EXTRACTION")
+        print(f"[{job.id}] STEP 3: ENTITY EXTRACTION")
         print(f"{'='*80}")
         
         from skyrocket.core import entity_extractor
-        entity_extractor.main()
-        
-        import glob
-        entity_result_files = glob.glob(str(DATA_FOLDER / 'entity_extraction_results_*.json'))
-        if entity_result_files:
-            latest_entity_file = max(entity_result_files, key=os.path.getctime)
-            with open(latest_entity_file, 'r') as f:
-                entity_results = json.load(f)
-        else:
-            entity_results = {'error': 'No entity extraction results found'}
+        with perf.stage('entity_extraction', rows_in=response_rows):
+            entity_results_file = entity_extractor.main(data_dir=data_dir, enrichment_db=str(ENRICHMENT_DB),
+                                                        responses_df=responses_df)
         
-        entity_results = convert_types(entity_results)
+        entity_results = load_json(entity_results_file, {'error': 'No entity extraction results found'})
         
-        analysis_state['progress'] = 70
+        job.update(progress=70)
         
         print(f"\n{'='*80}")
-        print("STEP 4: LLM JUDGE EVALUATION")
+        print(f"[{job.id}] STEP 4: LLM JUDGE EVALUATION")
         print(f"{'='*80}")
         
-        analysis_state['current_step'] = 'Evaluating responses with LLM Judge...'
+        job.update(current_step='Evaluating responses with LLM Judge...')
         
         from skyrocket.core import llm_judge
-        llm_judge.main()
+        with perf.stage('llm_judge', rows_in=response_rows):
+            judge_results_file = llm_judge.main(data_dir=data_dir, enrichment_db=str(ENRICHMENT_DB),
+                                                responses_df=responses_df)
         
-        llm_judge_result_files = glob.glob(str(DATA_FOLDER / 'llm_judge_results_*.json'))
-        if llm_judge_result_files:
-            latest_judge_file = max(llm_judge_result_files, key=os.path.getctime)
-            with open(latest_judge_file, 'r') as f:
-                evaluation_results = json.load(f)
-        else:
-            evaluation_results = None
-        
-        evaluation_results = convert_types(evaluation_results) if evaluation_results else None
+        evaluation_results = load_json(judge_results_file)
         
-        analysis_state['progress'] = 90
-        analysis_state['current_step'] = 'Finalizing results...'
+        job.update(progress=90, current_step='Finalizing results...')
         
         results = {
+            'job_id': job.id,
+            'content_hash': job.content_hash,
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
             'data_summary': {
                 'total_queries': len(queries),
-                'unique_queries': queries_df['Queries'].nunique(),
-                'total_responses': len(responses_df)
+                'unique_queries': queries.nunique(),
+                'total_responses': response_rows
             },
             'topics': topic_results,
             'entities': entity_results,
-            'evaluation': evaluation_results
+            'evaluation': evaluation_results,
+            'performance': recorder.to_dict()
         }
+        results = convert_types(results)
+        
+        recorder.save(str(job.work_dir / f"performance_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+        
+        payload = json.dumps(results, indent=2).encode('utf-8')
+        with open(job.results_path, 'wb') as f:
+            f.write(payload)
         
-        results_file = RESULTS_FOLDER / 'latest_analysis.json'
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        job.update(progress=100, current_step='Analysis complete!', results=results,
+                   results_hash=hashlib.sha256(payload).hexdigest(), status='completed')
+        metrics.ANALYSIS_RUNS.labels('completed').inc()
+        report_cache.submit(results, job.results_hash)
         
-        analysis_state['status'] = 'completed'
-        analysis_state['progress'] = 100
-        analysis_state['current_step'] = 'Analysis complete!'
-        analysis_state['results'] = results
+        try:
+            run_catalog.record_run(
+                job.id, 'webapp', time.time(), metrics_from_results(results),
+                topic_counts=topic_counts_from_results(results),
+                artifacts={'results': str(job.results_path), 'filename': job.filename},
+                started_at=job.started_at
+            )
+        except Exception as e:
+            print(f"[{job.id}] Could not record run in catalog: {e}")
         
         print(f"\n{'='*80}")
-        print("COMPLETE PIPELINE FINISHED SUCCESSFULLY")
+        print(f"[{job.id}] COMPLETE PIPELINE FINISHED SUCCESSFULLY")
         print(f"{'='*80}\n")
         
     except Exception as e:
-        analysis_state['status'] = 'error'
-        analysis_state['error'] = str(e)
-        print(f"Error in analysis pipeline: {e}")
+        job.update(status='error', error=str(e))
+        metrics.ANALYSIS_RUNS.labels('error').inc()
+        print(f"[{job.id}] Error in analysis pipeline: {e}")
         import traceback
         traceback.print_exc()
 
-async def run_analysis_pipeline(file_path: str, file_type: str):
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, run_analysis_sync, file_path, file_type)
+def run_job(job: Job):
+    metrics.ANALYSIS_IN_PROGRESS.inc()
+    try:
+        run_analysis_sync(job)
+    finally:
+        metrics.ANALYSIS_IN_PROGRESS.dec()
+
+def load_topics_config() -> Optional[dict]:
+    for job in sorted(job_manager.list(status='completed'), key=lambda j: j.finished_at or 0, reverse=True):
+        results = job_manager.results(job) or {}
+        if results.get('topics', {}).get('topics'):
+            return results['topics']
+    
+    return load_json(str(DATA_FOLDER / 'topic_discovery_results.json'))
+
+async def get_live_analyzer() -> LiveAnalyzer:
+    global live_analyzer
+    
+    async with live_analyzer_lock:
+        if live_analyzer is None:
+            loop = asyncio.get_running_loop()
+            try:
+                live_analyzer = await loop.run_in_executor(None, lambda: LiveAnalyzer(load_topics_config()))
+            except ValueError as e:
+                raise HTTPException(status_code=503, detail=str(e))
+    
+    return live_analyzer
+
+def get_job_or_404(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+def latest_job_or_404() -> Job:
+    job = job_manager.latest()
+    if job is None:
+        raise HTTPException(status_code=404, detail="No analysis has been started")
+    return job
+
+def job_section_response(job: Job, request: Request, section: str, build, **params):
+    if job.status == 'error':
+        raise HTTPException(
+            status_code=500,
+            detail=job.error
+        )
+    results = job_manager.results(job) if job.status == 'completed' else None
+    if not results:
+        return JSONResponse(
+            status_code=202,
+            content={"message": "Analysis not yet completed", "job_id": job.id}
+        )
+    
+    etag = results_api.section_etag(job.results_hash or job.id, section, params)
+    headers = {"ETag": etag, "Cache-Control": RESULTS_CACHE_CONTROL}
+    if results_api.etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    
+    try:
+        content = build(results, **params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return JSONResponse(content=content, headers=headers)
+
+def job_results_response(job: Job, request: Request):
+    return job_section_response(job, request, 'full', lambda results: results)
+
+async def job_report_response(job: Job):
+    results = job_manager.results(job) if job.status == 'completed' else None
+    if not results:
+        raise HTTPException(
+            status_code=404,
+            detail="No results available"
+        )
+    
+    try:
+        report_path = await asyncio.wrap_future(report_cache.submit(results, job.results_hash or job.id))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Could not generate report: {e}")
+    
+    return FileResponse(
+        report_path,
+        media_type="application/pdf",
+        filename="skyrocket-analysis-report.pdf"
+    )
 
 @app.get("/")
 async def root():
@@ -205,93 +349,241 @@ async def root():
 async def health_check():
     return {
         "status": "healthy",
-        "message": "SkyRocket Analytics API is running"
+        "message": "SkyRocket Analytics API is running",
+        "models": registry.loaded(),
+        "circuit_breakers": breaker_status()
     }
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    payload, content_type = metrics.render_metrics()
+    return Response(content=payload, media_type=content_type)
+
 @app.post("/api/upload")
-async def upload_file(file: UploadFile = File(...)):
-    global analysis_state
-    
-    if not allowed_file(file.filename):
+async def upload_file(request: Request):
+    content_length = request.headers.get('content-length')
+    if content_length and content_length.isdigit() and int(content_length) > MAX_FILE_SIZE + UPLOAD_CHUNK_SIZE:
         raise HTTPException(
             status_code=400,
-            detail="Invalid file type. Please upload .xlsx or .csv"
+            detail="File too large. Maximum size is 50MB"
         )
     
-    contents = await file.read()
+    incoming_path = INCOMING_FOLDER / f"{time.time_ns()}.part"
+    upload = await stream_upload_to_disk(request, incoming_path, MAX_FILE_SIZE, allowed_file)
+    size, content_hash, filename = upload.size, upload.digest.hexdigest(), upload.filename
+    metrics.UPLOAD_BYTES.observe(size)
     
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail="File too large. Maximum size is 50MB"
-        )
+    job, created = job_manager.get_or_create(filename, content_hash)
     
-    file_path = UPLOAD_FOLDER / file.filename
-    with open(file_path, 'wb') as f:
-        f.write(contents)
+    if created:
+        os.replace(incoming_path, job.upload_path)
+        job_manager.submit(job)
+        message = "File uploaded successfully. Analysis queued."
+    else:
+        incoming_path.unlink(missing_ok=True)
+        message = ("Identical file already analyzed. Returning existing results."
+                   if job.status == 'completed' else "Identical file is already being analyzed.")
     
-    file_type = file.filename.rsplit('.', 1)[1].lower()
+    status = job_manager.status(job)
     
-    analysis_state = {
-        'status': 'processing',
-        'progress': 0,
-        'current_step': 'Starting analysis...',
-        'results': None,
-        'error': None
+    return {
+        "message": message,
+        "filename": filename,
+        "job_id": job.id,
+        "content_hash": content_hash,
+        "deduplicated": not created,
+        "status": status['status'],
+        "queue_position": status.get('queue_position'),
+        "estimated_wait_seconds": status.get('estimated_wait_seconds'),
+        "results_url": f"/api/jobs/{job.id}/results"
     }
+
+@app.post("/api/analyze/query")
+async def analyze_query(request: QueryRequest):
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    
+    analyzer = await get_live_analyzer()
+    return await analyzer.analyze_query(request.query)
+
+@app.post("/api/analyze/pair")
+async def analyze_pair(request: PairRequest):
+    if not request.query.strip() or not request.response.strip():
+        raise HTTPException(status_code=400, detail="Query and response must not be empty")
+    
+    analyzer = await get_live_analyzer()
+    return await analyzer.analyze_pair(request.query, request.response)
+
+@app.get("/api/analyze/stats")
+async def analyze_stats():
+    if live_analyzer is None:
+        return {}
+    return live_analyzer.stats()
+
+@app.get("/api/runs")
+async def list_runs(start: Optional[str] = Query(None, alias='from'), end: Optional[str] = Query(None, alias='to'),
+                    source: Optional[str] = None, limit: int = 500, topics: int = 10):
+    started = time.perf_counter()
+    try:
+        start = to_timestamp(start)
+        end = to_timestamp(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="'from' and 'to' must be ISO dates or epoch seconds")
     
-    asyncio.create_task(run_analysis_pipeline(str(file_path), file_type))
+    runs = run_catalog.runs(start, end, source, limit)
+    trend_metrics = ['total_queries', 'containment_rate', 'hallucination_rate', 'escalation_rate', 'avg_quality']
     
     return {
-        "message": "File uploaded successfully. Analysis started.",
-        "filename": file.filename
+        'from': start,
+        'to': end,
+        'count': len(runs),
+        'runs': runs,
+        'trends': {
+            'finished_at': [run['finished_at'] for run in runs],
+            **{metric: [run[metric] for run in runs] for metric in trend_metrics}
+        },
+        'topic_volumes': run_catalog.topic_volumes(start, end, source, topics),
+        'query_ms': round((time.perf_counter() - started) * 1000, 2)
     }
 
+@app.get("/api/jobs")
+async def list_jobs():
+    return [job_manager.status(job) for job in job_manager.list()]
+
+@app.get("/api/jobs/{job_id}/status")
+async def get_job_status(job_id: str):
+    return job_manager.status(get_job_or_404(job_id))
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    job = get_job_or_404(job_id)
+    
+    async def event_stream():
+        yield "retry: 3000\n\n"
+        last_status = None
+        idle = 0.0
+        
+        def snapshot():
+            current = job_manager.get(job.id) or job
+            return current, job_manager.status(current)
+        
+        while True:
+            current, status = await asyncio.to_thread(snapshot)
+            stable = {field: status.get(field) for field in SSE_PROGRESS_FIELDS}
+            if stable != last_status:
+                yield format_sse('progress', status)
+                last_status = stable
+                idle = 0.0
+            
+            if current.status == 'completed':
+                yield format_sse('finished', {'job_id': current.id, 'results_url': f"/api/jobs/{current.id}/results"})
+                return
+            if current.status == 'error':
+                yield format_sse('failed', {'job_id': current.id, 'error': current.error})
+                return
+            if await request.is_disconnected():
+                return
+            
+            await asyncio.sleep(SSE_POLL_SECONDS)
+            idle += SSE_POLL_SECONDS
+            if idle >= SSE_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/jobs/{job_id}/results")
+async def get_job_results(job_id: str, request: Request):
+    return job_results_response(get_job_or_404(job_id), request)
+
+@app.get("/api/jobs/{job_id}/results/summary")
+async def get_job_summary(job_id: str, request: Request):
+    return job_section_response(get_job_or_404(job_id), request, 'summary', results_api.build_summary)
+
+@app.get("/api/jobs/{job_id}/results/topics")
+async def get_job_topics(job_id: str, request: Request, search: Optional[str] = None,
+                         sort: str = 'rank', order: str = 'asc'):
+    return job_section_response(get_job_or_404(job_id), request, 'topics', results_api.build_topics,
+                                search=search, sort=sort, order=order)
+
+@app.get("/api/jobs/{job_id}/results/entities")
+async def get_job_entities(job_id: str, request: Request, limit: int = results_api.TOP_ENTITY_TYPES):
+    return job_section_response(get_job_or_404(job_id), request, 'entities', results_api.build_entities,
+                                limit=limit)
+
+@app.get("/api/jobs/{job_id}/results/evaluations")
+async def get_job_evaluations(job_id: str, request: Request, page: int = 1, page_size: int = 10,
+                              filter: str = 'all', sort: Optional[str] = None, order: str = 'desc'):
+    return job_section_response(get_job_or_404(job_id), request, 'evaluations', results_api.build_evaluations,
+                                page=page, page_size=page_size, filter=filter, sort=sort, order=order)
+
+@app.get("/api/jobs/{job_id}/report")
+async def download_job_report(job_id: str):
+    return await job_report_response(get_job_or_404(job_id))
+
 @app.get("/api/status")
 async def get_status():
-    return analysis_state
+    job = job_manager.latest()
+    if job is None:
+        return {'status': 'idle', 'progress': 0, 'current_step': '', 'rows_processed': 0, 'error': None}
+    return job_manager.status(job)
 
 @app.get("/api/results")
-async def get_results():
-    if analysis_state['status'] == 'completed' and analysis_state['results']:
-        return analysis_state['results']
-    elif analysis_state['status'] == 'error':
-        raise HTTPException(
-            status_code=500,
-            detail=analysis_state['error']
-        )
-    else:
-        return JSONResponse(
-            status_code=202,
-            content={"message": "Analysis not yet completed"}
-        )
+async def get_results(request: Request):
+    return job_results_response(latest_job_or_404(), request)
+
+@app.get("/api/results/summary")
+async def get_summary(request: Request):
+    return await get_job_summary(latest_job_or_404().id, request)
+
+@app.get("/api/results/topics")
+async def get_topics(request: Request, search: Optional[str] = None, sort: str = 'rank', order: str = 'asc'):
+    return await get_job_topics(latest_job_or_404().id, request, search, sort, order)
+
+@app.get("/api/results/entities")
+async def get_entities(request: Request, limit: int = results_api.TOP_ENTITY_TYPES):
+    return await get_job_entities(latest_job_or_404().id, request, limit)
+
+@app.get("/api/results/evaluations")
+async def get_evaluations(request: Request, page: int = 1, page_size: int = 10,
+                          filter: str = 'all', sort: Optional[str] = None, order: str = 'desc'):
+    return await get_job_evaluations(latest_job_or_404().id, request, page, page_size, filter, sort, order)
 
 @app.get("/api/results/download")
 async def download_results():
-    if analysis_state['status'] != 'completed' or not analysis_state['results']:
-        raise HTTPException(
-            status_code=404,
-            detail="No results available"
-        )
-    
-    pdf_buffer = generate_pdf_report(analysis_state['results'])
-    
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=skyrocket-analysis-report.pdf"}
-    )
+    return await job_report_response(latest_job_or_404())
 
 @app.on_event("startup")
 async def startup_event():
+    metrics.check_worker_setup(SERVER_WORKERS)
+    
     print("=" * 80)
     print("SkyRocket Analytics Backend API")
     print("=" * 80)
-    print(f"Upload folder: {UPLOAD_FOLDER}")
+    print(f"Jobs folder: {JOBS_FOLDER}")
     print(f"Results folder: {RESULTS_FOLDER}")
+    print(f"Analysis workers: {MAX_CONCURRENT_JOBS}")
     print("Server running on http://localhost:8000")
     print("API docs available at http://localhost:8000/docs")
     print("=" * 80)
+    
+    job_manager.start(run_job)
+    
+    loop = asyncio.get_running_loop()
+    warm = await loop.run_in_executor(None, registry.warm_up)
+    print(f"Model registry warmed up: {warm}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    report_cache.shutdown()
+    metrics.mark_process_dead()
 
 if __name__ == "__main__":
     import uvicorn
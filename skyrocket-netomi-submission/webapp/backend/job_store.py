@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from typing import Callable, Dict, List, Optional
+
+JOB_COLUMNS = [
+    'id', 'filename', 'work_dir', 'content_hash', 'status', 'progress', 'current_step',
+    'rows_processed', 'results_hash', 'error', 'created_at', 'started_at', 'finished_at', 'owner_pid'
+]
+UPLOAD_INTERRUPTED = 'Upload was interrupted before the analysis was queued'
+ANALYSIS_INTERRUPTED = 'Analysis was interrupted by a server restart'
+
+class JobStore:
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    work_dir TEXT NOT NULL,
+                    content_hash TEXT,
+                    status TEXT NOT NULL,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    current_step TEXT,
+                    rows_processed INTEGER NOT NULL DEFAULT 0,
+                    results_hash TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    owner_pid INTEGER
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_hash ON jobs (content_hash)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        with closing(self._connect()) as conn, conn:
+            yield conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, row: Dict):
+        columns = [col for col in JOB_COLUMNS if col in row]
+        conn.execute(
+            f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [row[col] for col in columns]
+        )
+
+    def insert(self, row: Dict):
+        with self._connection() as conn:
+            self._insert(conn, row)
+
+    def insert_unless_duplicate(self, row: Dict, has_results: Callable[[Dict], bool],
+                                is_alive: Callable[[int], bool]) -> Optional[Dict]:
+        with self._transaction() as conn:
+            candidates = conn.execute(
+                "SELECT * FROM jobs WHERE content_hash = ? AND status != 'error' ORDER BY created_at DESC",
+                (row['content_hash'],)
+            ).fetchall()
+            for candidate in map(dict, candidates):
+                if candidate['status'] == 'completed' and not has_results(candidate):
+                    error = 'Results file is missing'
+                elif candidate['status'] == 'pending' and not self._owner_alive(candidate, is_alive):
+                    error = UPLOAD_INTERRUPTED
+                else:
+                    return candidate
+                conn.execute("UPDATE jobs SET status = 'error', error = ? WHERE id = ?", (error, candidate['id']))
+            self._insert(conn, row)
+        return None
+
+    @staticmethod
+    def _owner_alive(row: Dict, is_alive: Callable[[int], bool]) -> bool:
+        return bool(row['owner_pid']) and is_alive(row['owner_pid'])
+
+    def update(self, job_id: str, **fields):
+        if not fields:
+            return
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._connection() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", [*fields.values(), job_id])
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._connection() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def latest(self) -> Optional[Dict]:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status != 'pending' ORDER BY created_at DESC LIMIT 1"
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list(self, status: str = None, limit: int = 100) -> List[Dict]:
+        query = "SELECT * FROM jobs"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._connection() as conn:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+    def queued_ids(self) -> List[str]:
+        with self._connection() as conn:
+            rows = conn.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at").fetchall()
+        return [row['id'] for row in rows]
+
+    def running(self) -> List[Dict]:
+        return self.list(status='processing')
+
+    def claim_next(self, max_running: int, owner_pid: int) -> Optional[Dict]:
+        with self._transaction() as conn:
+            running = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'processing'").fetchone()[0]
+            if running >= max_running:
+                return None
+
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+
+            claimed = dict(row)
+            claimed.update(status='processing', started_at=time.time(), owner_pid=owner_pid,
+                           current_step='Starting analysis...')
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, owner_pid = ?, current_step = ? WHERE id = ?",
+                (claimed['status'], claimed['started_at'], owner_pid, claimed['current_step'], claimed['id'])
+            )
+        return claimed
+
+    def recent_durations(self, limit: int) -> List[float]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT finished_at - started_at FROM jobs "
+                "WHERE status = 'completed' AND started_at IS NOT NULL AND finished_at IS NOT NULL "
+                "ORDER BY finished_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def fail_orphaned(self, is_alive: Callable[[int], bool]) -> int:
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, status, owner_pid FROM jobs WHERE status IN ('pending', 'processing')"
+            ).fetchall()
+            orphaned = [row for row in map(dict, rows) if not self._owner_alive(row, is_alive)]
+            for row in orphaned:
+                conn.execute(
+                    "UPDATE jobs SET status = 'error', error = ?, finished_at = ? WHERE id = ?",
+                    (UPLOAD_INTERRUPTED if row['status'] == 'pending' else ANALYSIS_INTERRUPTED, time.time(), row['id'])
+                )
+        return len(orphaned)
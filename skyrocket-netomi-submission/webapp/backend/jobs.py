@@ -0,0 +1,278 @@
+import contextvars
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from job_store import JobStore
+
+PERSISTED_FIELDS = ['status', 'progress', 'current_step', 'rows_processed', 'results_hash',
+                    'error', 'started_at', 'finished_at']
+
+@dataclass
+class Job:
+    id: str
+    filename: str
+    work_dir: Path
+    content_hash: Optional[str] = None
+    status: str = 'queued'
+    progress: int = 0
+    current_step: str = 'Waiting for a free worker...'
+    rows_processed: int = 0
+    results: Optional[Dict] = None
+    results_hash: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _on_update: Optional[Callable] = field(default=None, repr=False)
+
+    @classmethod
+    def from_row(cls, row: Dict) -> 'Job':
+        return cls(
+            id=row['id'], filename=row['filename'], work_dir=Path(row['work_dir']),
+            content_hash=row['content_hash'], status=row['status'], progress=row['progress'],
+            current_step=row['current_step'] or '', rows_processed=row['rows_processed'],
+            results_hash=row['results_hash'], error=row['error'], created_at=row['created_at'],
+            started_at=row['started_at'], finished_at=row['finished_at']
+        )
+
+    def to_row(self) -> Dict:
+        return {
+            'id': self.id, 'filename': self.filename, 'work_dir': str(self.work_dir),
+            'content_hash': self.content_hash, 'created_at': self.created_at,
+            **{name: getattr(self, name) for name in PERSISTED_FIELDS}
+        }
+
+    @property
+    def upload_path(self) -> Path:
+        return self.work_dir / 'upload' / self.filename
+
+    @property
+    def data_dir(self) -> Path:
+        return self.work_dir / 'data'
+
+    @property
+    def results_path(self) -> Path:
+        return self.work_dir / 'results.json'
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('completed', 'error')
+
+    def update(self, progress: int = None, current_step: str = None, **fields):
+        if progress is not None:
+            self.progress = progress
+        if current_step is not None:
+            self.current_step = current_step
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+        if self._on_update is not None:
+            self._on_update(self)
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobManager:
+    def __init__(self, jobs_root: Path, max_workers: int = 2, history_size: int = 20,
+                 results_cache_size: int = 8, on_queue_change: Optional[Callable[[int], None]] = None):
+        self.jobs_root = Path(jobs_root)
+        self.jobs_root.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.history_size = history_size
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        self.store = JobStore(self.jobs_root / 'jobs.db')
+        self.runner: Optional[Callable[[Job], None]] = None
+        self.local: Dict[str, Job] = {}
+        self._results_cache: OrderedDict = OrderedDict()
+        self.results_cache_size = results_cache_size
+        self.on_queue_change = on_queue_change
+        self._lock = threading.Lock()
+        self._import_legacy_index()
+
+    def _import_legacy_index(self):
+        index_path = self.jobs_root / 'index.json'
+        if not index_path.exists():
+            return
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        for content_hash, entry in index.items():
+            work_dir = self.jobs_root / entry['job_id']
+            if not entry.get('completed') or not (work_dir / 'results.json').exists():
+                continue
+            if self.store.get(entry['job_id']) is None:
+                payload = (work_dir / 'results.json').read_bytes()
+                self.store.insert({
+                    'id': entry['job_id'], 'filename': entry.get('filename', ''), 'work_dir': str(work_dir),
+                    'content_hash': content_hash, 'status': 'completed', 'progress': 100,
+                    'current_step': 'Analysis complete!', 'rows_processed': 0,
+                    'results_hash': hashlib.sha256(payload).hexdigest(),
+                    'created_at': (work_dir / 'results.json').stat().st_mtime
+                })
+        index_path.rename(index_path.with_suffix('.json.imported'))
+
+    def start(self, runner: Callable[[Job], None]):
+        self.runner = runner
+        failed = self.store.fail_orphaned(_pid_alive)
+        if failed:
+            print(f"Marked {failed} interrupted job(s) as failed")
+        if self._report_queue():
+            self.executor.submit(self._drain)
+
+    def _report_queue(self) -> int:
+        queued = len(self.store.queued_ids())
+        if self.on_queue_change is not None:
+            self.on_queue_change(queued)
+        return queued
+
+    def _persist(self, job: Job):
+        self.store.update(job.id, **{name: getattr(job, name) for name in PERSISTED_FIELDS})
+
+    def _new_job(self, filename: str, content_hash: str = None) -> Job:
+        job_id = uuid.uuid4().hex[:12]
+        job = Job(id=job_id, filename=Path(filename).name, work_dir=self.jobs_root / job_id,
+                  content_hash=content_hash, status='pending', current_step='Receiving upload...')
+        job.upload_path.parent.mkdir(parents=True, exist_ok=True)
+        job.data_dir.mkdir(parents=True, exist_ok=True)
+        return job
+
+    def create(self, filename: str) -> Job:
+        job = self._new_job(filename)
+        self.store.insert({**job.to_row(), 'owner_pid': os.getpid()})
+        return job
+
+    def get_or_create(self, filename: str, content_hash: str) -> Tuple[Job, bool]:
+        job = self._new_job(filename, content_hash)
+        existing = self.store.insert_unless_duplicate(
+            {**job.to_row(), 'owner_pid': os.getpid()},
+            has_results=lambda row: Job.from_row(row).results_path.exists(),
+            is_alive=_pid_alive
+        )
+        if existing is not None:
+            job.upload_path.parent.rmdir()
+            job.data_dir.rmdir()
+            job.work_dir.rmdir()
+            return Job.from_row(existing), False
+        return job, True
+
+    def submit(self, job: Job):
+        job.update(status='queued', current_step='Waiting for a free worker...')
+        self._persist(job)
+        self._report_queue()
+        self.executor.submit(self._drain)
+
+    def _drain(self):
+        while True:
+            row = self.store.claim_next(self.max_workers, os.getpid())
+            if row is None:
+                return
+            self._report_queue()
+            job = Job.from_row(row)
+            job._on_update = self._persist
+            with self._lock:
+                self.local[job.id] = job
+            self._run(job)
+
+    def _run(self, job: Job):
+        job.update(status='processing', current_step='Starting analysis...')
+
+        try:
+            # Each job runs in its own copy of the thread's context, so the perf recorder it starts ends with it.
+            contextvars.copy_context().run(self.runner, job)
+        except Exception as e:
+            job.update(status='error', error=str(e))
+            print(f"Job {job.id} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            self._persist(job)
+            with self._lock:
+                self.local.pop(job.id, None)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self.local.get(job_id)
+        if job is not None:
+            return job
+        row = self.store.get(job_id)
+        return Job.from_row(row) if row else None
+
+    def latest(self) -> Optional[Job]:
+        row = self.store.latest()
+        return self.get(row['id']) if row else None
+
+    def list(self, status: str = None, limit: int = 100) -> List[Job]:
+        return [Job.from_row(row) for row in self.store.list(status=status, limit=limit)]
+
+    def results(self, job: Job) -> Optional[Dict]:
+        if job.results is not None:
+            return job.results
+        if job.status != 'completed' or not job.results_path.exists():
+            return None
+
+        key = job.results_hash or job.id
+        with self._lock:
+            if key in self._results_cache:
+                self._results_cache.move_to_end(key)
+                return self._results_cache[key]
+
+        with open(job.results_path, 'r') as f:
+            results = json.load(f)
+
+        with self._lock:
+            self._results_cache[key] = results
+            while len(self._results_cache) > self.results_cache_size:
+                self._results_cache.popitem(last=False)
+        return results
+
+    def queue_position(self, job: Job) -> Optional[int]:
+        queued = self.store.queued_ids()
+        return queued.index(job.id) + 1 if job.id in queued else None
+
+    def average_duration(self) -> Optional[float]:
+        durations = self.store.recent_durations(self.history_size)
+        return sum(durations) / len(durations) if durations else None
+
+    def estimate_wait(self, job: Job) -> Optional[float]:
+        position = self.queue_position(job)
+        average = self.average_duration()
+        if position is None or average is None:
+            return None
+
+        now = time.time()
+        running = [row for row in self.store.running() if row['started_at']]
+        remaining = sorted(max(average - (now - row['started_at']), 0.0) for row in running)
+        free_slot = remaining[0] if len(remaining) >= self.max_workers else 0.0
+        return free_slot + math.floor((position - 1) / self.max_workers) * average
+
+    def status(self, job: Job) -> Dict:
+        status = {
+            'job_id': job.id,
+            'filename': job.filename,
+            'status': job.status,
+            'progress': job.progress,
+            'current_step': job.current_step,
+            'rows_processed': job.rows_processed,
+            'error': job.error,
+            'created_at': job.created_at,
+            'started_at': job.started_at,
+            'finished_at': job.finished_at
+        }
+        if job.status == 'queued':
+            status['queue_position'] = self.queue_position(job)
+            wait = self.estimate_wait(job)
+            status['estimated_wait_seconds'] = round(wait, 1) if wait is not None else None
+        return status
@@ -0,0 +1,158 @@
+import os
+import time
+from typing import Dict
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import multiprocess
+
+# With several server workers every process writes its samples under this directory and /metrics
+# aggregates them. It must exist and be emptied before the server starts.
+MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+HTTP_REQUESTS = Counter(
+    'skyrocket_http_requests_total',
+    'HTTP requests handled by the backend',
+    ['method', 'route', 'status'],
+    registry=REGISTRY
+)
+
+HTTP_LATENCY = Histogram(
+    'skyrocket_http_request_duration_seconds',
+    'HTTP request latency',
+    ['method', 'route'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    registry=REGISTRY
+)
+
+HTTP_IN_FLIGHT = Gauge(
+    'skyrocket_http_requests_in_flight',
+    'HTTP requests currently being handled',
+    multiprocess_mode='livesum',
+    registry=REGISTRY
+)
+
+ANALYSIS_STAGE_SECONDS = Histogram(
+    'skyrocket_analysis_stage_duration_seconds',
+    'Duration of analysis pipeline stages',
+    ['stage'],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+    registry=REGISTRY
+)
+
+ANALYSIS_RUNS = Counter(
+    'skyrocket_analysis_runs_total',
+    'Completed analysis runs by outcome',
+    ['status'],
+    registry=REGISTRY
+)
+
+ANALYSIS_IN_PROGRESS = Gauge(
+    'skyrocket_analysis_in_progress',
+    'Analysis runs currently running',
+    multiprocess_mode='livesum',
+    registry=REGISTRY
+)
+
+ANALYSIS_QUEUED = Gauge(
+    'skyrocket_analysis_queued',
+    'Analysis jobs waiting for a free worker',
+    multiprocess_mode='mostrecent',
+    registry=REGISTRY
+)
+
+UPLOAD_BYTES = Histogram(
+    'skyrocket_upload_size_bytes',
+    'Size of uploaded files',
+    buckets=(64e3, 256e3, 1e6, 4e6, 16e6, 32e6, 50e6, 100e6),
+    registry=REGISTRY
+)
+
+LLM_CALL_SECONDS = Histogram(
+    'skyrocket_llm_call_duration_seconds',
+    'Latency of LLM completion calls',
+    ['module'],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32),
+    registry=REGISTRY
+)
+
+LLM_CALL_ERRORS = Counter(
+    'skyrocket_llm_call_errors_total',
+    'Failed LLM completion calls',
+    ['module'],
+    registry=REGISTRY
+)
+
+LLM_CALL_RETRIES = Counter(
+    'skyrocket_llm_call_retries_total',
+    'Retried LLM completion calls',
+    ['module'],
+    registry=REGISTRY
+)
+
+LLM_FALLBACKS = Counter(
+    'skyrocket_llm_fallbacks_total',
+    'Results produced by a local fallback instead of the LLM',
+    ['module', 'source'],
+    registry=REGISTRY
+)
+
+def observe_perf_event(event: str, data: Dict):
+    if event == 'llm_call':
+        module = data['module']
+        LLM_CALL_SECONDS.labels(module).observe(data['seconds'])
+        if data['error']:
+            LLM_CALL_ERRORS.labels(module).inc()
+        if data['retries']:
+            LLM_CALL_RETRIES.labels(module).inc(data['retries'])
+    elif event == 'llm_fallback':
+        LLM_FALLBACKS.labels(data['module'], data['source']).inc()
+    elif event == 'stage':
+        ANALYSIS_STAGE_SECONDS.labels(data['stage']).observe(data['seconds'])
+
+def check_worker_setup(workers: int):
+    if workers > 1 and not MULTIPROC_DIR:
+        raise RuntimeError(f"{workers} server workers need PROMETHEUS_MULTIPROC_DIR, "
+                           "otherwise /metrics only reports whichever worker answers the scrape")
+
+def mark_process_dead():
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid(), path=MULTIPROC_DIR)
+
+def render_metrics():
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=MULTIPROC_DIR)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+class PrometheusMiddleware:
+    def __init__(self, app, skip_paths=('/metrics',)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+
+            route = scope.get('route')
+            route_path = getattr(route, 'path', None) or 'unmatched'
+            method = scope['method']
+            HTTP_LATENCY.labels(method, route_path).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route_path, str(status[0])).inc()
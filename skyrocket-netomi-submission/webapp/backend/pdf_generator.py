@@ -1,28 +1,40 @@
+import os
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
 from io import BytesIO
+from xml.sax.saxutils import escape
 
-def generate_pdf_report(data):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
+MAX_CATEGORY_TABLES = 15
+ENTITIES_PER_CATEGORY = 8
+MAX_FLAGGED_SAMPLES = 50
+SAMPLE_TEXT_CHARS = 400
+
+def _header_style(background):
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), background),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ])
 
-    title_style = styles['Title']
-    story.append(Paragraph("SkyRocket Analytics Report", title_style))
-    story.append(Spacer(1, 12))
+def _clip(text, limit=SAMPLE_TEXT_CHARS):
+    text = str(text or '')
+    return text if len(text) <= limit else text[:limit].rstrip() + '...'
+
+def _summary_section(data, styles):
+    story = [Paragraph("Executive Summary", styles['Heading2'])]
 
-    story.append(Paragraph("Executive Summary", styles['Heading2']))
-    
     summary_data = [
         ['Metric', 'Value'],
         ['Total Queries', str(data['data_summary']['total_queries'])],
         ['Unique Queries', str(data['data_summary']['unique_queries'])],
     ]
-    
+
     if data.get('evaluation'):
         summary_data.extend([
             ['Containment Rate', f"{data['evaluation']['containment_rate']:.1f}%"],
@@ -42,44 +54,120 @@ def generate_pdf_report(data):
     ]))
     story.append(t)
     story.append(Spacer(1, 20))
+    return story
+
+def _topics_section(data, styles):
+    topics = (data.get('topics') or {}).get('topics') or []
+    if not topics:
+        return []
 
-    story.append(Paragraph("Top Discovered Topics", styles['Heading2']))
-    
-    topics_data = [['Rank', 'Topic', 'Count', 'Percentage']]
-    for topic in data['topics']['topics'][:10]:
+    story = [Paragraph("Discovered Topics", styles['Heading2'])]
+    cell = styles['BodyText']
+
+    topics_data = [['Rank', 'Topic', 'Description', 'Count', 'Share']]
+    for topic in topics:
         topics_data.append([
             str(topic['rank']),
-            topic['topic_name'],
+            Paragraph(escape(topic['topic_name']), cell),
+            Paragraph(escape(_clip(topic.get('description'))), cell),
             str(topic['count']),
             f"{topic['percentage']:.1f}%"
         ])
 
-    t_topics = Table(topics_data, colWidths=[0.5*inch, 3.5*inch, 1*inch, 1*inch])
-    t_topics.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    t_topics = Table(topics_data, colWidths=[0.5*inch, 1.8*inch, 3*inch, 0.7*inch, 0.7*inch], repeatRows=1)
+    t_topics.setStyle(_header_style(colors.blue))
     story.append(t_topics)
     story.append(Spacer(1, 20))
+    return story
 
-    if data.get('entities') and data['entities'].get('entity_counts'):
-        story.append(Paragraph("Top Entities", styles['Heading2']))
-        entity_data = [['Entity Type', 'Count']]
-        sorted_entities = sorted(data['entities']['entity_counts'].items(), key=lambda x: x[1], reverse=True)[:10]
-        for entity, count in sorted_entities:
-            entity_data.append([entity.replace('_', ' ').title(), str(count)])
-        
-        t_entities = Table(entity_data, colWidths=[4*inch, 2*inch])
-        t_entities.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.green),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-        story.append(t_entities)
-
-    doc.build(story)
+def _entities_section(data, styles):
+    entities = data.get('entities') or {}
+    if not entities.get('entity_counts'):
+        return []
+
+    story = [Paragraph("Top Entities", styles['Heading2'])]
+    entity_data = [['Entity Type', 'Count']]
+    sorted_entities = sorted(entities['entity_counts'].items(), key=lambda x: x[1], reverse=True)[:10]
+    for entity, count in sorted_entities:
+        entity_data.append([entity.replace('_', ' ').title(), str(count)])
+
+    t_entities = Table(entity_data, colWidths=[4*inch, 2*inch])
+    t_entities.setStyle(_header_style(colors.green))
+    story.append(t_entities)
+    story.append(Spacer(1, 20))
+
+    by_category = entities.get('entity_counts_by_category') or {}
+    ranked = sorted(by_category.items(), key=lambda item: sum(item[1].values()), reverse=True)
+    if ranked:
+        story.append(Paragraph("Entities by Category", styles['Heading2']))
+
+    for category, counts in ranked[:MAX_CATEGORY_TABLES]:
+        if not counts:
+            continue
+        story.append(Paragraph(escape(category.replace('_', ' ').title()), styles['Heading3']))
+        rows = [['Entity Type', 'Count']]
+        for entity, count in sorted(counts.items(), key=lambda x: x[1], reverse=True)[:ENTITIES_PER_CATEGORY]:
+            rows.append([entity.replace('_', ' ').title(), str(count)])
+        t_category = Table(rows, colWidths=[4*inch, 2*inch])
+        t_category.setStyle(_header_style(colors.darkgreen))
+        story.append(t_category)
+        story.append(Spacer(1, 10))
+
+    return story
+
+def _flagged_samples_section(data, styles):
+    samples = (data.get('evaluation') or {}).get('samples') or []
+    flagged = [
+        s for s in samples
+        if s.get('hallucination') or s.get('escalation_needed') or s.get('bias') or (s.get('overall_quality') or 5) < 3
+    ]
+    if not flagged:
+        return []
+
+    story = [Paragraph(f"Flagged Judge Samples ({len(flagged)})", styles['Heading2'])]
+    cell = styles['BodyText']
+
+    for i, sample in enumerate(flagged[:MAX_FLAGGED_SAMPLES], 1):
+        reasons = [name for name, flagged_by in [
+            ('Hallucination', sample.get('hallucination')),
+            ('Escalation needed', sample.get('escalation_needed')),
+            ('Bias', sample.get('bias')),
+            ('Low quality', (sample.get('overall_quality') or 5) < 3),
+        ] if flagged_by]
+        rows = [
+            ['Sample', f"#{i}: {', '.join(reasons)}"],
+            ['Scores', f"Accuracy {sample.get('accuracy')} | Empathy {sample.get('empathy')} | "
+                       f"Completeness {sample.get('completeness')} | Overall {sample.get('overall_quality')}"],
+            ['Query', Paragraph(escape(_clip(sample.get('Query') or sample.get('query'))), cell)],
+            ['Response', Paragraph(escape(_clip(sample.get('response'))), cell)],
+            ['Reasoning', Paragraph(escape(_clip(sample.get('judge_reasoning'))), cell)],
+        ]
+        t_sample = Table(rows, colWidths=[1.1*inch, 5.6*inch])
+        t_sample.setStyle(_header_style(colors.firebrick))
+        story.append(t_sample)
+        story.append(Spacer(1, 10))
+
+    return story
+
+def build_story(data):
+    styles = getSampleStyleSheet()
+    story = [Paragraph("SkyRocket Analytics Report", styles['Title']), Spacer(1, 12)]
+    story.extend(_summary_section(data, styles))
+    story.extend(_topics_section(data, styles))
+    story.extend(_entities_section(data, styles))
+    story.extend(_flagged_samples_section(data, styles))
+    return story
+
+def generate_pdf_report(data):
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc.build(build_story(data))
     buffer.seek(0)
     return buffer
+
+def write_pdf_report(data, output_path):
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    doc = SimpleDocTemplate(tmp_path, pagesize=letter)
+    doc.build(build_story(data))
+    os.replace(tmp_path, output_path)
+    return output_path
@@ -0,0 +1,55 @@
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict
+
+class ReportCache:
+    def __init__(self, cache_dir: Path, max_workers: int = 1):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.executor = self._new_executor()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def path_for(self, results_hash: str) -> Path:
+        return self.cache_dir / f"{results_hash}.pdf"
+
+    def submit(self, results: Dict, results_hash: str) -> Future:
+        path = self.path_for(results_hash)
+        with self._lock:
+            if results_hash in self._pending:
+                return self._pending[results_hash]
+
+            future = Future()
+            if path.exists():
+                future.set_result(path)
+                return future
+
+            from pdf_generator import write_pdf_report
+            try:
+                future = self.executor.submit(write_pdf_report, results, str(path))
+            except BrokenProcessPool:
+                self.executor = self._new_executor()
+                future = self.executor.submit(write_pdf_report, results, str(path))
+            self._pending[results_hash] = future
+
+        future.add_done_callback(lambda f: self._finished(results_hash, f))
+        return future
+
+    def _finished(self, results_hash: str, future: Future):
+        with self._lock:
+            self._pending.pop(results_hash, None)
+        if future.exception() is not None:
+            print(f"PDF report {results_hash[:12]} failed: {future.exception()}")
+
+    def ready(self, results_hash: str) -> bool:
+        return self.path_for(results_hash).exists()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
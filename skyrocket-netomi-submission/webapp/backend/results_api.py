@@ -0,0 +1,175 @@
+import hashlib
+import math
+from typing import Dict, List, Optional
+
+TOP_TOPICS_IN_CHART = 10
+TOP_ENTITY_TYPES = 10
+MAX_PAGE_SIZE = 100
+
+EVALUATION_FILTERS = {
+    'all': lambda s: True,
+    'hallucination': lambda s: bool(s.get('hallucination')),
+    'escalation': lambda s: bool(s.get('escalation_needed')),
+    'bias': lambda s: bool(s.get('bias')),
+    'low_quality': lambda s: (s.get('overall_quality') or 0) < 3,
+}
+EVALUATION_SORT_FIELDS = {'overall_quality', 'accuracy', 'empathy', 'completeness'}
+TOPIC_SORT_FIELDS = {'rank', 'count', 'topic_name'}
+
+def section_etag(results_hash: str, section: str, params: Dict = None) -> str:
+    key = f"{results_hash}:{section}:" + "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    return '"' + hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates
+
+def build_insights(results: Dict) -> List[Dict]:
+    insights = []
+    topics = (results.get('topics') or {}).get('topics') or []
+    evaluation = results.get('evaluation')
+
+    if topics:
+        top = topics[0]
+        insights.append({
+            'type': 'info',
+            'text': f"Most common topic is <strong>{top['topic_name']}</strong> ({top['percentage']:.1f}% of queries)."
+        })
+
+    if evaluation:
+        quality = evaluation.get('avg_overall_quality') or 0
+        if quality >= 4:
+            insights.append({'type': 'success', 'text': f"Overall quality is high (<strong>{quality:.1f}/5.0</strong>)."})
+        elif quality < 3:
+            insights.append({'type': 'warning', 'text': f"Overall quality needs attention (<strong>{quality:.1f}/5.0</strong>)."})
+
+        hallucination_rate = evaluation.get('hallucination_rate') or 0
+        if hallucination_rate > 10:
+            insights.append({
+                'type': 'danger',
+                'text': f"High hallucination rate detected (<strong>{hallucination_rate:.1f}%</strong>)."
+            })
+
+    return insights
+
+def build_summary(results: Dict) -> Dict:
+    evaluation = results.get('evaluation')
+    topics = results.get('topics') or {}
+
+    summary = {
+        'job_id': results.get('job_id'),
+        'timestamp': results.get('timestamp'),
+        'data_summary': results.get('data_summary', {}),
+        'kpis': {
+            'total_queries': results.get('data_summary', {}).get('total_queries', 0),
+            'topics_count': topics.get('n_topics', 0),
+            'containment_rate': evaluation.get('containment_rate') if evaluation else None,
+            'quality_score': evaluation.get('avg_overall_quality') if evaluation else None
+        },
+        'quality': None,
+        'insights': build_insights(results)
+    }
+
+    if evaluation:
+        summary['quality'] = {
+            'radar': {
+                'labels': ['Accuracy', 'Empathy', 'Completeness', 'Overall Quality'],
+                'values': [evaluation.get('avg_accuracy'), evaluation.get('avg_empathy'),
+                           evaluation.get('avg_completeness'), evaluation.get('avg_overall_quality')]
+            },
+            'metrics': [
+                {'label': 'Accuracy', 'value': evaluation.get('avg_accuracy'), 'max': 5},
+                {'label': 'Empathy', 'value': evaluation.get('avg_empathy'), 'max': 5},
+                {'label': 'Completeness', 'value': evaluation.get('avg_completeness'), 'max': 5},
+                {'label': 'Hallucination Rate', 'value': evaluation.get('hallucination_rate'), 'max': 100, 'suffix': '%'}
+            ],
+            'rates': {
+                name: evaluation.get(name)
+                for name in ('hallucination_rate', 'escalation_rate', 'containment_rate', 'bias_rate')
+            },
+            'quality_distribution': evaluation.get('quality_distribution', {}),
+            'total_evaluated': evaluation.get('total_evaluated', 0)
+        }
+
+    return summary
+
+def build_topics(results: Dict, search: str = None, sort: str = 'rank', order: str = 'asc') -> Dict:
+    topics_data = results.get('topics') or {}
+    topics = topics_data.get('topics') or []
+
+    chart_topics = topics[:TOP_TOPICS_IN_CHART]
+    chart_total = sum(t['count'] for t in chart_topics)
+    chart = {
+        'labels': [t['topic_name'] for t in chart_topics],
+        'values': [t['count'] for t in chart_topics],
+        'percentages': [round(t['count'] / chart_total * 100, 1) if chart_total else 0.0 for t in chart_topics]
+    }
+
+    table = topics
+    if search:
+        term = search.lower()
+        table = [
+            t for t in table
+            if term in t['topic_name'].lower()
+            or term in (t.get('description') or '').lower()
+            or any(term in q.lower() for q in t.get('representative_queries', []))
+        ]
+    if sort in TOPIC_SORT_FIELDS:
+        table = sorted(table, key=lambda t: t[sort], reverse=(order == 'desc'))
+
+    return {
+        'total_queries': topics_data.get('total_queries', 0),
+        'n_topics': topics_data.get('n_topics', len(topics)),
+        'chart': chart,
+        'topics': table,
+        'matched': len(table)
+    }
+
+def build_entities(results: Dict, limit: int = TOP_ENTITY_TYPES, examples: int = 3) -> Dict:
+    entities = results.get('entities') or {}
+    counts = entities.get('entity_counts') or {}
+    top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    return {
+        'total_texts': entities.get('total_texts', 0),
+        'total_entities': entities.get('total_entities', 0),
+        'entity_types_found': entities.get('entity_types_found', len(counts)),
+        'top': [
+            {'type': entity_type, 'count': count, 'examples': (entities.get('examples') or {}).get(entity_type, [])[:examples]}
+            for entity_type, count in top
+        ]
+    }
+
+def build_evaluations(results: Dict, page: int = 1, page_size: int = 10, filter: str = 'all',
+                      sort: str = None, order: str = 'desc') -> Dict:
+    evaluation = results.get('evaluation') or {}
+    samples = evaluation.get('samples') or []
+
+    if filter not in EVALUATION_FILTERS:
+        raise ValueError(f"Unknown filter '{filter}'. Use one of: {', '.join(EVALUATION_FILTERS)}")
+    if sort is not None and sort not in EVALUATION_SORT_FIELDS:
+        raise ValueError(f"Unknown sort field '{sort}'. Use one of: {', '.join(sorted(EVALUATION_SORT_FIELDS))}")
+
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    matched = [s for s in samples if EVALUATION_FILTERS[filter](s)]
+    if sort:
+        matched = sorted(matched, key=lambda s: s.get(sort) or 0, reverse=(order == 'desc'))
+
+    pages = max(1, math.ceil(len(matched) / page_size))
+    page = max(1, min(page, pages))
+    start = (page - 1) * page_size
+
+    return {
+        'filter': filter,
+        'sort': sort,
+        'order': order,
+        'page': page,
+        'page_size': page_size,
+        'pages': pages,
+        'total': len(matched),
+        'total_samples': len(samples),
+        'counts': {name: sum(1 for s in samples if fn(s)) for name, fn in EVALUATION_FILTERS.items()},
+        'items': matched[start:start + page_size]
+    }
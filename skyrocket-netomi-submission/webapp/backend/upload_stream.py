@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Callable, List, Optional
+from fastapi import HTTPException, Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+class UploadTooLarge(Exception):
+    pass
+
+class StreamedUpload:
+    def __init__(self, destination: Path, field_name: str, max_size: int,
+                 allowed: Callable[[str], bool]):
+        self.destination = destination
+        self.field_name = field_name
+        self.max_size = max_size
+        self.allowed = allowed
+
+        self.filename: Optional[str] = None
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self._file = None
+        self._pending: List[bytes] = []
+        self._header_field = b''
+        self._header_value = b''
+        self._headers = {}
+        self._in_file_part = False
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._in_file_part = False
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b''
+        self._header_value = b''
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b'content-disposition'))
+        if options.get(b'name', b'').decode('utf-8', 'replace') != self.field_name or b'filename' not in options:
+            return
+        if self.filename is not None:
+            raise HTTPException(status_code=400, detail="Upload exactly one file")
+
+        self.filename = options[b'filename'].decode('utf-8', 'replace')
+        if not self.allowed(self.filename):
+            raise HTTPException(status_code=400, detail="Invalid file type. Please upload .xlsx or .csv")
+        self._in_file_part = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if not self._in_file_part:
+            return
+        self.size += end - start
+        if self.size > self.max_size:
+            raise UploadTooLarge()
+        self._pending.append(bytes(data[start:end]))
+
+    def _on_part_end(self):
+        self._in_file_part = False
+
+    def _flush(self):
+        if self._file is None:
+            self._file = open(self.destination, 'wb')
+        for chunk in self._pending:
+            self.digest.update(chunk)
+            self._file.write(chunk)
+        self._pending = []
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+
+    async def receive(self, request: Request):
+        content_type, options = parse_options_header(request.headers.get('content-type'))
+        boundary = options.get(b'boundary')
+        if content_type != b'multipart/form-data' or not boundary:
+            raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+        parser = MultipartParser(boundary, callbacks={
+            'on_part_begin': self._on_part_begin,
+            'on_part_data': self._on_part_data,
+            'on_part_end': self._on_part_end,
+            'on_header_field': self._on_header_field,
+            'on_header_value': self._on_header_value,
+            'on_header_end': self._on_header_end,
+            'on_headers_finished': self._on_headers_finished,
+        })
+
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                if self._pending:
+                    await asyncio.to_thread(self._flush)
+            parser.finalize()
+            if self.filename is None:
+                raise HTTPException(status_code=400, detail=f"No '{self.field_name}' file in the upload")
+            await asyncio.to_thread(self._flush)
+        except UploadTooLarge:
+            await asyncio.to_thread(self._discard)
+            raise HTTPException(status_code=400, detail="File too large. Maximum size is 50MB")
+        except BaseException:
+            await asyncio.to_thread(self._discard)
+            raise
+        await asyncio.to_thread(self._close)
+        return self
+
+    def _discard(self):
+        self._close()
+        self.destination.unlink(missing_ok=True)
+
+async def stream_upload_to_disk(request: Request, destination: Path, max_size: int,
+                                allowed: Callable[[str], bool], field_name: str = 'file') -> StreamedUpload:
+    return await StreamedUpload(destination, field_name, max_size, allowed).receive(request)
@@ -6,9 +6,12 @@
 // Configuration
 const API_BASE_URL = 'http://localhost:5001/api';
 const POLL_INTERVAL = 2000; // 2 seconds
+const SEARCH_DEBOUNCE = 250;
 
 // State
 let pollInterval = null;
+let eventSource = null;
+let currentJobId = null;
 let currentResults = null;
 let charts = {};
 
@@ -115,10 +118,11 @@ async function handleFileUpload(file) {
         }
 
         const data = await response.json();
-        showToast(`File uploaded: ${data.filename}`, 'success');
+        currentJobId = data.job_id;
+        showToast(data.deduplicated ? data.message : `File uploaded: ${data.filename}`, 'success');
 
-        // Start polling for progress
-        startProgressPolling();
+        // Subscribe to progress events (falls back to polling)
+        subscribeToProgress();
 
     } catch (error) {
         showToast('Upload failed. Please try again.', 'error');
@@ -126,6 +130,53 @@ async function handleFileUpload(file) {
     }
 }
 
+// ============================================
+// Progress Stream
+// ============================================
+
+function subscribeToProgress() {
+    if (!window.EventSource) {
+        startProgressPolling();
+        return;
+    }
+
+    if (eventSource) {
+        eventSource.close();
+    }
+
+    let finished = false;
+    eventSource = new EventSource(`${API_BASE_URL}/jobs/${currentJobId}/events`);
+
+    eventSource.addEventListener('progress', (event) => {
+        updateProgress(JSON.parse(event.data));
+    });
+
+    eventSource.addEventListener('finished', async () => {
+        finished = true;
+        eventSource.close();
+        await loadResults();
+        showDashboard();
+    });
+
+    eventSource.addEventListener('failed', (event) => {
+        finished = true;
+        eventSource.close();
+        const data = JSON.parse(event.data);
+        showToast(`Analysis failed: ${data.error}`, 'error');
+        resetUploadSection();
+    });
+
+    eventSource.onerror = () => {
+        if (finished) {
+            return;
+        }
+        console.warn('Progress stream unavailable, falling back to polling');
+        eventSource.close();
+        eventSource = null;
+        startProgressPolling();
+    };
+}
+
 // ============================================
 // Progress Polling
 // ============================================
@@ -137,7 +188,7 @@ function startProgressPolling() {
 
     pollInterval = setInterval(async () => {
         try {
-            const response = await fetch(`${API_BASE_URL}/status`);
+            const response = await fetch(`${API_BASE_URL}/jobs/${currentJobId}/status`);
             const status = await response.json();
 
             updateProgress(status);
@@ -167,6 +218,13 @@ function updateProgress(status) {
     progressPercentage.textContent = `${status.progress}%`;
     progressStep.textContent = status.current_step;
 
+    if (status.status === 'queued' && status.queue_position) {
+        const wait = status.estimated_wait_seconds != null
+            ? ` (about ${Math.ceil(status.estimated_wait_seconds / 60)} min)`
+            : '';
+        progressStep.textContent = `Queued: position ${status.queue_position}${wait}`;
+    }
+
     if (status.progress === 100) {
         progressTitle.textContent = 'Analysis Complete!';
     }
@@ -176,14 +234,28 @@ function updateProgress(status) {
 // Results Loading
 // ============================================
 
+function resultsUrl(section, params = {}) {
+    const query = new URLSearchParams(params).toString();
+    return `${API_BASE_URL}/jobs/${currentJobId}/results/${section}${query ? `?${query}` : ''}`;
+}
+
+async function fetchSection(section, params = {}) {
+    const response = await fetch(resultsUrl(section, params));
+    if (!response.ok) {
+        throw new Error(`Failed to load ${section}`);
+    }
+    return response.json();
+}
+
 async function loadResults() {
     try {
-        const response = await fetch(`${API_BASE_URL}/results`);
-        if (!response.ok) {
-            throw new Error('Failed to load results');
-        }
+        const [summary, topics, entities] = await Promise.all([
+            fetchSection('summary'),
+            fetchSection('topics'),
+            fetchSection('entities')
+        ]);
 
-        currentResults = await response.json();
+        currentResults = { summary, topics, entities };
         renderDashboard(currentResults);
         showToast('Analysis complete! Dashboard loaded.', 'success');
 
@@ -199,41 +271,42 @@ async function loadResults() {
 
 function renderDashboard(data) {
     // Update KPIs
-    updateKPIs(data);
+    updateKPIs(data.summary.kpis);
 
     // Render charts
-    renderTopicChart(data.topics);
-    renderQualityChart(data.evaluation);
+    renderTopicChart(data.topics.chart);
+    renderQualityChart(data.summary.quality);
 
     // Render topics table
-    renderTopicsTable(data.topics);
+    renderTopicsTable(data.topics.topics);
+    initializeTopicSearch();
 
     // Render entity insights
     renderEntityInsights(data.entities);
 
     // Render quality metrics
-    renderQualityMetrics(data.evaluation);
+    renderQualityMetrics(data.summary.quality);
 
     // Render key insights
-    renderInsights(data);
+    renderInsights(data.summary.insights);
 }
 
-function updateKPIs(data) {
+function updateKPIs(kpis) {
     document.getElementById('totalQueries').textContent =
-        formatNumber(data.data_summary.total_queries);
+        formatNumber(kpis.total_queries);
 
-    if (data.evaluation) {
+    if (kpis.quality_score !== null) {
         document.getElementById('containmentRate').textContent =
-            `${data.evaluation.containment_rate.toFixed(1)}%`;
+            `${kpis.containment_rate.toFixed(1)}%`;
         document.getElementById('qualityScore').textContent =
-            data.evaluation.avg_overall_quality.toFixed(1);
+            kpis.quality_score.toFixed(1);
     }
 
     document.getElementById('topicsCount').textContent =
-        data.topics.n_topics;
+        kpis.topics_count;
 }
 
-function renderTopicChart(topicsData) {
+function renderTopicChart(chart) {
     const ctx = document.getElementById('topicChart');
 
     // Destroy existing chart
@@ -241,17 +314,14 @@ function renderTopicChart(topicsData) {
         charts.topicChart.destroy();
     }
 
-    const topics = topicsData.topics.slice(0, 10);
-    const labels = topics.map(t => t.topic_name);
-    const values = topics.map(t => t.count);
-    const colors = generateColors(topics.length);
+    const colors = generateColors(chart.labels.length);
 
     charts.topicChart = new Chart(ctx, {
         type: 'doughnut',
         data: {
-            labels: labels,
+            labels: chart.labels,
             datasets: [{
-                data: values,
+                data: chart.values,
                 backgroundColor: colors,
                 borderWidth: 0
             }]
@@ -275,9 +345,7 @@ function renderTopicChart(topicsData) {
                         label: function (context) {
                             const label = context.label || '';
                             const value = context.parsed || 0;
-                            const total = context.dataset.data.reduce((a, b) => a + b, 0);
-                            const percentage = ((value / total) * 100).toFixed(1);
-                            return `${label}: ${formatNumber(value)} (${percentage}%)`;
+                            return `${label}: ${formatNumber(value)} (${chart.percentages[context.dataIndex]}%)`;
                         }
                     }
                 }
@@ -286,21 +354,21 @@ function renderTopicChart(topicsData) {
     });
 
     // Render custom legend
-    renderTopicLegend(topics, colors);
+    renderTopicLegend(chart.labels, colors);
 }
 
-function renderTopicLegend(topics, colors) {
+function renderTopicLegend(labels, colors) {
     const legendContainer = document.getElementById('topicLegend');
-    legendContainer.innerHTML = topics.map((topic, index) => `
+    legendContainer.innerHTML = labels.map((label, index) => `
         <div style="display: flex; align-items: center; gap: 8px; font-size: 0.875rem;">
             <div style="width: 12px; height: 12px; border-radius: 3px; background: ${colors[index]};"></div>
-            <span style="color: var(--gray-300);">${topic.topic_name}</span>
+            <span style="color: var(--gray-300);">${label}</span>
         </div>
     `).join('');
 }
 
-function renderQualityChart(evaluationData) {
-    if (!evaluationData) return;
+function renderQualityChart(quality) {
+    if (!quality) return;
 
     const ctx = document.getElementById('qualityChart');
 
@@ -312,15 +380,10 @@ function renderQualityChart(evaluationData) {
     charts.qualityChart = new Chart(ctx, {
         type: 'radar',
         data: {
-            labels: ['Accuracy', 'Empathy', 'Completeness', 'Overall Quality'],
+            labels: quality.radar.labels,
             datasets: [{
                 label: 'Quality Scores',
-                data: [
-                    evaluationData.avg_accuracy,
-                    evaluationData.avg_empathy,
-                    evaluationData.avg_completeness,
-                    evaluationData.avg_overall_quality
-                ],
+                data: quality.radar.values,
                 backgroundColor: 'rgba(14, 165, 233, 0.2)',
                 borderColor: 'rgba(14, 165, 233, 1)',
                 borderWidth: 2,
@@ -369,10 +432,10 @@ function renderQualityChart(evaluationData) {
     });
 }
 
-function renderTopicsTable(topicsData) {
+function renderTopicsTable(topics) {
     const tbody = document.getElementById('topicsTableBody');
 
-    tbody.innerHTML = topicsData.topics.map(topic => `
+    tbody.innerHTML = topics.map(topic => `
         <tr>
             <td><strong>#${topic.rank}</strong></td>
             <td>
@@ -400,105 +463,71 @@ function renderTopicsTable(topicsData) {
             </td>
         </tr>
     `).join('');
+}
 
-    // Add search functionality
+function initializeTopicSearch() {
     const searchInput = document.getElementById('topicSearch');
-    searchInput.addEventListener('input', (e) => {
-        const searchTerm = e.target.value.toLowerCase();
-        const rows = tbody.querySelectorAll('tr');
+    if (searchInput.dataset.bound) return;
+    searchInput.dataset.bound = 'true';
 
-        rows.forEach(row => {
-            const text = row.textContent.toLowerCase();
-            row.style.display = text.includes(searchTerm) ? '' : 'none';
-        });
+    // Server-side search, debounced
+    let searchTimer = null;
+    searchInput.addEventListener('input', (e) => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(async () => {
+            try {
+                const topics = await fetchSection('topics', e.target.value ? { search: e.target.value } : {});
+                renderTopicsTable(topics.topics);
+            } catch (error) {
+                console.error('Topic search error:', error);
+            }
+        }, SEARCH_DEBOUNCE);
     });
 }
 
 function renderEntityInsights(entitiesData) {
     const container = document.getElementById('entityList');
 
-    if (!entitiesData || !entitiesData.entity_counts) {
+    if (!entitiesData || entitiesData.top.length === 0) {
         container.innerHTML = '<p style="color: var(--gray-500);">No entity data available</p>';
         return;
     }
 
-    const entities = Object.entries(entitiesData.entity_counts)
-        .sort((a, b) => b[1] - a[1])
-        .slice(0, 10);
-
-    container.innerHTML = entities.map(([type, count]) => `
+    container.innerHTML = entitiesData.top.map(entity => `
         <div class="entity-item">
-            <span class="entity-type">${formatEntityType(type)}</span>
-            <span class="entity-count">${formatNumber(count)}</span>
+            <span class="entity-type">${formatEntityType(entity.type)}</span>
+            <span class="entity-count">${formatNumber(entity.count)}</span>
         </div>
     `).join('');
 }
 
-function renderQualityMetrics(evaluationData) {
+function renderQualityMetrics(quality) {
     const container = document.getElementById('qualityMetrics');
 
-    if (!evaluationData) {
+    if (!quality) {
         container.innerHTML = '<p style="color: var(--gray-500);">No evaluation data available</p>';
         return;
     }
 
-    const metrics = [
-        { label: 'Accuracy', value: evaluationData.avg_accuracy, max: 5, color: '#0ea5e9' },
-        { label: 'Empathy', value: evaluationData.avg_empathy, max: 5, color: '#22c55e' },
-        { label: 'Completeness', value: evaluationData.avg_completeness, max: 5, color: '#f59e0b' },
-        { label: 'Hallucination Rate', value: evaluationData.hallucination_rate, max: 100, color: '#ef4444', suffix: '%' }
-    ];
+    const colors = ['#0ea5e9', '#22c55e', '#f59e0b', '#ef4444'];
 
-    container.innerHTML = metrics.map(metric => `
+    container.innerHTML = quality.metrics.map((metric, index) => `
         <div class="metric-item">
             <div class="metric-label">
                 <span>${metric.label}</span>
                 <strong>${metric.value.toFixed(1)}${metric.suffix || ''}</strong>
             </div>
             <div class="metric-bar">
-                <div class="metric-fill" style="width: ${(metric.value / metric.max) * 100}%; background: ${metric.color};"></div>
+                <div class="metric-fill" style="width: ${(metric.value / metric.max) * 100}%; background: ${colors[index % colors.length]};"></div>
             </div>
         </div>
     `).join('');
 }
 
-function renderInsights(data) {
+function renderInsights(insights) {
     const container = document.getElementById('keyInsights');
     if (!container) return;
 
-    const insights = [];
-
-    // Topic Insight
-    if (data.topics && data.topics.topics.length > 0) {
-        const topTopic = data.topics.topics[0];
-        insights.push({
-            type: 'info',
-            text: `Most common topic is <strong>${topTopic.topic_name}</strong> (${topTopic.percentage.toFixed(1)}% of queries).`
-        });
-    }
-
-    // Quality Insight
-    if (data.evaluation) {
-        if (data.evaluation.avg_overall_quality >= 4) {
-            insights.push({
-                type: 'success',
-                text: `Overall quality is high (<strong>${data.evaluation.avg_overall_quality.toFixed(1)}/5.0</strong>).`
-            });
-        } else if (data.evaluation.avg_overall_quality < 3) {
-            insights.push({
-                type: 'warning',
-                text: `Overall quality needs attention (<strong>${data.evaluation.avg_overall_quality.toFixed(1)}/5.0</strong>).`
-            });
-        }
-
-        if (data.evaluation.hallucination_rate > 10) {
-            insights.push({
-                type: 'danger',
-                text: `High hallucination rate detected (<strong>${data.evaluation.hallucination_rate.toFixed(1)}%</strong>).`
-            });
-        }
-    }
-
     container.innerHTML = insights.map(insight => `
         <div class="insight-banner ${insight.type}">
             <div class="insight-icon">
@@ -528,7 +557,7 @@ function initializeEventListeners() {
 
 async function downloadResults() {
     try {
-        const response = await fetch(`${API_BASE_URL}/results/download`);
+        const response = await fetch(`${API_BASE_URL}/jobs/${currentJobId}/report`);
         if (!response.ok) throw new Error('Download failed');
 
         const blob = await response.blob();